@@ -1,7 +1,7 @@
 from django.contrib import admin
 
 from app_media.models import PostImage
-from .models import Post
+from .models import Post, PostsImportJob
 
 
 class PostImageInLine(admin.TabularInline):
@@ -13,3 +13,9 @@ class AdminPost(admin.ModelAdmin):
     list_display = ['id', 'post_author', 'post_title', 'publication_date']
     list_filter = ['publication_date']
     inlines = [PostImageInLine]
+
+
+@admin.register(PostsImportJob)
+class AdminPostsImportJob(admin.ModelAdmin):
+    list_display = ['id', 'user', 'status', 'rows_processed', 'rows_failed', 'created_at', 'finished_at']
+    list_filter = ['status']
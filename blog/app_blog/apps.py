@@ -1,7 +1,15 @@
 from django.apps import AppConfig
+from django.core.checks import register
 from django.utils.translation import gettext_lazy as _
 
+from core.checks import check_shared_cache
+
 
 class AppBlogConfig(AppConfig):
     name = 'app_blog'
     verbose_name = _('blog')
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        # Прогресс задач создания постов из файла хранится в общем кэше
+        register(check_shared_cache)
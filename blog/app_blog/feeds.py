@@ -0,0 +1,74 @@
+from django.contrib.syndication.views import Feed
+from django.http import Http404
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.translation import gettext_lazy as _
+
+from .services.author_services import get_author_header, AuthorNotFoundException
+from .services.post_services import get_latest_posts
+
+
+class LatestPostsFeed(Feed):
+    """RSS лента последних постов"""
+    title = _('Blog posts')
+    description = _('Latest blog posts')
+
+    def link(self):
+        return reverse('post_list')
+
+    def items(self):
+        return get_latest_posts()
+
+    def item_title(self, post):
+        return post.post_title
+
+    def item_description(self, post):
+        return post.short_content
+
+    def item_link(self, post):
+        return reverse('post_detail', kwargs={'pk': post.id})
+
+    def item_pubdate(self, post):
+        return post.publication_date
+
+    def item_updateddate(self, post):
+        return post.updated_at
+
+    def item_author_name(self, post):
+        return post.post_author.username
+
+
+class LatestPostsAtomFeed(LatestPostsFeed):
+    """Atom лента последних постов"""
+    feed_type = Atom1Feed
+    subtitle = LatestPostsFeed.description
+
+
+class AuthorPostsFeed(LatestPostsFeed):
+    """RSS лента последних постов автора. Информация об авторе берётся из кэша шапки страницы постов автора"""
+
+    def get_object(self, request, author_id):
+        try:
+            return get_author_header(author_id)
+        except AuthorNotFoundException:
+            raise Http404()
+
+    def title(self, author):
+        return _('Posts by %(username)s') % {'username': author['username']}
+
+    def description(self, author):
+        return self.title(author)
+
+    def link(self, author):
+        return reverse('author_post_list', kwargs={'author_id': author['id']})
+
+    def items(self, author):
+        return get_latest_posts(author_id=author['id'])
+
+
+class AuthorPostsAtomFeed(AuthorPostsFeed):
+    """Atom лента последних постов автора"""
+    feed_type = Atom1Feed
+
+    def subtitle(self, author):
+        return self.title(author)
@@ -22,8 +22,19 @@ class CreatePostForm(forms.Form):
     images_field = forms.ImageField(widget=forms.ClearableFileInput(attrs={'multiple': True}), label=_('Images'),
                                     required=False)
 
+    def clean_images_field(self) -> list:
+        """Метод проверки всех загруженных картинок. Поле ImageField проверяет только один файл из нескольких,
+         поэтому остальные файлы проверяются тем же полем. Возвращает список картинок"""
+        images_field = self.fields['images_field']
+        return [images_field.clean(image) for image in self.files.getlist('images_field')]
+
 
 class CreatePostsFromFileForm(forms.Form):
     """Форма для создания списка постов из файла"""
     posts_file = forms.FileField(label=_('Post List File'),
                                  help_text=create_posts_from_file_help_text)
+
+
+class PostSearchForm(forms.Form):
+    """Форма для поиска постов"""
+    q = forms.CharField(max_length=200, label=_('Search posts'), required=False)
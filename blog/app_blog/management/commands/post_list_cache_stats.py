@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from app_blog.services.post_cache_services import get_post_list_cache_stats
+
+
+class Command(BaseCommand):
+    """Команда вывода количества попаданий и промахов кэша страниц списка постов во всех процессах"""
+    help = 'Выводит количество попаданий и промахов кэша страниц списка постов'
+
+    def handle(self, *args, **options):
+        stats = get_post_list_cache_stats()
+        requests_count = stats['hits'] + stats['misses']
+        hit_rate = stats['hits'] / requests_count * 100 if requests_count else 0.0
+        self.stdout.write(f'Post list cache hits: {stats["hits"]}, misses: {stats["misses"]}, '
+                          f'hit rate: {hit_rate:.1f}%')
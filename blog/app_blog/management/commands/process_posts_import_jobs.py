@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from app_blog.services.import_job_services import process_pending_posts_import_jobs
+
+
+class Command(BaseCommand):
+    """Команда выполнения ожидающих задач создания постов из файла вне процесса веб-сервера"""
+    help = 'Выполняет все ожидающие задачи создания постов из файла'
+
+    def handle(self, *args, **options):
+        processed_jobs_count = process_pending_posts_import_jobs()
+        self.stdout.write(f'Processed import jobs: {processed_jobs_count}')
@@ -0,0 +1,35 @@
+# Generated by Django 3.1.14 on 2026-10-18 15:30
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('app_blog', '0004_auto_20210311_1926'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostsImportJob',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('posts_file', models.FileField(blank=True, upload_to='posts_import_files/', verbose_name='Post List File')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=10, verbose_name='Import job status')),
+                ('rows_processed', models.PositiveIntegerField(default=0, verbose_name='Rows processed')),
+                ('rows_failed', models.PositiveIntegerField(default=0, verbose_name='Rows failed')),
+                ('message', models.TextField(blank=True, verbose_name='Import job message')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Import job creation date')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Import job start date')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Import job finish date')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL, verbose_name='user')),
+            ],
+            options={
+                'verbose_name': 'posts import job',
+                'verbose_name_plural': 'posts import jobs',
+            },
+        ),
+    ]
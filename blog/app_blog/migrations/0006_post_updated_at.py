@@ -0,0 +1,20 @@
+# Generated by Django 3.1.14 on 2026-10-18 15:33
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_blog', '0005_postsimportjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, verbose_name='Post update date'),
+            preserve_default=False,
+        ),
+    ]
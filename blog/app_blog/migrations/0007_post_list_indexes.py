@@ -0,0 +1,21 @@
+# Generated by Django 3.1.14 on 2026-10-18 15:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_blog', '0006_post_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['-publication_date', '-id'], name='post_publication_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['post_author', 'publication_date'], name='post_author_pub_date_idx'),
+        ),
+    ]
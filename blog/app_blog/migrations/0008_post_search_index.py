@@ -0,0 +1,46 @@
+# Generated by Django 3.1.14 on 2026-10-18 17:10
+
+from django.db import migrations
+
+# Полнотекстовый индекс SQLite FTS5 по заголовку и содержанию постов. Таблица индекса хранит только индекс,
+# а текст читается из app_blog_post (external content table). Индекс обновляется триггерами, поэтому
+# в нём учитываются и посты, созданные через bulk_create, для которого не отправляются сигналы моделей
+CREATE_POST_SEARCH_INDEX_SQL = [
+    """CREATE VIRTUAL TABLE app_blog_post_fts USING fts5(
+           post_title, post_content, content='app_blog_post', content_rowid='id', tokenize='unicode61'
+       )""",
+    """CREATE TRIGGER app_blog_post_fts_insert AFTER INSERT ON app_blog_post BEGIN
+           INSERT INTO app_blog_post_fts(rowid, post_title, post_content)
+           VALUES (new.id, new.post_title, new.post_content);
+       END""",
+    """CREATE TRIGGER app_blog_post_fts_delete AFTER DELETE ON app_blog_post BEGIN
+           INSERT INTO app_blog_post_fts(app_blog_post_fts, rowid, post_title, post_content)
+           VALUES ('delete', old.id, old.post_title, old.post_content);
+       END""",
+    """CREATE TRIGGER app_blog_post_fts_update AFTER UPDATE OF post_title, post_content ON app_blog_post BEGIN
+           INSERT INTO app_blog_post_fts(app_blog_post_fts, rowid, post_title, post_content)
+           VALUES ('delete', old.id, old.post_title, old.post_content);
+           INSERT INTO app_blog_post_fts(rowid, post_title, post_content)
+           VALUES (new.id, new.post_title, new.post_content);
+       END""",
+    # Индексирование уже существующих постов
+    "INSERT INTO app_blog_post_fts(app_blog_post_fts) VALUES ('rebuild')",
+]
+
+DROP_POST_SEARCH_INDEX_SQL = [
+    'DROP TRIGGER app_blog_post_fts_update',
+    'DROP TRIGGER app_blog_post_fts_delete',
+    'DROP TRIGGER app_blog_post_fts_insert',
+    'DROP TABLE app_blog_post_fts',
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_blog', '0007_post_list_indexes'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_POST_SEARCH_INDEX_SQL, reverse_sql=DROP_POST_SEARCH_INDEX_SQL),
+    ]
@@ -9,6 +9,7 @@ class Post(models.Model):
     publication_date = models.DateTimeField(verbose_name=_('Post publication date'))
     post_title = models.CharField(max_length=70, verbose_name=_('Post title'), null=False)
     post_content = models.TextField(verbose_name=_('Post content'), null=False)
+    updated_at = models.DateTimeField(auto_now=True, verbose_name=_('Post update date'))
 
     def __str__(self):
         return f'id={self.id}, {self.post_title}'
@@ -16,3 +17,41 @@ class Post(models.Model):
     class Meta:
         verbose_name = _('post')
         verbose_name_plural = _('posts')
+        indexes = [
+            # индекс для сортировки списка постов и курсорной пагинации
+            models.Index(fields=['-publication_date', '-id'], name='post_publication_date_id_idx'),
+            # индекс для выборки постов автора
+            models.Index(fields=['post_author', 'publication_date'], name='post_author_pub_date_idx'),
+        ]
+
+
+class PostsImportJob(models.Model):
+    """Модель задачи создания постов из файла, выполняемой вне цикла обработки запроса"""
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, _('Pending')),
+        (STATUS_RUNNING, _('Running')),
+        (STATUS_DONE, _('Done')),
+        (STATUS_FAILED, _('Failed')),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, verbose_name=_('user'))
+    posts_file = models.FileField(upload_to='posts_import_files/', blank=True, verbose_name=_('Post List File'))
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING,
+                              verbose_name=_('Import job status'))
+    rows_processed = models.PositiveIntegerField(default=0, verbose_name=_('Rows processed'))
+    rows_failed = models.PositiveIntegerField(default=0, verbose_name=_('Rows failed'))
+    message = models.TextField(blank=True, verbose_name=_('Import job message'))
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_('Import job creation date'))
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name=_('Import job start date'))
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name=_('Import job finish date'))
+
+    def __str__(self):
+        return f'id={self.id}, {self.status}'
+
+    class Meta:
+        verbose_name = _('posts import job')
+        verbose_name_plural = _('posts import jobs')
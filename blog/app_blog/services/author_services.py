@@ -0,0 +1,40 @@
+"""Модуль шапки страницы постов автора.
+
+Шапка страницы (сводка профиля автора и количество постов автора) кэшируется по id автора
+и сбрасывается при изменении постов автора, пользователя или его профиля (см. signals.py), поэтому
+при попадании в кэш страница получается одним запросом - выборкой постов автора по индексу
+(post_author, publication_date).
+Шапка хранится в кэше SHARED_CACHE_ALIAS, общем для всех процессов сервера, чтобы изменения, сделанные
+в одном процессе, сбрасывали её во всех процессах.
+"""
+from django.core.cache import caches
+
+from app_blog.models import Post
+from app_users.services.profile_services import get_profile_summary
+from blog.settings import AUTHOR_HEADER_CACHE_TIMEOUT, SHARED_CACHE_ALIAS
+
+AUTHOR_HEADER_CACHE_KEY = 'author_header:{author_id}'
+
+
+class AuthorNotFoundException(Exception):
+    pass
+
+
+def get_author_header(author_id: int) -> dict:
+    """Метод возвращает шапку страницы постов автора: поля сводки профиля автора (id, username, display_name,
+     avatar_path) и количество постов post_count. Если автора нет, вызывается AuthorNotFoundException"""
+    cache = caches[SHARED_CACHE_ALIAS]
+    cache_key = AUTHOR_HEADER_CACHE_KEY.format(author_id=author_id)
+    author_header = cache.get(cache_key)
+    if author_header is None:
+        profile_summary = get_profile_summary(author_id)
+        if profile_summary is None:
+            raise AuthorNotFoundException
+        author_header = {**profile_summary, 'post_count': Post.objects.filter(post_author_id=author_id).count()}
+        cache.set(cache_key, author_header, timeout=AUTHOR_HEADER_CACHE_TIMEOUT)
+    return author_header
+
+
+def invalidate_author_header(author_id: int) -> None:
+    """Метод инвалидации закэшированной шапки страницы постов автора"""
+    caches[SHARED_CACHE_ALIAS].delete(AUTHOR_HEADER_CACHE_KEY.format(author_id=author_id))
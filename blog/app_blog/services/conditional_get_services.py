@@ -0,0 +1,60 @@
+"""Модуль условных GET запросов (ETag) для страниц списка постов, детальной страницы поста и RSS/Atom лент.
+
+Валидаторы вычисляются без рендеринга страницы: для списка постов и лент - по версии списка постов из кэша,
+для страницы поста - по посту с автором, который выбирается одним запросом и затем показывается вью.
+Если страница не изменилась, декоратор django.views.decorators.http.condition возвращает ответ 304
+и вью не вызывается. В ETag страниц входят также язык и пользователь, так как от них зависит шапка страницы.
+Страницы и ленты проверяются только по ETag, без Last-Modified: дата изменения постов не меняется
+при удалении поста, входе пользователя или изменении профиля автора, и запрос только с If-Modified-Since
+получил бы устаревшую страницу или ленту.
+"""
+import hashlib
+
+from django.utils.translation import get_language
+
+from app_blog.models import Post
+from app_users.services.profile_services import get_user_profile_summary
+from .post_cache_services import get_post_list_cache_version
+from .post_services import get_post_detail_queryset
+
+
+def _get_etag(request, *parts) -> str:
+    """Метод возвращает ETag из частей parts, языка и id пользователя запроса"""
+    raw_etag = '|'.join(str(part) for part in (*parts, get_language(), request.user.pk))
+    return hashlib.md5(raw_etag.encode('utf-8')).hexdigest()
+
+
+def get_post_list_etag(request, *args, **kwargs) -> str:
+    """Метод возвращает ETag страницы списка постов. ETag строится по версии списка постов, которая меняется
+     при любом изменении, удалении поста и при изменении имени автора, и не требует запросов к базе"""
+    return _get_etag(request, 'post_list', get_post_list_cache_version(),
+                     request.GET.get('after'), request.GET.get('before'))
+
+
+def get_request_post_detail(request, pk: int) -> Post:
+    """Метод возвращает пост для детальной страницы вместе с автором, его профилем и аватаркой
+     или None, если поста нет. Пост запоминается в запросе: по нему вычисляется ETag, и его же показывает вью,
+     поэтому страница не выбирает пост повторно"""
+    if not hasattr(request, '_post_detail'):
+        request._post_detail = get_post_detail_queryset().filter(pk=pk).first()
+    return request._post_detail
+
+
+def get_post_detail_etag(request, pk: int, *args, **kwargs) -> str:
+    """Метод возвращает ETag детальной страницы поста или None, если поста нет.
+     Кроме даты изменения поста в ETag входят показываемые на странице имя и аватарка автора"""
+    post = get_request_post_detail(request, pk)
+    if post is None:
+        return None
+    author = get_user_profile_summary(post.post_author)
+    return _get_etag(request, 'post_detail', pk, post.updated_at, author['username'], author['display_name'],
+                     author['avatar_path'])
+
+
+def get_post_feed_etag(request, feed_name: str, author_id: int = None, *args, **kwargs) -> str:
+    """Метод возвращает ETag ленты. ETag строится по версии списка постов из кэша и не требует запросов к базе,
+     лента не зависит от пользователя, но содержит абсолютные ссылки, поэтому в ETag входит адрес сайта"""
+    raw_etag = '|'.join(str(part) for part in ('post_feed', get_post_list_cache_version(), feed_name, author_id,
+                                               get_language(), request.scheme, request.get_host()))
+    return hashlib.md5(raw_etag.encode('utf-8')).hexdigest()
+
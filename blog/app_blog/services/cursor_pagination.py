@@ -0,0 +1,118 @@
+"""Модуль курсорной (keyset) пагинации по паре (publication_date, id).
+
+В отличие от OFFSET пагинации стоимость получения страницы не зависит от её номера:
+каждая страница - это выборка первых page_size строк после (или до) значения курсора.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from django.db.models import Q, QuerySet
+
+
+class InvalidCursorException(Exception):
+    pass
+
+
+class CursorPage:
+    """Страница выборки с курсорами на следующую и предыдущую страницы"""
+
+    def __init__(self, items: list, next_cursor: str = None, previous_cursor: str = None):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+    def __bool__(self):
+        return bool(self.items)
+
+
+def encode_cursor_values(values: list) -> str:
+    """Метод кодирует список значений, сериализуемых в json, в строку курсора для передачи в url"""
+    raw_cursor = json.dumps(values).encode('utf-8')
+    return base64.urlsafe_b64encode(raw_cursor).decode('ascii').rstrip('=')
+
+
+def decode_cursor_values(cursor: str) -> list:
+    """Метод декодирует строку курсора в список значений.
+     В случае некорректного курсора вызывается InvalidCursorException"""
+    try:
+        padded_cursor = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded_cursor.encode('ascii')))
+    except (binascii.Error, UnicodeError, ValueError):
+        raise InvalidCursorException
+    if not isinstance(values, list):
+        raise InvalidCursorException
+    return values
+
+
+def encode_cursor(publication_date: datetime, post_id: int) -> str:
+    """Метод кодирует пару (publication_date, id) в строку курсора для передачи в url"""
+    return encode_cursor_values([publication_date.isoformat(), post_id])
+
+
+def decode_cursor(cursor: str) -> (datetime, int):
+    """Метод декодирует строку курсора в пару (publication_date, id).
+     В случае некорректного курсора вызывается InvalidCursorException"""
+    try:
+        publication_date, post_id = decode_cursor_values(cursor)
+        return datetime.fromisoformat(publication_date), int(post_id)
+    except (TypeError, ValueError):
+        raise InvalidCursorException
+
+
+def _get_item_cursor(item) -> str:
+    """Метод возвращает курсор, указывающий на элемент выборки: объект модели или словарь из values()"""
+    if isinstance(item, dict):
+        return encode_cursor(item['publication_date'], item['id'])
+    return encode_cursor(item.publication_date, item.id)
+
+
+def get_cursor_filter(publication_date: datetime, post_id: int, lookup: str) -> Q:
+    """Метод возвращает условие выборки элементов после (lookup='lt') или до (lookup='gt') курсора.
+     Условие (publication_date < x) OR (publication_date = x AND id < y) записано в виде
+     (publication_date <= x) AND ((publication_date < x) OR (id < y)): первая часть позволяет базе
+     начать чтение индекса сразу с позиции курсора, а не просматривать его с начала"""
+    return Q(**{f'publication_date__{lookup}e': publication_date}) & \
+        (Q(**{f'publication_date__{lookup}': publication_date}) | Q(**{f'id__{lookup}': post_id}))
+
+
+def paginate_by_cursor(queryset: QuerySet, page_size: int, after: str = None, before: str = None) -> CursorPage:
+    """Метод возвращает страницу queryset упорядоченного по (publication_date, id) в порядке убывания
+
+    :param queryset: Исходная выборка
+    :param page_size: Количество элементов на странице
+    :param after: Курсор, страница начинается сразу после элемента на который он указывает
+    :param before: Курсор, страница заканчивается сразу перед элементом на который он указывает
+    :return: Страница CursorPage
+    """
+    if before:
+        publication_date, post_id = decode_cursor(before)
+        queryset = queryset.filter(get_cursor_filter(publication_date, post_id, 'gt'))
+        items = list(queryset.order_by('publication_date', 'id')[:page_size + 1])
+        has_previous = len(items) > page_size
+        items = items[:page_size][::-1]
+        previous_cursor = _get_item_cursor(items[0]) if has_previous else None
+        # Элемент, на который указывает before, существует, значит следующая страница есть всегда
+        next_cursor = _get_item_cursor(items[-1]) if items else None
+        return CursorPage(items, next_cursor=next_cursor, previous_cursor=previous_cursor)
+
+    if after:
+        publication_date, post_id = decode_cursor(after)
+        queryset = queryset.filter(get_cursor_filter(publication_date, post_id, 'lt'))
+    items = list(queryset.order_by('-publication_date', '-id')[:page_size + 1])
+    has_next = len(items) > page_size
+    items = items[:page_size]
+    next_cursor = _get_item_cursor(items[-1]) if has_next else None
+    # Если страница открыта по курсору after, значит перед ней есть хотя бы одна страница
+    previous_cursor = _get_item_cursor(items[0]) if after and items else None
+    return CursorPage(items, next_cursor=next_cursor, previous_cursor=previous_cursor)
@@ -0,0 +1,130 @@
+"""Модуль фоновых задач создания постов из файла.
+
+Загруженный файл сохраняется вместе с задачей PostsImportJob, а сами посты создаются в пуле потоков
+после фиксации транзакции запроса, либо командой manage.py process_posts_import_jobs.
+Пока задача выполняется, прогресс хранится в общем для всех процессов кэше SHARED_CACHE_ALIAS: импорт идёт
+в одной транзакции, изменения строки задачи в базе не были бы видны другим соединениям до её завершения,
+а записать их в отдельном соединении SQLite не даст, пока транзакция импорта держит блокировку записи.
+Задача может выполняться в другом процессе (manage.py process_posts_import_jobs), чем запрос её состояния.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.cache import caches
+from django.core.files import File
+from django.db import transaction, connections
+from django.utils import timezone
+from django.utils.translation import gettext as _
+
+from app_blog.models import PostsImportJob
+from blog.settings import POSTS_IMPORT_WORKERS, SHARED_CACHE_ALIAS
+from core.db_routers import use_primary_database
+from core.handlers import immediate_atomic
+from .post_services import create_posts_from_file
+
+POSTS_IMPORT_JOB_PROGRESS_CACHE_KEY = 'posts_import_job_progress:{job_id}'
+
+_executor = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Метод возвращает пул потоков для выполнения задач, пул создаётся при первом обращении"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=POSTS_IMPORT_WORKERS, thread_name_prefix='posts_import')
+    return _executor
+
+
+def create_posts_import_job(user, posts_file: File) -> PostsImportJob:
+    """Метод создания задачи создания постов из файла.
+     Задача отправляется на выполнение в пул потоков после фиксации текущей транзакции
+
+    :param user: Пользователь автор постов
+    :param posts_file: Файл со списком постов
+    :return: Созданная задача
+    """
+    import_job = PostsImportJob.objects.create(user=user, posts_file=posts_file)
+    transaction.on_commit(lambda: _get_executor().submit(_run_posts_import_job_in_thread, import_job.id))
+    return import_job
+
+
+def _run_posts_import_job_in_thread(job_id: int) -> None:
+    """Метод выполнения задачи в потоке пула. Задача читает только что созданные данные, поэтому читает
+     их из основной базы, а не из реплики. После выполнения закрываются соединения с базой потока"""
+    try:
+        with use_primary_database():
+            process_posts_import_job(job_id)
+    finally:
+        connections.close_all()
+
+
+def process_posts_import_job(job_id: int) -> None:
+    """Метод выполнения задачи создания постов из файла.
+     Задача захватывается в транзакции IMMEDIATE: если её уже захватил другой процесс, она не выполняется повторно.
+     По завершении в задаче сохраняются результат и количество обработанных строк, загруженный файл удаляется"""
+    with immediate_atomic():
+        import_job = PostsImportJob.objects.filter(id=job_id, status=PostsImportJob.STATUS_PENDING).first()
+        if import_job is None:
+            return
+        import_job.status = PostsImportJob.STATUS_RUNNING
+        import_job.started_at = timezone.now()
+        import_job.save(update_fields=['status', 'started_at'])
+
+    progress_cache_key = POSTS_IMPORT_JOB_PROGRESS_CACHE_KEY.format(job_id=job_id)
+
+    def save_progress(rows_processed: int) -> None:
+        import_job.rows_processed = rows_processed
+        caches[SHARED_CACHE_ALIAS].set(progress_cache_key, rows_processed)
+
+    def save_rollback(failed_row: int) -> None:
+        # Посты из строк до строки с ошибкой откатываются вместе с ней
+        import_job.rows_processed = 0
+        import_job.rows_failed = failed_row
+
+    try:
+        with import_job.posts_file.open('rb') as posts_file:
+            is_correct, message = create_posts_from_file(user=import_job.user, posts_file=posts_file,
+                                                         progress_callback=save_progress,
+                                                         rollback_callback=save_rollback)
+    except OSError:
+        import_job.rows_processed = 0
+        is_correct, message = False, _('An unexpected error has occurred')
+
+    import_job.status = PostsImportJob.STATUS_DONE if is_correct else PostsImportJob.STATUS_FAILED
+    import_job.message = message
+    import_job.finished_at = timezone.now()
+    import_job.posts_file.delete(save=False)
+    import_job.save()
+    caches[SHARED_CACHE_ALIAS].delete(progress_cache_key)
+
+
+def process_pending_posts_import_jobs() -> int:
+    """Метод последовательного выполнения всех ожидающих задач. Возвращает количество выполненных задач.
+     Статусы задач читаются из основной базы, чтобы не выполнить повторно задачу, уже выполненную по данным реплики"""
+    with use_primary_database():
+        job_ids = list(PostsImportJob.objects.filter(status=PostsImportJob.STATUS_PENDING)
+                       .order_by('created_at').values_list('id', flat=True))
+        for job_id in job_ids:
+            process_posts_import_job(job_id)
+    return len(job_ids)
+
+
+def get_posts_import_job_progress(import_job: PostsImportJob) -> dict:
+    """Метод возвращает состояние задачи: статус, количество обработанных строк и строк с ошибками,
+     скорость обработки в строках в секунду и сообщение о результате"""
+    rows_processed = import_job.rows_processed
+    if import_job.status == PostsImportJob.STATUS_RUNNING:
+        rows_processed = caches[SHARED_CACHE_ALIAS].get(
+            POSTS_IMPORT_JOB_PROGRESS_CACHE_KEY.format(job_id=import_job.id), rows_processed)
+
+    throughput = 0.0
+    if import_job.started_at:
+        elapsed_seconds = ((import_job.finished_at or timezone.now()) - import_job.started_at).total_seconds()
+        if elapsed_seconds > 0:
+            throughput = round(rows_processed / elapsed_seconds, 2)
+
+    return {'id': import_job.id,
+            'status': import_job.status,
+            'rows_processed': rows_processed,
+            'rows_failed': import_job.rows_failed,
+            'throughput': throughput,
+            'message': import_job.message}
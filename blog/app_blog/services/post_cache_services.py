@@ -0,0 +1,88 @@
+"""Модуль кэширования отрендеренной страницы списка постов и RSS/Atom лент.
+
+Ключи кэша содержат версию списка постов, язык и курсор страницы. При любом изменении постов версия
+увеличивается, и все закэшированные ранее страницы перестают использоваться, пока не истечёт их время жизни.
+Версия и счётчики попаданий и промахов хранятся в кэше SHARED_CACHE_ALIAS, общем для всех процессов:
+изменение постов в одном процессе (в том числе в manage.py process_posts_import_jobs) сбрасывает страницы
+во всех процессах, а счётчики можно посмотреть командой manage.py post_list_cache_stats.
+Сами страницы и ленты хранятся в кэше процесса, так как их ключи уже содержат версию.
+"""
+import hashlib
+import logging
+import time
+
+from django.core.cache import cache, caches
+
+from blog.settings import POST_LIST_CACHE_TIMEOUT, POST_FEED_CACHE_TIMEOUT, SHARED_CACHE_ALIAS
+
+POST_LIST_CACHE_VERSION_KEY = 'post_list:version'
+POST_LIST_CACHE_HITS_KEY = 'post_list:hits'
+POST_LIST_CACHE_MISSES_KEY = 'post_list:misses'
+
+logger = logging.getLogger(__name__)
+
+
+def get_post_list_cache_version() -> int:
+    """Метод возвращает текущую версию списка постов.
+     Начальная версия берётся из текущего времени, чтобы после вытеснения ключа версии из кэша
+     не использовались страницы, закэшированные до этого"""
+    shared_cache = caches[SHARED_CACHE_ALIAS]
+    version = shared_cache.get(POST_LIST_CACHE_VERSION_KEY)
+    if version is None:
+        version = time.time_ns()
+        shared_cache.add(POST_LIST_CACHE_VERSION_KEY, version, timeout=None)
+    return version
+
+
+def invalidate_post_list_cache() -> None:
+    """Метод инвалидации закэшированных страниц списка постов. Вызывается при любом изменении постов"""
+    shared_cache = caches[SHARED_CACHE_ALIAS]
+    try:
+        shared_cache.incr(POST_LIST_CACHE_VERSION_KEY)
+    except ValueError:
+        shared_cache.set(POST_LIST_CACHE_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def get_post_list_cache_key(language: str, after: str = None, before: str = None) -> str:
+    """Метод возвращает ключ кэша страницы списка постов для языка language и курсоров after, before"""
+    cursor_hash = hashlib.md5(f'{after or ""}|{before or ""}'.encode('utf-8')).hexdigest()
+    return f'post_list:page:{get_post_list_cache_version()}:{language}:{cursor_hash}'
+
+
+def get_cached_post_list_html(cache_key: str) -> str:
+    """Метод возвращает закэшированный html страницы списка постов или None. Учитывает попадания и промахи кэша"""
+    post_list_html = cache.get(cache_key)
+    counter_key = POST_LIST_CACHE_MISSES_KEY if post_list_html is None else POST_LIST_CACHE_HITS_KEY
+    shared_cache = caches[SHARED_CACHE_ALIAS]
+    if not shared_cache.add(counter_key, 1, timeout=None):
+        shared_cache.incr(counter_key)
+    logger.debug('Post list cache %s: %s', 'miss' if post_list_html is None else 'hit', cache_key)
+    return post_list_html
+
+
+def set_cached_post_list_html(cache_key: str, post_list_html: str) -> None:
+    """Метод сохраняет html страницы списка постов в кэш на POST_LIST_CACHE_TIMEOUT секунд"""
+    cache.set(cache_key, post_list_html, timeout=POST_LIST_CACHE_TIMEOUT)
+
+
+def get_post_list_cache_stats() -> dict:
+    """Метод возвращает количество попаданий и промахов кэша страниц списка постов во всех процессах"""
+    counters = caches[SHARED_CACHE_ALIAS].get_many([POST_LIST_CACHE_HITS_KEY, POST_LIST_CACHE_MISSES_KEY])
+    return {'hits': counters.get(POST_LIST_CACHE_HITS_KEY, 0),
+            'misses': counters.get(POST_LIST_CACHE_MISSES_KEY, 0)}
+
+
+def get_post_feed_cache_key(feed_name: str, language: str, scheme: str, host: str, author_id: int = None) -> str:
+    """Метод возвращает ключ кэша ленты feed_name для языка language. В ленте содержатся абсолютные ссылки,
+     поэтому в ключ входят и схема scheme, и адрес сайта host"""
+    return f'post_feed:{get_post_list_cache_version()}:{feed_name}:{author_id or ""}:{language}:{scheme}:{host}'
+
+
+def get_cached_post_feed(cache_key: str) -> (bytes, str):
+    """Метод возвращает закэшированные содержимое и тип содержимого ленты или None"""
+    return cache.get(cache_key)
+
+
+def set_cached_post_feed(cache_key: str, content: bytes, content_type: str) -> None:
+    """Метод сохраняет содержимое и тип содержимого ленты в кэш на POST_FEED_CACHE_TIMEOUT секунд"""
+    cache.set(cache_key, (content, content_type), timeout=POST_FEED_CACHE_TIMEOUT)
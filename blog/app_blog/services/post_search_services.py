@@ -0,0 +1,96 @@
+"""Модуль полнотекстового поиска постов.
+
+Поиск выполняется по индексу SQLite FTS5 app_blog_post_fts (см. миграцию 0008_post_search_index),
+результаты упорядочиваются по релевантности bm25, а при равной релевантности - по id поста.
+Страницы результатов получаются курсорной пагинацией по паре (релевантность, id), так же как список постов.
+"""
+import re
+
+from django.db import connection
+
+from blog.settings import POST_LIST_PAGE_SIZE, POST_SEARCH_RANK_WEIGHTS
+from .cursor_pagination import CursorPage, InvalidCursorException, encode_cursor_values, decode_cursor_values
+from .post_services import get_post_list_queryset
+
+SEARCH_TERM_PATTERN = re.compile(r'\w+')
+
+# bm25 возвращает отрицательные значения, чем меньше значение, тем выше релевантность
+SEARCH_SQL = """
+    SELECT id, search_rank FROM (
+        SELECT rowid AS id, bm25(app_blog_post_fts, %s, %s) AS search_rank
+        FROM app_blog_post_fts WHERE app_blog_post_fts MATCH %s
+    ) {cursor_condition}
+    ORDER BY search_rank {order}, id {order}
+    LIMIT %s
+"""
+AFTER_CURSOR_CONDITION = 'WHERE search_rank >= %s AND (search_rank > %s OR id > %s)'
+BEFORE_CURSOR_CONDITION = 'WHERE search_rank <= %s AND (search_rank < %s OR id < %s)'
+
+
+def get_search_match_expression(query: str) -> str:
+    """Метод преобразует строку поиска в выражение FTS5 MATCH: каждое слово берётся в кавычки, поэтому
+     символы синтаксиса FTS5 в строке поиска не приводят к ошибке. Пост должен содержать все слова.
+     Для строки без слов возвращается пустая строка"""
+    return ' '.join(f'"{term}"' for term in SEARCH_TERM_PATTERN.findall(query))
+
+
+def _search_post_ids(match_expression: str, limit: int, after: list = None, before: list = None) -> list:
+    """Метод возвращает до limit пар (id поста, релевантность) после курсора after или перед курсором before"""
+    params = [*POST_SEARCH_RANK_WEIGHTS, match_expression]
+    cursor_condition, order = '', 'ASC'
+    if after:
+        cursor_condition = AFTER_CURSOR_CONDITION
+        params += [after[0], after[0], after[1]]
+    elif before:
+        cursor_condition, order = BEFORE_CURSOR_CONDITION, 'DESC'
+        params += [before[0], before[0], before[1]]
+    with connection.cursor() as cursor:
+        cursor.execute(SEARCH_SQL.format(cursor_condition=cursor_condition, order=order), params + [limit])
+        return cursor.fetchall()
+
+
+def _decode_search_cursor(cursor: str) -> list:
+    """Метод декодирует курсор результатов поиска в пару [релевантность, id поста]"""
+    try:
+        search_rank, post_id = decode_cursor_values(cursor)
+        return [float(search_rank), int(post_id)]
+    except (TypeError, ValueError):
+        raise InvalidCursorException
+
+
+def search_posts(query: str, after: str = None, before: str = None, page_size: int = POST_LIST_PAGE_SIZE) -> CursorPage:
+    """Метод полнотекстового поиска постов по заголовку и содержанию
+
+    :param query: Строка поиска
+    :param after: Курсор, страница начинается сразу после результата на который он указывает
+    :param before: Курсор, страница заканчивается сразу перед результатом на который он указывает
+    :param page_size: Количество постов на странице
+    :return: Страница постов CursorPage в порядке убывания релевантности.
+     При некорректном курсоре вызывается InvalidCursorException
+    """
+    after = _decode_search_cursor(after) if after else None
+    before = _decode_search_cursor(before) if before else None
+    match_expression = get_search_match_expression(query)
+    if not match_expression:
+        return CursorPage([])
+
+    rows = _search_post_ids(match_expression, page_size + 1, after=after, before=before)
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if before:
+        rows = rows[::-1]
+    posts = get_post_list_queryset().in_bulk([post_id for post_id, _ in rows])
+    items = []
+    for post_id, search_rank in rows:
+        # Пост мог быть удалён между запросами к индексу и к таблице постов
+        if post_id in posts:
+            posts[post_id].search_rank = search_rank
+            items.append(posts[post_id])
+
+    first_cursor = encode_cursor_values(list(rows[0][::-1])) if rows else None
+    last_cursor = encode_cursor_values(list(rows[-1][::-1])) if rows else None
+    if before:
+        # Результат, на который указывает before, существует, значит следующая страница есть всегда
+        return CursorPage(items, next_cursor=last_cursor, previous_cursor=first_cursor if has_more else None)
+    return CursorPage(items, next_cursor=last_cursor if has_more else None,
+                      previous_cursor=first_cursor if after else None)
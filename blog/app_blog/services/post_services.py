@@ -1,18 +1,38 @@
+import codecs
 from _csv import reader
 from datetime import datetime
-from typing import Union
+from typing import Union, Iterator, Callable
 
+from django.core.files import File
+from django.db import transaction
+from django.db.models import QuerySet, Case, When, Value, F, TextField
+from django.db.models.functions import Concat, Length, Substr
 from django.utils.translation import gettext as _
 
 from app_blog.models import Post
 from app_media.models import PostImage
-from blog.settings import POSTS_FILE_DELIMITER
-from core.handlers import get_correct_file_path_to_img_tag
+from blog.settings import POSTS_FILE_DELIMITER, POST_LIST_PAGE_SIZE, POSTS_IMPORT_BATCH_SIZE, POST_FEED_SIZE
+from core.handlers import get_correct_file_path_to_img_tag, call_now_and_on_commit, immediate_atomic
+from .author_services import invalidate_author_header
+from .cursor_pagination import CursorPage, paginate_by_cursor
+from .post_cache_services import invalidate_post_list_cache
 
 SHORT_CONTENT_LENGTH = 100  # количество символов содержания поста, которые будут отображаться на странице списка постов
 DATETIME_FORMAT_FOR_DATETIME = '%H:%M:%S %d.%m.%Y'  # hh:mi:ss dd.mm.yyyy
 
 
+# Поля поста, которые можно запросить через API
+POST_VALUES_FIELDS = ('id', 'post_title', 'post_content', 'short_content', 'publication_date', 'updated_at',
+                      'author_id', 'author', 'images')
+POST_LIST_VALUES_DEFAULT_FIELDS = ('id', 'post_title', 'short_content', 'publication_date', 'author_id', 'author')
+POST_DETAIL_VALUES_DEFAULT_FIELDS = ('id', 'post_title', 'post_content', 'publication_date', 'updated_at',
+                                     'author_id', 'author', 'images')
+
+
+class InvalidPostFieldsException(Exception):
+    pass
+
+
 class PostTitleNullException(Exception):
     pass
 
@@ -21,37 +41,145 @@ class PostContentNullException(Exception):
     pass
 
 
-def get_post_list() -> list:
-    """Метод получения списка постов упорядоченных по дате публикации в порядке убывания"""
-    post_list = Post.objects.all().order_by('-publication_date')
+def get_post_list(after: str = None, before: str = None, page_size: int = POST_LIST_PAGE_SIZE) -> CursorPage:
+    """Метод получения страницы списка постов упорядоченных по дате публикации в порядке убывания
+
+    :param after: Курсор, страница начинается сразу после поста на который он указывает
+    :param before: Курсор, страница заканчивается сразу перед постом на который он указывает
+    :param page_size: Количество постов на странице
+    :return: Страница постов CursorPage. При некорректном курсоре вызывается InvalidCursorException
+    """
+    return paginate_by_cursor(get_post_list_queryset(), page_size=page_size, after=after, before=before)
+
+
+def get_author_post_list(author_id: int, after: str = None, before: str = None,
+                         page_size: int = POST_LIST_PAGE_SIZE) -> CursorPage:
+    """Метод получения страницы постов автора упорядоченных по дате публикации в порядке убывания.
+     Выборка идёт по индексу (post_author, publication_date)
+
+    :param author_id: id автора
+    :param after: Курсор, страница начинается сразу после поста на который он указывает
+    :param before: Курсор, страница заканчивается сразу перед постом на который он указывает
+    :param page_size: Количество постов на странице
+    :return: Страница постов CursorPage. При некорректном курсоре вызывается InvalidCursorException
+    """
+    return paginate_by_cursor(get_post_list_queryset().filter(post_author_id=author_id),
+                              page_size=page_size, after=after, before=before)
+
+
+def get_latest_posts(author_id: int = None, count: int = POST_FEED_SIZE) -> list:
+    """Метод возвращает count последних постов, всех или только автора author_id, для RSS/Atom лент"""
+    queryset = get_post_list_queryset()
+    if author_id is not None:
+        queryset = queryset.filter(post_author_id=author_id)
+    return list(queryset.order_by('-publication_date', '-id')[:count])
+
+
+def get_post_values_list(fields: list, after: str = None, before: str = None,
+                         page_size: int = POST_LIST_PAGE_SIZE) -> CursorPage:
+    """Метод получения страницы списка постов в виде словарей только с полями fields.
+     Посты выбираются через values() без создания объектов моделей, не запрошенные поля не выбираются из базы
+
+    :param fields: Список полей из POST_VALUES_FIELDS
+    :param after: Курсор, страница начинается сразу после поста на который он указывает
+    :param before: Курсор, страница заканчивается сразу перед постом на который он указывает
+    :param page_size: Количество постов на странице
+    :return: Страница словарей CursorPage. При некорректном курсоре вызывается InvalidCursorException,
+     при неизвестном поле - InvalidPostFieldsException
+    """
+    check_post_values_fields(fields)
+    post_page = paginate_by_cursor(_get_post_values_queryset(fields), page_size=page_size, after=after, before=before)
+    post_page.items = _get_post_values_with_fields(post_page.items, fields)
+    return post_page
+
+
+def get_post_values(post_id: int, fields: list) -> Union[dict, None]:
+    """Метод получения поста в виде словаря только с полями fields или None, если поста нет.
+     При неизвестном поле вызывается InvalidPostFieldsException"""
+    check_post_values_fields(fields)
+    post_values = _get_post_values_queryset(fields).filter(id=post_id).first()
+    if post_values is None:
+        return None
+    return _get_post_values_with_fields([post_values], fields)[0]
+
+
+def check_post_values_fields(fields: list) -> None:
+    """Метод проверки полей поста. Если поле отсутствует в POST_VALUES_FIELDS, вызывается InvalidPostFieldsException"""
+    if not fields:
+        raise InvalidPostFieldsException(_('No fields specified'))
+    unknown_fields = [field for field in fields if field not in POST_VALUES_FIELDS]
+    if unknown_fields:
+        raise InvalidPostFieldsException(_('Unknown fields: %(fields)s') % {'fields': ', '.join(unknown_fields)})
+
+
+def _get_post_values_queryset(fields: list) -> QuerySet:
+    """Метод возвращает выборку словарей постов с полями fields. Поля id и publication_date выбираются всегда,
+     так как по ним строится курсор страницы"""
+    queryset = Post.objects.all()
+    if 'short_content' in fields:
+        queryset = queryset.annotate(post_content_length=Length('post_content'),
+                                     short_content=_get_short_content_expression())
+    model_fields = [field for field in fields if field not in ('author_id', 'author', 'images')]
+    expressions = {}
+    if 'author_id' in fields:
+        expressions['author_id'] = F('post_author_id')
+    if 'author' in fields:
+        expressions['author'] = F('post_author__username')
+    return queryset.values(*dict.fromkeys(['id', 'publication_date', *model_fields]), **expressions)
+
 
-    for post in post_list:
-        _add_short_content_to_post(post)
+def _get_post_values_with_fields(post_values_list: list, fields: list) -> list:
+    """Метод оставляет в словарях постов только поля fields и добавляет картинки постов, если они запрошены.
+     Картинки всех постов выбираются одним запросом"""
+    if 'images' in fields:
+        post_images = {post_values['id']: [] for post_values in post_values_list}
+        image_values_list = PostImage.objects.filter(post_id__in=post_images)\
+            .order_by('id').values('post_id', 'post_image_file', 'post_image_file_small')
+        for image_values in image_values_list:
+            post_images[image_values['post_id']].append({
+                'image_path': get_correct_file_path_to_img_tag(image_values['post_image_file']),
+                'small_image_path': get_correct_file_path_to_img_tag(
+                    image_values['post_image_file_small'] or image_values['post_image_file'])})
+        for post_values in post_values_list:
+            post_values['images'] = post_images[post_values['id']]
+    return [{field: post_values[field] for field in fields} for post_values in post_values_list]
 
-    return post_list
 
+def get_post_list_queryset() -> QuerySet:
+    """Метод возвращает выборку постов для страницы списка постов.
+     Автор поста выбирается в том же запросе, чтобы карточки постов не делали по запросу на автора.
+     Обрезанное содержание поста short_content вычисляется в базе, полное содержание поста не выбирается"""
+    return Post.objects.select_related('post_author')\
+        .annotate(post_content_length=Length('post_content'), short_content=_get_short_content_expression())\
+        .defer('post_content')
 
-def _get_short_content(content: str) -> str:
-    """Метод возращает content обрезанный до SHORT_CONTENT_LENGTH символов"""
-    if len(content) > SHORT_CONTENT_LENGTH:
-        short_content = f'{content[:SHORT_CONTENT_LENGTH]}...'
-    else:
-        short_content = content
-    return short_content
 
+def _get_short_content_expression() -> Case:
+    """Метод возвращает выражение для вычисления в базе обрезанного до SHORT_CONTENT_LENGTH символов содержания
+     поста. Необходимо для отображения первых SHORT_CONTENT_LENGTH символов поста на странице списка постов"""
+    return Case(When(post_content_length__gt=SHORT_CONTENT_LENGTH,
+                     then=Concat(Substr('post_content', 1, SHORT_CONTENT_LENGTH), Value('...'))),
+                default=F('post_content'),
+                output_field=TextField())
 
-def _add_short_content_to_post(post: Post) -> None:
-    """Метод добавления обрезанного содержания для поста.
-     Необходим для отображения первых SHORT_CONTENT_LENGTH символов поста на странице списка постов"""
-    post.short_content = _get_short_content(post.post_content)
 
+def get_post_detail_queryset() -> QuerySet:
+    """Метод возвращает выборку постов для детальной страницы поста. Автор, его профиль и аватарка
+     получаются одним запросом вместе с постом, картинки поста - вторым запросом в get_post_images.
+     Картинки не выбираются заранее, так как пост выбирается и для ответа 304, которому они не нужны"""
+    return Post.objects.select_related('post_author__profile__avatar_image_file')
 
-def get_post_images(post: Post) -> Union[list, None]:
-    """Метод возрвращет список картинок PostImage или None, если у поста нет картинок"""
-    post_image_list = PostImage.objects.filter(post=post)
-    if post_image_list:
-        for post_image in post_image_list:
-            post_image.image_path = get_correct_file_path_to_img_tag(post_image.post_image_file)
+
+def get_post_images(post: Post) -> list:
+    """Метод возрвращет список картинок PostImage, пустой если у поста нет картинок.
+     Для каждой картинки добавляются пути до оригинала image_path и до уменьшенной копии small_image_path.
+     Если картинки поста были получены через prefetch_related, запрос к базе не выполняется"""
+    post_image_list = list(post.postimage_set.all())
+    for post_image in post_image_list:
+        post_image.image_path = get_correct_file_path_to_img_tag(post_image.post_image_file)
+        # Для картинок, загруженных до появления уменьшенных копий, используется оригинал
+        post_image.small_image_path = get_correct_file_path_to_img_tag(
+            post_image.post_image_file_small or post_image.post_image_file)
     return post_image_list
 
 
@@ -64,67 +192,111 @@ def create_post(user: str, post_title: str, post_content: str, post_images: list
     :param post_images: Список изображений поста
     :return:
     """
-
-    new_post = Post.objects.create(post_author=user,
-                                   post_title=post_title,
-                                   post_content=post_content,
-                                   publication_date=datetime.now())
-    if post_images:
-        for image in post_images:
-            post_image = PostImage(post_image_file=image,
-                                   post=new_post)
-            post_image.save()
+    # Пост и его картинки сохраняются в одной транзакции: при ошибке сохранения картинки пост не создаётся
+    with transaction.atomic():
+        new_post = Post.objects.create(post_author=user,
+                                       post_title=post_title,
+                                       post_content=post_content,
+                                       publication_date=datetime.now())
+        if post_images:
+            for image in post_images:
+                post_image = PostImage(post_image_file=image,
+                                       post=new_post)
+                post_image.save()
 
 
-def create_posts_from_file(user, posts_file: str) -> (bool, str):
-    """ Метод создания постов из файла
+def create_posts_from_file(user, posts_file: File, batch_size: int = POSTS_IMPORT_BATCH_SIZE,
+                           progress_callback: Callable[[int], None] = None,
+                           rollback_callback: Callable[[int], None] = None) -> (bool, str):
+    """ Метод создания постов из файла.
+     Файл читается и разбирается построчно, посты сохраняются в базу пачками по мере чтения файла,
+     поэтому потребление памяти не зависит от размера файла. Все пачки сохраняются в одной транзакции
 
     :param user: Пользователь автор поста
     :param posts_file: Файл со списком постов.Разделитель - значение POSTS_FILE_DELIMITER из настроек.
      Формат файла <Заголовок поста><Содержание><Дата публикации>.Дата публикации в формате hh:mi:ss dd.mm.yyyy'
+    :param batch_size: Количество постов, вставляемых в базу одним запросом
+    :param progress_callback: Функция, вызываемая после сохранения каждой пачки постов
+     с количеством обработанных строк файла
+    :param rollback_callback: Функция, вызываемая при ошибке с номером строки файла, на которой она произошла.
+     Транзакция откатывается, поэтому посты из всех строк файла до этой строки тоже не сохраняются
     :return: Флаг успешности, Сообщение.
     """
+    post_counter = 0
     try:
-        posts_file_str = posts_file.read().decode('utf-8').split('\n')
-        csv_reader = reader(posts_file_str, delimiter=POSTS_FILE_DELIMITER, quotechar='"')
-        posts = []
-        post_counter = 0
-        for row in csv_reader:
-            check_post_title(row[0])
-            check_post_content(row[1])
-            post = Post(post_author=user,
-                        post_title=row[0],
-                        post_content=row[1],
-                        publication_date=datetime.strptime(row[2], DATETIME_FORMAT_FOR_DATETIME)
-                        )
-            posts.append(post)
-            post_counter += 1
-        save_posts_in_post_list(posts)
+        with immediate_atomic():
+            csv_reader = reader(_read_file_lines(posts_file), delimiter=POSTS_FILE_DELIMITER, quotechar='"')
+            posts = []
+            for row in csv_reader:
+                check_post_title(row[0])
+                check_post_content(row[1])
+                post = Post(post_author=user,
+                            post_title=row[0],
+                            post_content=row[1],
+                            publication_date=datetime.strptime(row[2], DATETIME_FORMAT_FOR_DATETIME)
+                            )
+                posts.append(post)
+                post_counter += 1
+                if len(posts) == batch_size:
+                    save_posts_in_post_list(posts, batch_size=batch_size)
+                    posts = []
+                    if progress_callback:
+                        progress_callback(post_counter)
+            save_posts_in_post_list(posts, batch_size=batch_size)
+            if progress_callback:
+                progress_callback(post_counter)
+        # bulk_create не отправляет сигналы сохранения постов, поэтому кэши списка постов
+        # и шапки страницы постов автора инвалидируются явно
+        call_now_and_on_commit(invalidate_post_list_cache)
+        call_now_and_on_commit(invalidate_author_header, user.id)
         return True, _('The file was processed successfully.'
                        ' Posted by %(post_counter)s posts') % {'post_counter': post_counter}
-    except UnicodeDecodeError:
-        return False, _('Posts not created. Error reading file. The file must be text,'
-                        ' the delimiter of values is %(delimiter)s') % {'delimiter': POSTS_FILE_DELIMITER}
-    except IndexError:
-        return False, _('No posts have been created. Not all values are specified '
-                        'in line %(line)s') % {'line': post_counter + 1}
-    except ValueError:
-        return False, _('No posts have been created. Incorrect date value '
-                        'in line %(line)s') % {'line': post_counter + 1}
-    except PostTitleNullException:
-        return False, _('No posts have been created. Empty post title value'
-                        ' in line %(line)s') % {'line': post_counter + 1}
-    except PostContentNullException:
-        return False, _('No posts have been created. Empty post content value'
-                        ' in line %(line)s') % {'line': post_counter + 1}
-    except Exception:
-        return False, _('An unexpected error has occurred')
-
-
-def save_posts_in_post_list(post_list: list) -> None:
-    """Метод сохранения постов в базу из списка постов"""
-    for post in post_list:
-        post.save()
+    except Exception as exception:
+        if rollback_callback:
+            rollback_callback(post_counter + 1)
+        return False, _get_posts_file_error_message(exception, line=post_counter + 1)
+
+
+def _get_posts_file_error_message(exception: Exception, line: int) -> str:
+    """Метод возвращает сообщение об ошибке exception, произошедшей при создании постов из строки line файла"""
+    if isinstance(exception, UnicodeDecodeError):
+        return _('Posts not created. Error reading file. The file must be text,'
+                 ' the delimiter of values is %(delimiter)s') % {'delimiter': POSTS_FILE_DELIMITER}
+    if isinstance(exception, IndexError):
+        return _('No posts have been created. Not all values are specified '
+                 'in line %(line)s') % {'line': line}
+    if isinstance(exception, ValueError):
+        return _('No posts have been created. Incorrect date value '
+                 'in line %(line)s') % {'line': line}
+    if isinstance(exception, PostTitleNullException):
+        return _('No posts have been created. Empty post title value'
+                 ' in line %(line)s') % {'line': line}
+    if isinstance(exception, PostContentNullException):
+        return _('No posts have been created. Empty post content value'
+                 ' in line %(line)s') % {'line': line}
+    return _('An unexpected error has occurred')
+
+
+def _read_file_lines(posts_file: File) -> Iterator[str]:
+    """Генератор строк файла. Файл читается кусками и декодируется из utf-8 инкрементально,
+     поэтому в памяти одновременно находится только текущий кусок файла"""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    line_start = ''
+    for chunk in posts_file.chunks():
+        lines = (line_start + decoder.decode(chunk)).split('\n')
+        line_start = lines.pop()
+        for line in lines:
+            yield f'{line}\n'
+    line_start += decoder.decode(b'', final=True)
+    if line_start:
+        yield line_start
+
+
+def save_posts_in_post_list(post_list: list, batch_size: int = POSTS_IMPORT_BATCH_SIZE) -> None:
+    """Метод сохранения постов в базу из списка постов.
+     Посты вставляются пачками по batch_size постов в одной транзакции: либо сохраняются все посты, либо ни одного"""
+    with transaction.atomic():
+        Post.objects.bulk_create(post_list, batch_size=batch_size)
 
 
 def check_post_title(post_title: str) -> None:
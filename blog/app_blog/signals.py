@@ -0,0 +1,56 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from app_users.models import Profile
+from core.handlers import call_now_and_on_commit
+from .models import Post
+from .services.author_services import invalidate_author_header
+from .services.post_cache_services import invalidate_post_list_cache
+
+
+@receiver([post_save, post_delete], sender=Post)
+def invalidate_post_list_cache_on_post_change(**kwargs):
+    """Инвалидация кэша списка постов при создании, изменении и удалении поста, в том числе через админку"""
+    call_now_and_on_commit(invalidate_post_list_cache)
+
+
+@receiver(pre_save, sender=Post)
+def remember_previous_post_author(instance, **kwargs):
+    """Запоминание автора изменяемого поста до сохранения, чтобы при смене автора обновить шапки обоих авторов"""
+    if instance.pk is not None:
+        instance.previous_post_author_id = Post.objects.filter(pk=instance.pk)\
+            .values_list('post_author_id', flat=True).first()
+
+
+@receiver([post_save, post_delete], sender=Post)
+def invalidate_author_header_on_post_change(instance, **kwargs):
+    """Инвалидация шапки страницы постов автора при изменении количества его постов:
+     при создании и удалении поста и при смене автора поста"""
+    previous_post_author_id = getattr(instance, 'previous_post_author_id', None)
+    if kwargs.get('created', True) or previous_post_author_id != instance.post_author_id:
+        call_now_and_on_commit(invalidate_author_header, instance.post_author_id)
+    if previous_post_author_id is not None and previous_post_author_id != instance.post_author_id:
+        call_now_and_on_commit(invalidate_author_header, previous_post_author_id)
+
+
+@receiver(post_save, sender=User)
+def invalidate_author_header_on_user_change(instance, update_fields=None, **kwargs):
+    """Инвалидация шапки страницы постов автора при изменении имени пользователя.
+     Обновление даты последнего входа при авторизации шапку не меняет"""
+    if update_fields is None or {'username', 'first_name', 'last_name'} & set(update_fields):
+        call_now_and_on_commit(invalidate_author_header, instance.id)
+
+
+@receiver(post_save, sender=User)
+def invalidate_post_list_cache_on_user_change(instance, update_fields=None, **kwargs):
+    """Инвалидация кэша списка постов и лент при изменении имени пользователя, которое показывается
+     в карточках постов. Обновление даты последнего входа при авторизации список не меняет"""
+    if update_fields is None or {'username', 'first_name', 'last_name'} & set(update_fields):
+        call_now_and_on_commit(invalidate_post_list_cache)
+
+
+@receiver(post_save, sender=Profile)
+def invalidate_author_header_on_profile_change(instance, **kwargs):
+    """Инвалидация шапки страницы постов автора при изменении аватарки"""
+    call_now_and_on_commit(invalidate_author_header, instance.user_id)
@@ -0,0 +1,124 @@
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils.translation import gettext as _
+
+from app_blog.models import Post
+from app_blog.services.author_services import AUTHOR_HEADER_CACHE_KEY
+from app_blog.services.post_services import create_posts_from_file
+from app_media.models import ProfileAvatarImage
+from app_users.models import Profile
+from app_users.services.profile_services import PROFILE_SUMMARY_CACHE_KEY
+from blog.settings import POST_LIST_PAGE_SIZE, POSTS_FILE_DELIMITER
+from core.test_handlers import clear_caches, create_test_user, create_many_test_posts, TEST_USERNAME
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class AuthorPostListTest(TestCase):
+    url_name = 'author_post_list'
+
+    def setUp(self):
+        """Метод предварительных действий. Перед каждым тестом очищаем кэш и создаём автора с постами
+         и другого пользователя с одним постом"""
+        clear_caches()
+        self.author = create_test_user()
+        create_many_test_posts(self.author, POST_LIST_PAGE_SIZE + 5)
+        self.other_user = User.objects.create_user(username='other_user', password='p@ssw0rd')
+        Profile.objects.create(user=self.other_user)
+        Post.objects.create(post_author=self.other_user, post_title='Пост другого пользователя',
+                            post_content='Содержание', publication_date='2030-01-01T00:00:00Z')
+
+    def _get_author_page(self, **params):
+        return self.client.get(reverse(self.url_name, kwargs={'author_id': self.author.id}), params)
+
+    def test_author_post_list_url_exists_at_desired_location(self):
+        """Тест доступности страницы постов автора и использования корректного шаблона"""
+        response = self._get_author_page()
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'author_post_list.html')
+
+    def test_author_post_list_not_existing_author(self):
+        """Тест проверяющий, что страница постов несуществующего автора возвращает 404"""
+        response = self.client.get(reverse(self.url_name, kwargs={'author_id': 1000}))
+        self.assertEqual(response.status_code, 404)
+
+    def test_author_post_list_content(self):
+        """Тест проверяющий, что на странице автора выводятся только его посты и информация об авторе"""
+        response = self._get_author_page()
+        self.assertContains(response, TEST_USERNAME)
+        self.assertContains(response, _('Number of posts: %(post_count)s') % {'post_count': POST_LIST_PAGE_SIZE + 5})
+        self.assertNotContains(response, 'Пост другого пользователя')
+        self.assertEqual(len(response.context['post_list']), POST_LIST_PAGE_SIZE)
+        self.assertTrue(all(post.post_author_id == self.author.id for post in response.context['post_list']))
+
+    def test_author_post_list_pagination(self):
+        """Тест проверяющий переход на следующую и предыдущую страницу постов автора"""
+        first_page = self._get_author_page().context['post_list']
+        second_page = self._get_author_page(after=first_page.next_cursor).context['post_list']
+        self.assertEqual(len(second_page), 5)
+        self.assertIsNone(second_page.next_cursor)
+        previous_page = self._get_author_page(before=second_page.previous_cursor).context['post_list']
+        self.assertEqual([post.id for post in previous_page], [post.id for post in first_page])
+
+        response = self._get_author_page(after='incorrect')
+        self.assertEqual(response.status_code, 404)
+
+    def test_author_post_list_cached_header(self):
+        """Тест проверяющий, что при закэшированной шапке страница автора получается одним запросом постов"""
+        self._get_author_page()
+        with self.assertNumQueries(1):
+            self._get_author_page()
+
+    def test_author_header_invalidated(self):
+        """Тест проверяющий, что шапка страницы автора обновляется при создании постов, изменении имени
+         пользователя и аватарки"""
+        self._get_author_page()
+        Post.objects.create(post_author=self.author, post_title='Новый пост', post_content='Содержание',
+                            publication_date='2030-01-01T00:00:00Z')
+        response = self._get_author_page()
+        self.assertContains(response, _('Number of posts: %(post_count)s') % {'post_count': POST_LIST_PAGE_SIZE + 6})
+
+        posts_file = SimpleUploadedFile('posts.txt', POSTS_FILE_DELIMITER.join(
+            ['Пост из файла', 'Содержание', '12:00:00 01.01.2030']).encode('utf-8'))
+        create_posts_from_file(self.author, posts_file)
+        response = self._get_author_page()
+        self.assertContains(response, _('Number of posts: %(post_count)s') % {'post_count': POST_LIST_PAGE_SIZE + 7})
+
+        self.author.username = 'renamed_author'
+        self.author.save()
+        self.assertContains(self._get_author_page(), 'renamed_author')
+
+        profile = self.author.profile
+        profile.avatar_image_file = ProfileAvatarImage.objects.create(
+            avatar_image_file='avatar_images/avatar.jpg', avatar_image_file_small='avatar_images/avatar_small.jpg')
+        profile.save()
+        self.assertContains(self._get_author_page(), 'avatar_images/avatar_small.jpg')
+
+    def test_author_header_invalidated_from_other_process(self):
+        """Тест проверяющий, что шапка страницы автора, сброшенная другим процессом сервера,
+         не показывается этим процессом"""
+        self._get_author_page()
+        # Имя изменено в другом процессе, который сбрасывает шапку и сводку профиля через свой экземпляр кэша
+        User.objects.filter(id=self.author.id).update(first_name='Новое имя')
+        other_process_cache = FileBasedCache(settings.CACHES[settings.SHARED_CACHE_ALIAS]['LOCATION'], {})
+        other_process_cache.delete_many([AUTHOR_HEADER_CACHE_KEY.format(author_id=self.author.id),
+                                         PROFILE_SUMMARY_CACHE_KEY.format(user_id=self.author.id)])
+        self.assertContains(self._get_author_page(), 'Новое имя')
+
+    def test_author_header_invalidated_on_post_author_change(self):
+        """Тест проверяющий, что при смене автора поста обновляются шапки страниц обоих авторов"""
+        self._get_author_page()
+        self.client.get(reverse(self.url_name, kwargs={'author_id': self.other_user.id}))
+        post = Post.objects.filter(post_author=self.other_user).get()
+        post.post_author = self.author
+        post.save()
+
+        response = self._get_author_page()
+        self.assertContains(response, _('Number of posts: %(post_count)s') % {'post_count': POST_LIST_PAGE_SIZE + 6})
+        response = self.client.get(reverse(self.url_name, kwargs={'author_id': self.other_user.id}))
+        self.assertContains(response, _('Number of posts: %(post_count)s') % {'post_count': 0})
@@ -1,14 +1,20 @@
 import os
 import tempfile
 
-from django.test import TestCase, override_settings
+from PIL import UnidentifiedImageError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, TransactionTestCase, override_settings
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.translation import gettext as _
 
 from app_blog.forms import CreatePostForm
 from app_blog.models import Post
+from app_blog.services.post_services import create_post
 from core.test_handlers import create_test_user, TEST_USERNAME, TEST_USER_PASSWORD, TEST_POSTS_LIST_INFO
 from app_media.models import PostImage
+from blog.settings import POST_IMAGE_VARIANT_SIZES
+from core.handlers import get_correct_file_path_to_img_tag
 
 
 @override_settings(MEDIA_ROOT=tempfile.mkdtemp())
@@ -137,3 +143,138 @@ class CreatePostPageTest(TestCase):
 
         # Проверка, что пост не создался
         self.assertEqual(len(list(Post.objects.all())), 0)
+
+    def test_create_post_with_wrong_first_file(self):
+        """Тест, что проверяются все загруженные файлы: если текстовый файл передан первым, форма не валидна
+         и пост не создаётся"""
+        self._create_test_user_and_login()
+
+        img_1_path = os.path.normpath(os.path.join(os.getcwd(), 'app_blog/tests/test_files/test_image_1.jpg'))
+        bad_file_path = os.path.normpath(os.path.join(os.getcwd(), 'app_blog/tests/test_files/test.txt'))
+
+        with open(bad_file_path, 'rb') as bad_file, open(img_1_path, 'rb') as img_1:
+            post_context = {'post_title': TEST_POSTS_LIST_INFO[1]['post_title'],
+                            'post_content': TEST_POSTS_LIST_INFO[1]['post_content'],
+                            'images_field': [bad_file, img_1]
+                            }
+            response = self.client.post(reverse(self.url_name), post_context)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('images_field', response.context['form'].errors)
+        self.assertEqual(Post.objects.count(), 0)
+        self.assertEqual(PostImage.objects.count(), 0)
+
+    def test_create_post_rolled_back_on_image_error(self):
+        """Тест проверяющий, что при ошибке сохранения картинки пост не создаётся"""
+        user = create_test_user()
+        bad_file = SimpleUploadedFile('bad.jpg', b'not an image', content_type='image/jpeg')
+        with self.assertRaises(UnidentifiedImageError):
+            create_post(user=user, post_title=TEST_POSTS_LIST_INFO[1]['post_title'],
+                        post_content=TEST_POSTS_LIST_INFO[1]['post_content'], post_images=[bad_file])
+        self.assertEqual(Post.objects.count(), 0)
+
+    def test_create_post_with_images_creates_image_variants(self):
+        """Тест проверяющий, что при создании поста для картинок создаются уменьшенные копии,
+         а страница поста показывает уменьшенную копию со ссылкой на оригинал"""
+        self._create_test_user_and_login()
+
+        img_3_path = os.path.normpath(os.path.join(os.getcwd(), 'app_blog/tests/test_files/test_image_3.jpg'))
+        with open(img_3_path, 'rb') as img_3:
+            post_context = {'post_title': TEST_POSTS_LIST_INFO[1]['post_title'],
+                            'post_content': TEST_POSTS_LIST_INFO[1]['post_content'],
+                            'images_field': [img_3]
+                            }
+            self.client.post(reverse(self.url_name), post_context)
+
+        post_image = PostImage.objects.get()
+        for variant_name, max_size in POST_IMAGE_VARIANT_SIZES.items():
+            variant_file = getattr(post_image, f'post_image_file_{variant_name}')
+            self.assertTrue(variant_file.name.startswith('post_images/'))
+            self.assertLessEqual(variant_file.width, max_size[0])
+            self.assertLessEqual(variant_file.height, max_size[1])
+        self.assertLess(post_image.post_image_file_small.size, post_image.post_image_file.size)
+
+        response = self.client.get(reverse('post_detail', kwargs={'pk': post_image.post.id}))
+        original_path = get_correct_file_path_to_img_tag(post_image.post_image_file)
+        small_path = get_correct_file_path_to_img_tag(post_image.post_image_file_small)
+        self.assertContains(response, f'<a href="{original_path}" target="_blank"><img src="{small_path}"')
+
+    def test_same_images_stored_in_one_content_addressed_file(self):
+        """Тест проверяющий, что одинаковые картинки разных постов хранятся одним файлом,
+         имя которого - хэш содержимого, разложенный по подкаталогам"""
+        self._create_test_user_and_login()
+
+        img_3_path = os.path.normpath(os.path.join(os.getcwd(), 'app_blog/tests/test_files/test_image_3.jpg'))
+        for post_info in TEST_POSTS_LIST_INFO[:2]:
+            with open(img_3_path, 'rb') as img_3:
+                self.client.post(reverse(self.url_name), {'post_title': post_info['post_title'],
+                                                          'post_content': post_info['post_content'],
+                                                          'images_field': [img_3]})
+
+        first_image, second_image = PostImage.objects.order_by('id')
+        self.assertNotEqual(first_image.post_id, second_image.post_id)
+        self.assertEqual(first_image.post_image_file.name, second_image.post_image_file.name)
+        self.assertEqual(first_image.post_image_file_small.name, second_image.post_image_file_small.name)
+        self.assertRegex(first_image.post_image_file.name, r'^post_images/([0-9a-f]{2})/([0-9a-f]{2})/\1\2[0-9a-f]{60}\.jpg$')
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(), POST_IMAGE_FILE_DELETE_GRACE_SECONDS=0)
+class PostImageFilesDeletionTest(TransactionTestCase):
+
+    def _create_post_with_image(self, user, post_info: dict) -> PostImage:
+        post = Post.objects.create(post_author=user, post_title=post_info['post_title'],
+                                   post_content=post_info['post_content'], publication_date=timezone.now())
+        img_3_path = os.path.normpath(os.path.join(os.getcwd(), 'app_blog/tests/test_files/test_image_3.jpg'))
+        with open(img_3_path, 'rb') as img_3:
+            post_image = PostImage(post=post)
+            post_image.post_image_file.save('test_image_3.jpg', img_3, save=False)
+            post_image.save()
+        return post_image
+
+    def test_shared_image_files_deleted_with_last_reference(self):
+        """Тест проверяющий, что общий файл картинки удаляется только вместе с последней ссылающейся на него картинкой"""
+        user = create_test_user()
+        first_image = self._create_post_with_image(user, TEST_POSTS_LIST_INFO[0])
+        second_image = self._create_post_with_image(user, TEST_POSTS_LIST_INFO[1])
+        storage = first_image.post_image_file.storage
+        file_names = [first_image.post_image_file.name, first_image.post_image_file_small.name,
+                      first_image.post_image_file_medium.name]
+
+        first_image.post.delete()
+        for file_name in file_names:
+            self.assertTrue(storage.exists(file_name))
+
+        second_image.post.delete()
+        for file_name in file_names:
+            self.assertFalse(storage.exists(file_name))
+
+    def test_image_file_referenced_by_other_field_not_deleted(self):
+        """Тест проверяющий, что файл не удаляется, пока на него ссылается другое поле другой картинки"""
+        user = create_test_user()
+        first_image = self._create_post_with_image(user, TEST_POSTS_LIST_INFO[0])
+        storage = first_image.post_image_file.storage
+        file_name = first_image.post_image_file.name
+        other_post = Post.objects.create(post_author=user, post_title=TEST_POSTS_LIST_INFO[1]['post_title'],
+                                         post_content=TEST_POSTS_LIST_INFO[1]['post_content'],
+                                         publication_date=timezone.now())
+        PostImage.objects.create(post=other_post, post_image_file='post_images/other.jpg',
+                                 post_image_file_small=file_name)
+
+        first_image.post.delete()
+        self.assertTrue(storage.exists(file_name))
+        self.assertFalse(storage.exists(first_image.post_image_file_medium.name))
+
+    @override_settings(POST_IMAGE_FILE_DELETE_GRACE_SECONDS=60)
+    def test_recently_reused_image_file_not_deleted(self):
+        """Тест проверяющий, что файл, который только что повторно использовала ещё не зафиксированная картинка,
+         не удаляется вместе с последней зафиксированной ссылкой на него"""
+        user = create_test_user()
+        first_image = self._create_post_with_image(user, TEST_POSTS_LIST_INFO[0])
+        storage = first_image.post_image_file.storage
+        img_3_path = os.path.normpath(os.path.join(os.getcwd(), 'app_blog/tests/test_files/test_image_3.jpg'))
+        with open(img_3_path, 'rb') as img_3:
+            reused_file_name = storage.save('post_images/test_image_3.jpg', img_3)
+        self.assertEqual(reused_file_name, first_image.post_image_file.name)
+
+        first_image.post.delete()
+        self.assertTrue(storage.exists(reused_file_name))
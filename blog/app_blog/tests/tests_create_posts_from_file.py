@@ -1,12 +1,23 @@
+import datetime
+import io
 import os
 import tempfile
 
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.files import File
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection, IntegrityError
 from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils.translation import gettext as _
 
 from app_blog.forms import CreatePostsFromFileForm
-from app_blog.models import Post
+from app_blog.models import Post, PostsImportJob
+from app_blog.services.import_job_services import process_posts_import_job, POSTS_IMPORT_JOB_PROGRESS_CACHE_KEY
+from app_blog.services.post_services import save_posts_in_post_list, create_posts_from_file
 from core.test_handlers import create_test_user, TEST_USERNAME, TEST_USER_PASSWORD, get_count_lines_from_file, \
     get_list_lines_from_file, get_list_lines_in_loading_file_format_from_post_list
 from blog.settings import POSTS_FILE_DELIMITER
@@ -26,6 +37,18 @@ class CreatePostsFromFileTest(TestCase):
         create_test_user()
         self.client.login(username=TEST_USERNAME, password=TEST_USER_PASSWORD)
 
+    def _process_import_job(self, response) -> PostsImportJob:
+        """Метод проверяет, что после загрузки файла создана задача создания постов из файла, выполняет её
+         и возвращает выполненную задачу"""
+        self.assertIn(member='import_job', container=response.context)
+        import_job = response.context['import_job']
+        self.assertEqual(import_job.status, PostsImportJob.STATUS_PENDING)
+        self.assertEqual(response.context['message'], _('The file has been queued for processing. Import job '
+                                                        'number %(job_id)s') % {'job_id': import_job.id})
+        process_posts_import_job(import_job.id)
+        import_job.refresh_from_db()
+        return import_job
+
     def test_create_posts_from_file_url_exists_at_desired_location_with_authenticated_user(self):
         """Тест доступности страницы создания постов из файла под авторизованным пользователем"""
         self._create_test_user_and_login()
@@ -71,14 +94,15 @@ class CreatePostsFromFileTest(TestCase):
 
         # страница доступна
         self.assertEqual(response.status_code, 200)
+        import_job = self._process_import_job(response)
 
         # Проверка, что посты не создались
         self.assertEqual(len(list(Post.objects.all())), 0)
 
-        # Отобразилось сообщение об ошибке
-        self.assertIn(member='message', container=response.context)
-        self.assertEqual(response.context['message'], _('No posts have been created. Not all values are'
-                                                        ' specified in line %(line)s') % {'line': 1})
+        # В задаче сохранено сообщение об ошибке
+        self.assertEqual(import_job.status, PostsImportJob.STATUS_FAILED)
+        self.assertEqual(import_job.message, _('No posts have been created. Not all values are'
+                                               ' specified in line %(line)s') % {'line': 1})
 
     def test_create_posts_from_file_img_file(self):
         """Страница создания постов из файла, тест проверющий что посты не создаются если загружается файл
@@ -93,15 +117,16 @@ class CreatePostsFromFileTest(TestCase):
 
         # страница доступна
         self.assertEqual(response.status_code, 200)
+        import_job = self._process_import_job(response)
 
         # Проверка, что посты не создались
         self.assertEqual(len(list(Post.objects.all())), 0)
 
-        # Проверки, что отобразилось сообщение об ошибке
-        self.assertIn(member='message', container=response.context)
-        self.assertEqual(response.context['message'], _("Posts not created. Error reading file. The file must"
-                                                        " be text, the delimiter of values "
-                                                        "is %(delimiter)s") % {'delimiter': POSTS_FILE_DELIMITER})
+        # В задаче сохранено сообщение об ошибке
+        self.assertEqual(import_job.status, PostsImportJob.STATUS_FAILED)
+        self.assertEqual(import_job.message, _("Posts not created. Error reading file. The file must"
+                                               " be text, the delimiter of values "
+                                               "is %(delimiter)s") % {'delimiter': POSTS_FILE_DELIMITER})
 
     def test_create_posts_from_file_incorrect_date(self):
         """Страница создания постов из файла, тест проверющий что посты не создаются если загружается текстовый файл
@@ -117,14 +142,15 @@ class CreatePostsFromFileTest(TestCase):
 
         # страница доступна
         self.assertEqual(response.status_code, 200)
+        import_job = self._process_import_job(response)
 
         # Проверка, что посты не создались
         self.assertEqual(len(list(Post.objects.all())), 0)
 
-        # Отобразилось сообщение об ошибке
-        self.assertIn(member='message', container=response.context)
-        self.assertEqual(response.context['message'], _('No posts have been created. Incorrect date value'
-                                                        ' in line %(line)s') % {'line': 1})
+        # В задаче сохранено сообщение об ошибке
+        self.assertEqual(import_job.status, PostsImportJob.STATUS_FAILED)
+        self.assertEqual(import_job.message, _('No posts have been created. Incorrect date value'
+                                               ' in line %(line)s') % {'line': 1})
 
     def test_create_posts_from_file_empty_title(self):
         """Страница создания постов из файла, тест проверющий что посты не создаются если загружается текстовый файл
@@ -140,14 +166,15 @@ class CreatePostsFromFileTest(TestCase):
 
         # страница доступна
         self.assertEqual(response.status_code, 200)
+        import_job = self._process_import_job(response)
 
         # Проверка, что посты не создались
         self.assertEqual(len(list(Post.objects.all())), 0)
 
-        # Отобразилось сообщение об ошибке
-        self.assertIn(member='message', container=response.context)
-        self.assertEqual(response.context['message'], _('No posts have been created. Empty post title value'
-                                                        ' in line %(line)s') % {'line': 1})
+        # В задаче сохранено сообщение об ошибке
+        self.assertEqual(import_job.status, PostsImportJob.STATUS_FAILED)
+        self.assertEqual(import_job.message, _('No posts have been created. Empty post title value'
+                                               ' in line %(line)s') % {'line': 1})
 
     def test_create_posts_from_file_empty_content(self):
         """Страница создания постов из файла, тест проверющий что посты не создаются если загружается текстовый файл
@@ -163,14 +190,15 @@ class CreatePostsFromFileTest(TestCase):
 
         # страница доступна
         self.assertEqual(response.status_code, 200)
+        import_job = self._process_import_job(response)
 
         # Проверка, что посты не создались
         self.assertEqual(len(list(Post.objects.all())), 0)
 
-        # Отобразилось сообщение об ошибке
-        self.assertIn(member='message', container=response.context)
-        self.assertEqual(response.context['message'], _('No posts have been created. Empty post'
-                                                        ' content value in line %(line)s') % {'line': 1})
+        # В задаче сохранено сообщение об ошибке
+        self.assertEqual(import_job.status, PostsImportJob.STATUS_FAILED)
+        self.assertEqual(import_job.message, _('No posts have been created. Empty post'
+                                               ' content value in line %(line)s') % {'line': 1})
 
     def test_create_posts_from_file_correct_file(self):
         """Страница создания постов из файла, тест проверющий создание постов из корректного файла"""
@@ -188,6 +216,7 @@ class CreatePostsFromFileTest(TestCase):
 
         # страница доступна
         self.assertEqual(response.status_code, 200)
+        import_job = self._process_import_job(response)
 
         # Проверки, что посты создались
         created_post_list = list(Post.objects.all())
@@ -196,6 +225,133 @@ class CreatePostsFromFileTest(TestCase):
         posts_in_line_for_check = get_list_lines_in_loading_file_format_from_post_list(created_post_list)
         self.assertEqual(file_lines.sort(), posts_in_line_for_check.sort())
 
-        self.assertIn(member='message', container=response.context)
-        self.assertEqual(response.context['message'], _('The file was processed successfully. Posted '
-                                                        'by %(post_counter)s posts') % {'post_counter': count_lines})
+        self.assertEqual(import_job.status, PostsImportJob.STATUS_DONE)
+        self.assertEqual(import_job.rows_processed, count_lines)
+        self.assertEqual(import_job.message, _('The file was processed successfully. Posted '
+                                               'by %(post_counter)s posts') % {'post_counter': count_lines})
+
+    def test_posts_import_job_status(self):
+        """Тест проверяющий состояние задачи создания постов из файла до и после её выполнения"""
+        self._create_test_user_and_login()
+        correct_post_file_path = os.path.normpath(
+            os.path.join(os.getcwd(), 'app_blog/tests/test_files/correct_posts_file.txt'))
+        with open(correct_post_file_path, 'rb') as file:
+            response = self.client.post(reverse(self.url_name), {'posts_file': file})
+        import_job = response.context['import_job']
+        status_url = reverse('posts_import_job_status', kwargs={'pk': import_job.id})
+
+        pending_job_status = self.client.get(status_url).json()
+        self.assertEqual(pending_job_status['status'], PostsImportJob.STATUS_PENDING)
+        self.assertEqual(pending_job_status['rows_processed'], 0)
+
+        process_posts_import_job(import_job.id)
+        done_job_status = self.client.get(status_url).json()
+        self.assertEqual(done_job_status['status'], PostsImportJob.STATUS_DONE)
+        self.assertEqual(done_job_status['rows_processed'], get_count_lines_from_file(correct_post_file_path))
+        self.assertEqual(done_job_status['rows_failed'], 0)
+        self.assertGreaterEqual(done_job_status['throughput'], 0)
+
+    def test_posts_import_job_processed_once(self):
+        """Тест проверяющий, что уже захваченная или выполненная задача не выполняется повторно"""
+        import_job = PostsImportJob.objects.create(user=create_test_user(), status=PostsImportJob.STATUS_RUNNING)
+        process_posts_import_job(import_job.id)
+        import_job.refresh_from_db()
+        self.assertEqual(import_job.status, PostsImportJob.STATUS_RUNNING)
+        self.assertIsNone(import_job.finished_at)
+
+    def test_posts_import_job_status_forbidden_for_other_users(self):
+        """Тест проверяющий, что состояние задачи создания постов из файла доступно только её автору"""
+        import_job = PostsImportJob.objects.create(user=create_test_user())
+        status_url = reverse('posts_import_job_status', kwargs={'pk': import_job.id})
+        self.assertEqual(self.client.get(status_url).status_code, 403)
+
+        User.objects.create_user(username='other_user', password=TEST_USER_PASSWORD)
+        self.client.login(username='other_user', password=TEST_USER_PASSWORD)
+        self.assertEqual(self.client.get(status_url).status_code, 404)
+
+    def _get_test_posts(self, count: int) -> list:
+        """Метод возвращает список из count несохранённых постов тестового пользователя"""
+        test_user = create_test_user()
+        return [Post(post_author=test_user,
+                     post_title=f'Пост номер {number}',
+                     post_content=f'Содержание поста номер {number}',
+                     publication_date=datetime.datetime(2021, 1, 1, tzinfo=datetime.timezone.utc))
+                for number in range(count)]
+
+    def test_save_posts_in_post_list_by_batches(self):
+        """Тест проверяющий, что посты из файла вставляются в базу пачками, а не по одному"""
+        posts = self._get_test_posts(5)
+        with CaptureQueriesContext(connection) as queries:
+            save_posts_in_post_list(posts, batch_size=2)
+
+        insert_queries = [query for query in queries if query['sql'].startswith('INSERT')]
+        self.assertEqual(len(insert_queries), 3)
+        self.assertEqual(Post.objects.count(), 5)
+
+    def test_save_posts_in_post_list_all_or_nothing(self):
+        """Тест проверяющий, что при ошибке сохранения одной из пачек постов не сохраняется ни один пост"""
+        posts = self._get_test_posts(5)
+        posts[-1].post_title = None
+        with self.assertRaises(IntegrityError):
+            save_posts_in_post_list(posts, batch_size=2)
+
+        self.assertEqual(Post.objects.count(), 0)
+
+    def test_create_posts_from_file_larger_than_read_chunk(self):
+        """Тест проверяющий создание постов из файла, который читается несколькими кусками,
+         в том числе когда многобайтовый символ разрезан границей куска"""
+        test_user = create_test_user()
+        lines = [f'Заголовок поста {number}{POSTS_FILE_DELIMITER}Содержание поста {number}{POSTS_FILE_DELIMITER}'
+                 f'12:45:00 28.02.2021' for number in range(3000)]
+        file_content = '\n'.join(lines).encode('utf-8')
+        # Граница первого куска файла приходится на середину многобайтового символа
+        with self.assertRaises(UnicodeDecodeError):
+            file_content[:File.DEFAULT_CHUNK_SIZE].decode('utf-8')
+        posts_file = File(io.BytesIO(file_content), name='posts.txt')
+
+        is_correct, message = create_posts_from_file(test_user, posts_file, batch_size=100)
+
+        self.assertTrue(is_correct)
+        self.assertEqual(Post.objects.count(), len(lines))
+        self.assertEqual(Post.objects.filter(post_title='Заголовок поста 2999').count(), 1)
+
+    def test_create_posts_from_file_error_after_saved_batches(self):
+        """Тест проверяющий, что посты не создаются, если ошибка в файле найдена после сохранения части пачек постов"""
+        test_user = create_test_user()
+        correct_line = f'Заголовок{POSTS_FILE_DELIMITER}Содержание{POSTS_FILE_DELIMITER}12:45:00 28.02.2021'
+        incorrect_line = f'Заголовок{POSTS_FILE_DELIMITER}Содержание{POSTS_FILE_DELIMITER}28.02.2021'
+        posts_file = SimpleUploadedFile('posts.txt', '\n'.join([correct_line] * 4 + [incorrect_line]).encode('utf-8'))
+
+        is_correct, message = create_posts_from_file(test_user, posts_file, batch_size=2)
+
+        self.assertFalse(is_correct)
+        self.assertEqual(message, _('No posts have been created. Incorrect date value'
+                                    ' in line %(line)s') % {'line': 5})
+        self.assertEqual(Post.objects.count(), 0)
+
+    def test_posts_import_job_failed_rows(self):
+        """Тест проверяющий, что после ошибки в файле задача не считает откаченные строки обработанными,
+         а количество строк с ошибками равно номеру строки с ошибкой: посты всех строк до неё откатываются"""
+        test_user = create_test_user()
+        correct_line = f'Заголовок{POSTS_FILE_DELIMITER}Содержание{POSTS_FILE_DELIMITER}12:45:00 28.02.2021'
+        incorrect_line = f'Заголовок{POSTS_FILE_DELIMITER}Содержание{POSTS_FILE_DELIMITER}28.02.2021'
+        posts_file = SimpleUploadedFile('posts.txt', '\n'.join([correct_line] * 4 + [incorrect_line]).encode('utf-8'))
+        import_job = PostsImportJob.objects.create(user=test_user, posts_file=posts_file)
+
+        process_posts_import_job(import_job.id)
+        import_job.refresh_from_db()
+        self.assertEqual(import_job.status, PostsImportJob.STATUS_FAILED)
+        self.assertEqual(import_job.rows_processed, 0)
+        self.assertEqual(import_job.rows_failed, 5)
+
+    def test_posts_import_job_progress_from_other_process(self):
+        """Тест проверяющий, что прогресс задачи, выполняемой в другом процессе, виден в состоянии задачи.
+         Другой процесс работает со своим экземпляром общего кэша"""
+        self._create_test_user_and_login()
+        import_job = PostsImportJob.objects.create(user=User.objects.get(username=TEST_USERNAME),
+                                                   status=PostsImportJob.STATUS_RUNNING)
+        other_process_cache = FileBasedCache(settings.CACHES[settings.SHARED_CACHE_ALIAS]['LOCATION'], {})
+        other_process_cache.set(POSTS_IMPORT_JOB_PROGRESS_CACHE_KEY.format(job_id=import_job.id), 500)
+
+        job_status = self.client.get(reverse('posts_import_job_status', kwargs={'pk': import_job.id})).json()
+        self.assertEqual(job_status['rows_processed'], 500)
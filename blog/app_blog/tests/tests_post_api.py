@@ -0,0 +1,92 @@
+import tempfile
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from app_blog.models import Post
+from app_blog.services.post_services import SHORT_CONTENT_LENGTH, POST_LIST_VALUES_DEFAULT_FIELDS, \
+    POST_DETAIL_VALUES_DEFAULT_FIELDS
+from app_media.models import PostImage
+from blog.settings import POST_LIST_PAGE_SIZE
+from core.test_handlers import create_test_posts, create_test_user, create_many_test_posts, \
+    TEST_POSTS_LIST_INFO, TEST_USERNAME
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class PostApiTest(TestCase):
+
+    def test_api_post_list_default_fields(self):
+        """Тест проверяющий поля постов в списке постов по умолчанию и порядок постов"""
+        create_test_posts()
+        response = self.client.get(reverse('api_post_list'))
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual(len(results), len(TEST_POSTS_LIST_INFO))
+        self.assertEqual(list(results[0]), list(POST_LIST_VALUES_DEFAULT_FIELDS))
+        self.assertEqual(results[0]['post_title'], TEST_POSTS_LIST_INFO[0]['post_title'])
+        self.assertEqual(results[0]['author'], TEST_USERNAME)
+        long_post = next(post for post in results if post['post_title'] == TEST_POSTS_LIST_INFO[2]['post_title'])
+        self.assertEqual(long_post['short_content'],
+                         TEST_POSTS_LIST_INFO[2]['post_content'][:SHORT_CONTENT_LENGTH] + '...')
+
+    def test_api_post_list_sparse_fields(self):
+        """Тест проверяющий, что в списке постов возвращаются и выбираются из базы только запрошенные поля"""
+        create_test_posts()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('api_post_list'), {'fields': 'post_title,author'})
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('post_content', queries[0]['sql'])
+        for post in response.json()['results']:
+            self.assertEqual(list(post), ['post_title', 'author'])
+
+    def test_api_post_list_pagination(self):
+        """Тест проверяющий курсорную пагинацию списка постов"""
+        create_many_test_posts(create_test_user(), POST_LIST_PAGE_SIZE + 5)
+        first_page = self.client.get(reverse('api_post_list'), {'fields': 'id'}).json()
+        self.assertEqual(len(first_page['results']), POST_LIST_PAGE_SIZE)
+        self.assertIsNone(first_page['previous_cursor'])
+        second_page = self.client.get(reverse('api_post_list'),
+                                      {'fields': 'id', 'after': first_page['next_cursor']}).json()
+        self.assertEqual(len(second_page['results']), 5)
+        self.assertIsNone(second_page['next_cursor'])
+        all_ids = [post['id'] for post in first_page['results'] + second_page['results']]
+        self.assertEqual(all_ids, list(Post.objects.order_by('-publication_date', '-id').values_list('id', flat=True)))
+
+    def test_api_post_list_errors(self):
+        """Тест проверяющий ответ 400 при неизвестном поле и некорректном курсоре"""
+        self.assertEqual(self.client.get(reverse('api_post_list'), {'fields': 'password'}).status_code, 400)
+        response = self.client.get(reverse('api_post_list'), {'fields': ''})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': 'No fields specified'})
+        self.assertEqual(self.client.get(reverse('api_post_list'), {'after': 'incorrect'}).status_code, 400)
+
+    def test_api_post_detail(self):
+        """Тест проверяющий детальную информацию о посте с картинками"""
+        create_test_posts()
+        post = Post.objects.get(post_title=TEST_POSTS_LIST_INFO[2]['post_title'])
+        PostImage.objects.create(post=post, post_image_file='post_images/image.jpg',
+                                 post_image_file_small='post_images/image_small.jpg')
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('api_post_detail', kwargs={'pk': post.id}))
+        post_values = response.json()
+        self.assertEqual(list(post_values), list(POST_DETAIL_VALUES_DEFAULT_FIELDS))
+        self.assertEqual(post_values['post_content'], TEST_POSTS_LIST_INFO[2]['post_content'])
+        self.assertEqual(post_values['images'], [{'image_path': '/media/post_images/image.jpg',
+                                                  'small_image_path': '/media/post_images/image_small.jpg'}])
+
+    def test_api_post_detail_sparse_fields(self):
+        """Тест проверяющий, что для поста возвращаются только запрошенные поля, а картинки без запроса не выбираются"""
+        create_test_posts()
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('api_post_detail', kwargs={'pk': 1}), {'fields': 'id,post_title'})
+        self.assertEqual(response.json(), {'id': 1, 'post_title': TEST_POSTS_LIST_INFO[0]['post_title']})
+
+    def test_api_post_detail_errors(self):
+        """Тест проверяющий ответ 404 для несуществующего поста и 400 при неизвестном поле"""
+        create_test_posts()
+        self.assertEqual(self.client.get(reverse('api_post_detail', kwargs={'pk': 1000})).status_code, 404)
+        response = self.client.get(reverse('api_post_detail', kwargs={'pk': 1}), {'fields': 'id,unknown'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('unknown', response.json()['error'])
@@ -5,6 +5,8 @@ from django.test import TestCase, override_settings
 from django.urls import reverse
 from django.utils.translation import gettext as _
 
+from app_blog.models import Post
+from app_media.models import PostImage, ProfileAvatarImage
 from core.test_handlers import TEST_USERNAME, TEST_USER_PASSWORD, create_test_posts, \
     TEST_POSTS_LIST_INFO, PUBLICATION_DATETIME_FORMAT
 
@@ -63,3 +65,66 @@ class PostDetailTest(TestCase):
             self.assertContains(response, TEST_USERNAME)
             publication_date = datetime.datetime.strptime(post_info['publication_date'], PUBLICATION_DATETIME_FORMAT)
             self.assertContains(response, publication_date.strftime('%Y-%m-%d %H:%M:%S'))
+
+    def test_post_detail_query_count_does_not_depend_on_related_data(self):
+        """Тест проверяющий, что страница поста с аватаркой автора и картинками получается двумя запросами:
+         пост вместе с автором, профилем и аватаркой, и картинки поста"""
+        post = Post.objects.get(id=1)
+        profile = post.post_author.profile
+        profile.avatar_image_file = ProfileAvatarImage.objects.create(
+            avatar_image_file='avatar_images/avatar.jpg', avatar_image_file_small='avatar_images/avatar_small.jpg')
+        profile.save()
+        for number in range(3):
+            PostImage.objects.create(post=post, post_image_file=f'post_images/image_{number}.jpg',
+                                     post_image_file_small=f'post_images/image_{number}_small.jpg')
+
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse(self.url_name, kwargs={'pk': post.id}))
+        self.assertContains(response, 'avatar_images/avatar_small.jpg')
+        for number in range(3):
+            self.assertContains(response, f'post_images/image_{number}_small.jpg')
+
+    def test_post_detail_conditional_get(self):
+        """Тест проверяющий, что повторный запрос неизменившейся страницы поста получает ответ 304
+         без рендеринга шаблонов, а после изменения поста страница рендерится заново"""
+        url = reverse(self.url_name, kwargs={'pk': 1})
+        response = self.client.get(url)
+        self.assertFalse(response.has_header('Last-Modified'))
+
+        with self.assertNumQueries(1):
+            response_by_etag = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response_by_etag.status_code, 304)
+        self.assertEqual(response_by_etag.templates, [])
+
+        post = Post.objects.get(id=1)
+        post.post_content = 'Изменённое содержание'
+        post.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Изменённое содержание')
+
+    def test_post_detail_conditional_get_not_existing_post(self):
+        """Тест проверяющий, что для несуществующего поста возвращается 404"""
+        response = self.client.get(reverse(self.url_name, kwargs={'pk': 1000}), HTTP_IF_NONE_MATCH='"etag"')
+        self.assertEqual(response.status_code, 404)
+
+    def test_post_detail_conditional_get_after_author_change(self):
+        """Тест проверяющий, что после изменения имени или аватарки автора ETag страницы поста меняется
+         и страница рендерится заново"""
+        url = reverse(self.url_name, kwargs={'pk': 1})
+        etag = self.client.get(url)['ETag']
+
+        post = Post.objects.get(id=1)
+        post.post_author.first_name = 'Новое имя'
+        post.post_author.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Новое имя')
+
+        profile = post.post_author.profile
+        profile.avatar_image_file = ProfileAvatarImage.objects.create(
+            avatar_image_file='avatar_images/avatar.jpg', avatar_image_file_small='avatar_images/avatar_small.jpg')
+        profile.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'avatar_images/avatar_small.jpg')
@@ -0,0 +1,98 @@
+import tempfile
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils.http import http_date
+
+from app_blog.models import Post
+from app_users.models import Profile
+from blog.settings import POST_FEED_SIZE
+from core.test_handlers import clear_caches, create_test_user, create_many_test_posts
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class PostFeedsTest(TestCase):
+
+    def setUp(self):
+        """Метод предварительных действий. Перед каждым тестом очищаем кэш и создаём автора с постами
+         и другого пользователя с одним постом"""
+        clear_caches()
+        self.author = create_test_user()
+        create_many_test_posts(self.author, POST_FEED_SIZE + 5)
+        other_user = User.objects.create_user(username='other_user', password='p@ssw0rd')
+        Profile.objects.create(user=other_user)
+        Post.objects.create(post_author=other_user, post_title='Пост другого пользователя',
+                            post_content='Содержание', publication_date='2030-01-01T00:00:00Z')
+
+    def test_rss_and_atom_feeds(self):
+        """Тест проверяющий, что RSS и Atom ленты содержат POST_FEED_SIZE последних постов"""
+        rss_response = self.client.get(reverse('post_rss_feed'))
+        self.assertEqual(rss_response.status_code, 200)
+        self.assertTrue(rss_response['Content-Type'].startswith('application/rss+xml'))
+        self.assertEqual(rss_response.content.decode().count('<item>'), POST_FEED_SIZE)
+        self.assertContains(rss_response, 'Пост другого пользователя')
+        self.assertContains(rss_response, f'Пост номер {POST_FEED_SIZE + 4}')
+        self.assertNotContains(rss_response, 'Пост номер 0<')
+
+        atom_response = self.client.get(reverse('post_atom_feed'))
+        self.assertTrue(atom_response['Content-Type'].startswith('application/atom+xml'))
+        self.assertEqual(atom_response.content.decode().count('<entry>'), POST_FEED_SIZE)
+
+    def test_author_feeds(self):
+        """Тест проверяющий, что ленты автора содержат только его посты, а для несуществующего автора
+         возвращается 404"""
+        for url_name in ('author_rss_feed', 'author_atom_feed'):
+            response = self.client.get(reverse(url_name, kwargs={'author_id': self.author.id}))
+            self.assertEqual(response.status_code, 200)
+            self.assertContains(response, f'Пост номер {POST_FEED_SIZE + 4}')
+            self.assertNotContains(response, 'Пост другого пользователя')
+            response = self.client.get(reverse(url_name, kwargs={'author_id': 1000}))
+            self.assertEqual(response.status_code, 404)
+
+    def test_feed_cache(self):
+        """Тест проверяющий, что повторный запрос ленты отдаётся из кэша без запросов к базе,
+         а после создания поста лента обновляется"""
+        first_response = self.client.get(reverse('post_rss_feed'))
+        with self.assertNumQueries(0):
+            cached_response = self.client.get(reverse('post_rss_feed'))
+        self.assertEqual(cached_response.content, first_response.content)
+
+        Post.objects.create(post_author=self.author, post_title='Новый пост', post_content='Содержание',
+                            publication_date='2031-01-01T00:00:00Z')
+        self.assertContains(self.client.get(reverse('post_rss_feed')), 'Новый пост')
+
+    def test_feed_conditional_get(self):
+        """Тест проверяющий, что повторный запрос неизменившейся ленты получает ответ 304,
+         а после создания поста - новую ленту"""
+        response = self.client.get(reverse('author_atom_feed', kwargs={'author_id': self.author.id}))
+        self.assertFalse(response.has_header('Last-Modified'))
+        not_modified_response = self.client.get(reverse('author_atom_feed', kwargs={'author_id': self.author.id}),
+                                                HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(not_modified_response.status_code, 304)
+
+        Post.objects.create(post_author=self.author, post_title='Новый пост', post_content='Содержание',
+                            publication_date='2031-01-01T00:00:00Z')
+        response = self.client.get(reverse('author_atom_feed', kwargs={'author_id': self.author.id}),
+                                   HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Новый пост')
+
+    def test_feed_cache_by_scheme(self):
+        """Тест проверяющий, что лента, закэшированная для http, не отдаётся по https с http ссылками"""
+        self.client.get(reverse('post_rss_feed'))
+        secure_response = self.client.get(reverse('post_rss_feed'), secure=True)
+        self.assertContains(secure_response, 'https://testserver/')
+        self.assertNotContains(secure_response, 'http://testserver/')
+
+    def test_feed_not_modified_only_by_etag(self):
+        """Тест проверяющий, что лента не сравнивается по If-Modified-Since: после удаления поста дата изменения
+         постов не меняется, и запрос только с If-Modified-Since должен получить новую ленту"""
+        deleted_post = Post.objects.get(post_author__username='other_user')
+        if_modified_since = http_date(Post.objects.latest('updated_at').updated_at.timestamp() + 60)
+        self.assertContains(self.client.get(reverse('post_rss_feed')), deleted_post.post_title)
+
+        deleted_post.delete()
+        response = self.client.get(reverse('post_rss_feed'), HTTP_IF_MODIFIED_SINCE=if_modified_since)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, deleted_post.post_title)
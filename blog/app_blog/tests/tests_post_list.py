@@ -1,19 +1,37 @@
 import datetime
 import tempfile
+from io import StringIO
 
-from django.test import TestCase, override_settings
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.utils import make_template_fragment_key
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils.translation import gettext as _
 
-from app_blog.services.post_services import SHORT_CONTENT_LENGTH
+from app_blog.models import Post
+from app_blog.services.post_cache_services import get_post_list_cache_stats, get_post_list_cache_key, \
+    POST_LIST_CACHE_VERSION_KEY
+from app_blog.services.post_services import SHORT_CONTENT_LENGTH, create_posts_from_file
+from blog.settings import POST_LIST_PAGE_SIZE, POSTS_FILE_DELIMITER, POST_CARD_CACHE_TIMEOUT
 from core.test_handlers import create_test_posts, TEST_POSTS_LIST_INFO, PUBLICATION_DATETIME_FORMAT, \
-    create_test_user, TEST_USERNAME, TEST_USER_PASSWORD
+    create_test_user, TEST_USERNAME, TEST_USER_PASSWORD, create_many_test_posts, clear_caches
 
 
 @override_settings(MEDIA_ROOT=tempfile.mkdtemp())
 class PostListTest(TestCase):
     url_name = 'post_list'
 
+    def setUp(self):
+        """Метод предварительных действий. Перед каждым тестом очищаем кэш страниц списка постов"""
+        clear_caches()
+
     def test_post_list_url_exists_at_desired_location(self):
         """Тест проверки существования страницы постов по предпологаемому адресу"""
         response = self.client.get(reverse(self.url_name))
@@ -76,3 +94,209 @@ class PostListTest(TestCase):
         self.assertContains(response, _('Create post'))
         self.assertContains(response, _('Creating posts from a file'))
         self.assertContains(response, _('Logout'))
+
+    def test_post_list_pagination(self):
+        """Тест проверяющий постраничный вывод списка постов и переходы по курсорам на следующую и предыдущую
+         страницы"""
+        create_many_test_posts(create_test_user(), POST_LIST_PAGE_SIZE + 5)
+        first_page_response = self.client.get(reverse(self.url_name))
+        first_page = first_page_response.context['post_list']
+        self.assertEqual(len(first_page), POST_LIST_PAGE_SIZE)
+        self.assertIsNone(first_page.previous_cursor)
+        self.assertIsNotNone(first_page.next_cursor)
+        self.assertContains(first_page_response, _('Next page'))
+        self.assertNotContains(first_page_response, _('Previous page'))
+
+        second_page_response = self.client.get(reverse(self.url_name), {'after': first_page.next_cursor})
+        second_page = second_page_response.context['post_list']
+        self.assertEqual(len(second_page), 5)
+        self.assertIsNone(second_page.next_cursor)
+        self.assertContains(second_page_response, _('Previous page'))
+        self.assertNotContains(second_page_response, _('Next page'))
+        self.assertGreater(first_page[-1].publication_date, second_page[0].publication_date)
+
+        previous_page_response = self.client.get(reverse(self.url_name), {'before': second_page.previous_cursor})
+        previous_page = previous_page_response.context['post_list']
+        self.assertEqual([post.id for post in previous_page], [post.id for post in first_page])
+        self.assertIsNone(previous_page.previous_cursor)
+        self.assertEqual(previous_page.next_cursor, first_page.next_cursor)
+
+    def test_post_list_incorrect_cursor(self):
+        """Тест проверяющий, что страница списка постов с некорректным курсором недоступна"""
+        response = self.client.get(reverse(self.url_name), {'after': 'incorrect-cursor'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_post_list_query_count_does_not_depend_on_posts_count(self):
+        """Тест проверяющий, что количество запросов к базе на странице списка постов не зависит от количества
+         постов на странице"""
+        test_user = create_test_user()
+        create_many_test_posts(test_user, 2)
+        with CaptureQueriesContext(connection) as few_posts_queries:
+            self.client.get(reverse(self.url_name))
+
+        create_many_test_posts(User.objects.create_user(username='second_author'), POST_LIST_PAGE_SIZE)
+        with CaptureQueriesContext(connection) as many_posts_queries:
+            response = self.client.get(reverse(self.url_name))
+
+        self.assertEqual(len(response.context['post_list']), POST_LIST_PAGE_SIZE)
+        self.assertEqual(len(few_posts_queries), len(many_posts_queries))
+
+    def test_post_list_short_content(self):
+        """Тест проверяющий, что на странице списка постов длинное содержание поста обрезается до
+         SHORT_CONTENT_LENGTH символов, а полное содержание поста не выбирается из базы"""
+        create_test_posts()
+        response = self.client.get(reverse(self.url_name))
+        for post in response.context['post_list']:
+            self.assertIn('post_content', post.get_deferred_fields())
+        for post_info in TEST_POSTS_LIST_INFO:
+            if len(post_info['post_content']) > SHORT_CONTENT_LENGTH:
+                self.assertContains(response, f"{post_info['post_content'][:SHORT_CONTENT_LENGTH]}...")
+                self.assertNotContains(response, post_info['post_content'])
+            else:
+                self.assertContains(response, post_info['post_content'])
+
+    def test_post_list_cache_hit(self):
+        """Тест проверяющий, что повторный запрос страницы списка постов отдаётся из кэша без запросов к базе"""
+        create_test_posts()
+        first_response = self.client.get(reverse(self.url_name))
+        with self.assertNumQueries(0):
+            second_response = self.client.get(reverse(self.url_name))
+
+        self.assertEqual(first_response.context['post_list_html'], second_response.context['post_list_html'])
+        self.assertNotIn(member='post_list', container=second_response.context)
+        self.assertEqual(get_post_list_cache_stats(), {'hits': 1, 'misses': 1})
+
+    def test_post_list_cache_stats_command(self):
+        """Тест проверяющий, что команда post_list_cache_stats выводит попадания и промахи кэша"""
+        self.client.get(reverse(self.url_name))
+        self.client.get(reverse(self.url_name))
+        output = StringIO()
+        call_command('post_list_cache_stats', stdout=output)
+        self.assertEqual(output.getvalue().strip(), 'Post list cache hits: 1, misses: 1, hit rate: 50.0%')
+
+    def test_post_list_cache_invalidated_from_other_process(self):
+        """Тест проверяющий, что изменение версии списка постов в другом процессе (например, в команде
+         process_posts_import_jobs) сбрасывает страницы, закэшированные в этом процессе"""
+        test_user = create_test_user()
+        self.client.get(reverse(self.url_name))
+        Post.objects.bulk_create([Post(post_author=test_user, post_title='Пост из другого процесса',
+                                       post_content='Содержание',
+                                       publication_date=datetime.datetime.now(tz=datetime.timezone.utc))])
+        other_process_cache = FileBasedCache(settings.CACHES[settings.SHARED_CACHE_ALIAS]['LOCATION'], {})
+        other_process_cache.incr(POST_LIST_CACHE_VERSION_KEY)
+
+        self.assertContains(self.client.get(reverse(self.url_name)), 'Пост из другого процесса')
+
+    def test_post_list_cache_invalidated_on_post_create(self):
+        """Тест проверяющий, что закэшированная страница списка постов обновляется после создания поста"""
+        test_user = create_test_user()
+        self.client.get(reverse(self.url_name))
+        Post.objects.create(post_author=test_user, post_title='Новый пост', post_content='Содержание нового поста',
+                            publication_date=datetime.datetime.now(tz=datetime.timezone.utc))
+
+        response = self.client.get(reverse(self.url_name))
+        self.assertContains(response, 'Новый пост')
+        self.assertEqual(get_post_list_cache_stats(), {'hits': 0, 'misses': 2})
+
+    def test_post_list_cache_invalidated_on_create_posts_from_file(self):
+        """Тест проверяющий, что закэшированная страница списка постов обновляется после создания постов из файла"""
+        test_user = create_test_user()
+        self.client.get(reverse(self.url_name))
+        posts_file = SimpleUploadedFile('posts.txt', f'Пост из файла{POSTS_FILE_DELIMITER}Содержание'
+                                                     f'{POSTS_FILE_DELIMITER}12:45:00 28.02.2021'.encode('utf-8'))
+        create_posts_from_file(test_user, posts_file)
+
+        response = self.client.get(reverse(self.url_name))
+        self.assertContains(response, 'Пост из файла')
+
+    def test_post_list_cache_invalidated_on_author_rename(self):
+        """Тест проверяющий, что после переименования автора страница списка постов пересобирается
+         и карточки его постов показывают новое имя"""
+        test_user = create_test_user()
+        create_many_test_posts(test_user, 2)
+        self.client.get(reverse(self.url_name))
+
+        test_user.username = 'renamed_author'
+        test_user.save()
+        response = self.client.get(reverse(self.url_name))
+        self.assertContains(response, 'renamed_author', count=2)
+        self.assertNotContains(response, f'>{TEST_USERNAME}<')
+
+    def test_post_list_rebuild_renders_only_changed_post_cards(self):
+        """Тест проверяющий, что при пересборке страницы списка постов заново рендерятся только карточки
+         изменившихся постов, а карточки остальных постов берутся из кэша"""
+        create_test_posts()
+        self.client.get(reverse(self.url_name))
+        changed_post, unchanged_post = Post.objects.order_by('id')[:2]
+        unchanged_post_card_key = make_template_fragment_key(
+            'post_card', [unchanged_post.id, unchanged_post.updated_at.isoformat(), unchanged_post.post_author.username,
+                          'en'])
+        self.assertIsNotNone(cache.get(unchanged_post_card_key))
+        cache.set(unchanged_post_card_key, 'Закэшированная карточка поста', POST_CARD_CACHE_TIMEOUT)
+
+        changed_post.post_title = 'Изменённый заголовок'
+        changed_post.save()
+        response = self.client.get(reverse(self.url_name))
+
+        self.assertContains(response, 'Изменённый заголовок')
+        self.assertContains(response, 'Закэшированная карточка поста')
+        self.assertNotContains(response, unchanged_post.post_title)
+
+    def test_post_list_conditional_get_not_modified(self):
+        """Тест проверяющий, что повторный запрос неизменившейся страницы списка постов с ETag
+         получает ответ 304 без рендеринга шаблонов. Last-Modified не отдаётся, так как дата изменения
+         постов не меняется при удалении поста и входе пользователя"""
+        create_test_posts()
+        response = self.client.get(reverse(self.url_name))
+        self.assertTrue(response.has_header('ETag'))
+        self.assertFalse(response.has_header('Last-Modified'))
+
+        with self.assertNumQueries(0):
+            response_by_etag = self.client.get(reverse(self.url_name), HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response_by_etag.status_code, 304)
+        self.assertEqual(response_by_etag.templates, [])
+        self.assertEqual(response_by_etag.content, b'')
+
+    def test_post_list_conditional_get_modified(self):
+        """Тест проверяющий, что после изменения, удаления постов, переименования автора или входа пользователя
+         ETag страницы списка постов меняется и страница рендерится заново"""
+        create_test_posts()
+        etag = self.client.get(reverse(self.url_name))['ETag']
+
+        post = Post.objects.order_by('id').first()
+        post.post_title = 'Изменённый заголовок'
+        post.save()
+        response = self.client.get(reverse(self.url_name), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Изменённый заголовок')
+
+        etag = response['ETag']
+        Post.objects.order_by('id').last().delete()
+        response = self.client.get(reverse(self.url_name), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+        etag = response['ETag']
+        author = User.objects.get(username=TEST_USERNAME)
+        author.username = 'renamed_author'
+        author.save()
+        response = self.client.get(reverse(self.url_name), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'renamed_author')
+
+        etag = response['ETag']
+        self.client.login(username='renamed_author', password=TEST_USER_PASSWORD)
+        response = self.client.get(reverse(self.url_name), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+
+class PostListCacheTransactionTest(TransactionTestCase):
+
+    def test_post_list_cache_invalidated_after_commit(self):
+        """Тест проверяющий, что страница списка постов, закэшированная параллельным запросом до фиксации
+         транзакции с новым постом, не используется после фиксации"""
+        test_user = create_test_user()
+        with transaction.atomic():
+            Post.objects.create(post_author=test_user, post_title='Новый пост', post_content='Содержание',
+                                publication_date=datetime.datetime.now(tz=datetime.timezone.utc))
+            pre_commit_cache_key = get_post_list_cache_key('en')
+        self.assertNotEqual(get_post_list_cache_key('en'), pre_commit_cache_key)
@@ -0,0 +1,104 @@
+import tempfile
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils.translation import gettext as _
+
+from app_blog.models import Post
+from app_blog.services.post_search_services import search_posts, get_search_match_expression
+from core.test_handlers import create_test_posts, create_test_user, create_many_test_posts, TEST_POSTS_LIST_INFO
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class PostSearchTest(TestCase):
+    url_name = 'post_search'
+
+    def test_post_search_url_exists_at_desired_location(self):
+        """Тест доступности страницы поиска постов и использования корректного шаблона"""
+        response = self.client.get(reverse(self.url_name), {'q': 'пост'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'post_search.html')
+
+    def test_post_search_by_title_and_content(self):
+        """Тест проверяющий поиск постов по заголовку и содержанию без учёта регистра"""
+        create_test_posts()
+        response = self.client.get(reverse(self.url_name), {'q': 'БУТЕРБРОД'})
+        self.assertContains(response, TEST_POSTS_LIST_INFO[2]['post_title'])
+        self.assertNotContains(response, TEST_POSTS_LIST_INFO[0]['post_title'])
+
+        post_list = search_posts('колбасой язык')
+        self.assertEqual([post.post_title for post in post_list], [TEST_POSTS_LIST_INFO[2]['post_title']])
+
+    def test_post_search_nothing_found(self):
+        """Тест проверяющий страницу поиска без результатов"""
+        create_test_posts()
+        response = self.client.get(reverse(self.url_name), {'q': 'несуществующееслово'})
+        self.assertContains(response, _('Nothing was found'))
+
+    def test_post_search_ranking(self):
+        """Тест проверяющий, что посты с совпадением в заголовке находятся выше постов с совпадением в содержании"""
+        user = create_test_user()
+        Post.objects.create(post_author=user, post_title='Обычный пост', post_content='Рецепт: бутерброд с сыром',
+                            publication_date='2021-01-01T00:00:00Z')
+        Post.objects.create(post_author=user, post_title='Бутерброд', post_content='Хлеб и сыр',
+                            publication_date='2020-01-01T00:00:00Z')
+        post_list = search_posts('бутерброд')
+        self.assertEqual([post.post_title for post in post_list], ['Бутерброд', 'Обычный пост'])
+        self.assertLess(post_list[0].search_rank, post_list[1].search_rank)
+
+    def test_post_search_index_follows_post_changes(self):
+        """Тест проверяющий, что индекс поиска обновляется при создании через bulk_create, изменении и удалении постов"""
+        create_many_test_posts(create_test_user(), 3)
+        self.assertEqual(len(search_posts('номер')), 3)
+
+        post = Post.objects.get(post_title='Пост номер 1')
+        post.post_title = 'Переименованный'
+        post.post_content = 'Новое содержание'
+        post.save()
+        self.assertEqual(len(search_posts('номер')), 2)
+        self.assertEqual([found_post.id for found_post in search_posts('переименованный')], [post.id])
+
+        post.delete()
+        self.assertEqual(len(search_posts('переименованный')), 0)
+
+    def test_post_search_cursor_pagination(self):
+        """Тест проверяющий, что переход по страницам результатов поиска вперёд и назад возвращает каждый пост
+         ровно один раз в порядке релевантности"""
+        create_many_test_posts(create_test_user(), 25)
+        first_page = search_posts('номер', page_size=10)
+        self.assertIsNone(first_page.previous_cursor)
+        second_page = search_posts('номер', after=first_page.next_cursor, page_size=10)
+        third_page = search_posts('номер', after=second_page.next_cursor, page_size=10)
+        self.assertIsNone(third_page.next_cursor)
+
+        found_ids = [post.id for page in (first_page, second_page, third_page) for post in page]
+        self.assertEqual(len(found_ids), 25)
+        self.assertEqual(len(set(found_ids)), 25)
+        ranks = [post.search_rank for page in (first_page, second_page, third_page) for post in page]
+        self.assertEqual(ranks, sorted(ranks))
+
+        previous_page = search_posts('номер', before=third_page.previous_cursor, page_size=10)
+        self.assertEqual([post.id for post in previous_page], [post.id for post in second_page])
+
+        response = self.client.get(reverse(self.url_name), {'q': 'номер', 'after': first_page.next_cursor})
+        self.assertContains(response, '?q=%D0%BD%D0%BE%D0%BC%D0%B5%D1%80&before=')
+
+    def test_post_search_query_with_search_syntax(self):
+        """Тест проверяющий, что символы синтаксиса FTS5 в строке поиска не приводят к ошибке"""
+        create_test_posts()
+        self.assertEqual(get_search_match_expression('пр-равильно "ты" OR*'), '"пр" "равильно" "ты" "OR"')
+        response = self.client.get(reverse(self.url_name), {'q': 'пр-равильно "ты" OR* NEAR('})
+        self.assertEqual(response.status_code, 200)
+
+    def test_post_search_empty_query(self):
+        """Тест проверяющий, что пустая строка поиска не возвращает постов"""
+        create_test_posts()
+        self.assertEqual(len(search_posts('  ')), 0)
+        response = self.client.get(reverse(self.url_name))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, _('Nothing was found'))
+
+    def test_post_search_incorrect_cursor(self):
+        """Тест проверяющий, что страница поиска с некорректным курсором возвращает 404"""
+        response = self.client.get(reverse(self.url_name), {'q': 'пост', 'after': 'incorrect'})
+        self.assertEqual(response.status_code, 404)
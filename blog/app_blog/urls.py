@@ -5,7 +5,20 @@ from . import views
 
 urlpatterns = [
     path('post_list', views.post_list_view, name='post_list'),  # Страница списка постов
+    path('author/<int:author_id>', views.author_post_list_view, name='author_post_list'),  # Страница постов автора
+    path('post_search', views.post_search_view, name='post_search'),  # Страница поиска постов
     path('create_post', views.CreatePostView.as_view(), name='create_post'),  # страница создания поста
-    path('post_detail/<int:pk>', views.PostDetailView.as_view(), name='post_detail'),  # страница детальной информации о посте
-    path('create_posts_from_file', views.CreatePostsFromFileView.as_view(), name='create_posts_from_file')
+    path('post_detail/<int:pk>', views.PostDetailView.as_view(),
+         name='post_detail'),  # страница детальной информации о посте
+    path('create_posts_from_file', views.CreatePostsFromFileView.as_view(), name='create_posts_from_file'),
+    path('posts_import_job/<int:pk>', views.posts_import_job_status_view,
+         name='posts_import_job_status'),  # состояние задачи создания постов из файла
+    path('feeds/rss', views.post_feed_view, {'feed_name': 'rss'}, name='post_rss_feed'),  # RSS лента постов
+    path('feeds/atom', views.post_feed_view, {'feed_name': 'atom'}, name='post_atom_feed'),  # Atom лента постов
+    path('feeds/author/<int:author_id>/rss', views.post_feed_view, {'feed_name': 'author_rss'},
+         name='author_rss_feed'),  # RSS лента постов автора
+    path('feeds/author/<int:author_id>/atom', views.post_feed_view, {'feed_name': 'author_atom'},
+         name='author_atom_feed'),  # Atom лента постов автора
+    path('api/posts', views.api_post_list_view, name='api_post_list'),  # API списка постов
+    path('api/posts/<int:pk>', views.api_post_detail_view, name='api_post_detail'),  # API детальной информации о посте
 ]
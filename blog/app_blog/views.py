@@ -1,19 +1,77 @@
 from django.core.exceptions import PermissionDenied
-from django.shortcuts import render, redirect
+from django.http import Http404, JsonResponse, HttpResponse
+from django.shortcuts import render, redirect, get_object_or_404
+from django.template.loader import render_to_string
+from django.utils.decorators import method_decorator
 from django.views import generic
+from django.views.decorators.http import condition
 from django.views.generic.base import View
-from django.utils.translation import gettext as _
+from django.utils.translation import gettext as _, get_language
+
+from app_users.services.profile_services import get_user_profile_summary
+from blog.settings import POST_CARD_CACHE_TIMEOUT
+from .feeds import LatestPostsFeed, LatestPostsAtomFeed, AuthorPostsFeed, AuthorPostsAtomFeed
+from .forms import CreatePostForm, CreatePostsFromFileForm, PostSearchForm
+from .models import Post, PostsImportJob
+from .services.author_services import get_author_header, AuthorNotFoundException
+from .services.conditional_get_services import get_post_list_etag, get_post_detail_etag, get_post_feed_etag, \
+    get_request_post_detail
+from .services.cursor_pagination import InvalidCursorException
+from .services.import_job_services import create_posts_import_job, get_posts_import_job_progress
+from .services.post_cache_services import get_post_list_cache_key, get_cached_post_list_html, \
+    set_cached_post_list_html, get_post_feed_cache_key, get_cached_post_feed, set_cached_post_feed
+from .services.post_search_services import search_posts
+from .services.post_services import (
+    get_post_list, get_author_post_list, get_post_values_list, get_post_values, InvalidPostFieldsException,
+    POST_LIST_VALUES_DEFAULT_FIELDS, POST_DETAIL_VALUES_DEFAULT_FIELDS, get_post_images,
+    create_post,
+)
+
+
+@condition(etag_func=get_post_list_etag)
+def post_list_view(request):
+    """Вью для страницы списка постов.
+     Список постов рендерится отдельным фрагментом, который кэшируется для каждого языка и курсора страницы.
+     Карточки постов дополнительно кэшируются по id и дате изменения поста, поэтому при пересборке страницы
+     заново рендерятся только изменившиеся карточки. Если список постов не изменился с прошлого запроса клиента,
+     возвращается ответ 304 без рендеринга страницы"""
+    after, before = request.GET.get('after'), request.GET.get('before')
+    cache_key = get_post_list_cache_key(get_language(), after=after, before=before)
+    context = {'post_list_html': get_cached_post_list_html(cache_key)}
+    if context['post_list_html'] is None:
+        try:
+            post_list = get_post_list(after=after, before=before)
+        except InvalidCursorException:
+            raise Http404()
+        context['post_list'] = post_list
+        context['post_list_html'] = render_to_string('post_list_content.html',
+                                                     {'post_list': post_list,
+                                                      'post_card_cache_timeout': POST_CARD_CACHE_TIMEOUT})
+        set_cached_post_list_html(cache_key, context['post_list_html'])
+    return render(request, 'post_list.html', context)
 
-from core.handlers import get_correct_file_path_to_img_tag
-from .forms import CreatePostForm, CreatePostsFromFileForm
-from .models import Post
-from .services.post_services import get_post_list, get_post_images, create_post, create_posts_from_file
 
+def author_post_list_view(request, author_id: int):
+    """Вью для страницы постов автора. Шапка страницы с информацией об авторе берётся из кэша"""
+    try:
+        author_header = get_author_header(author_id)
+        post_list = get_author_post_list(author_id, after=request.GET.get('after'), before=request.GET.get('before'))
+    except (AuthorNotFoundException, InvalidCursorException):
+        raise Http404()
+    context = {'author': author_header, 'post_list': post_list}
+    return render(request, 'author_post_list.html', context)
 
-def post_list_view(request):
-    """Вью для страницы списка постов"""
-    context = {'post_list': get_post_list()}
-    return render(request, 'post_list.html', context)
+
+def post_search_view(request):
+    """Вью для страницы полнотекстового поиска постов. Результаты упорядочены по релевантности"""
+    search_form = PostSearchForm(request.GET)
+    query = search_form.cleaned_data['q'] if search_form.is_valid() else ''
+    try:
+        post_list = search_posts(query, after=request.GET.get('after'), before=request.GET.get('before'))
+    except InvalidCursorException:
+        raise Http404()
+    context = {'form': search_form, 'query': query, 'post_list': post_list}
+    return render(request, 'post_search.html', context)
 
 
 class CreatePostView(View):
@@ -35,7 +93,7 @@ class CreatePostView(View):
             create_post(user=request.user,
                         post_title=create_post_form.cleaned_data['post_title'],
                         post_content=create_post_form.cleaned_data['post_content'],
-                        post_images=request.FILES.getlist('images_field')
+                        post_images=create_post_form.cleaned_data['images_field']
                         )
 
             return redirect('post_list')
@@ -45,17 +103,25 @@ class CreatePostView(View):
         return render(request, 'create_post.html', context)
 
 
+@method_decorator(condition(etag_func=get_post_detail_etag), name='dispatch')
 class PostDetailView(generic.DetailView):
-    """Вью для детальной страницы поста"""
+    """Вью для детальной страницы поста. Если пост не изменился, возвращается ответ 304 без рендеринга страницы"""
     model = Post
     template_name = 'post_detail.html'
     context_object_name = 'post'
 
+    def get_object(self, queryset=None):
+        # Пост уже выбран вместе с автором при вычислении ETag
+        post = get_request_post_detail(self.request, self.kwargs['pk'])
+        if post is None:
+            raise Http404(_('Post not found'))
+        return post
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['post_images'] = get_post_images(context['post'])
-        avatar_path = get_correct_file_path_to_img_tag(context['post'].post_author.profile.avatar_image_file)
-        context['avatar_path'] = avatar_path
+        # Автор загружен вместе с постом, сводка профиля строится из него без запросов
+        context['author'] = get_user_profile_summary(context['post'].post_author)
         return context
 
 
@@ -76,12 +142,79 @@ class CreatePostsFromFileView(View):
         create_posts_from_file_form = CreatePostsFromFileForm(request.POST, request.FILES)
         context = {'form': create_posts_from_file_form}
         if create_posts_from_file_form.is_valid():
-            is_corrects, message = create_posts_from_file(user=request.user,
-                                                          posts_file=create_posts_from_file_form.cleaned_data['posts_file']
-                                                          )
-            context['message'] = message
+            import_job = create_posts_import_job(user=request.user,
+                                                 posts_file=create_posts_from_file_form.cleaned_data['posts_file'])
+            context['import_job'] = import_job
+            context['message'] = _('The file has been queued for processing. '
+                                   'Import job number %(job_id)s') % {'job_id': import_job.id}
             return render(request, 'create_posts_from_file.html', context)
 
         # Если форма не прошла валидацию
         context['message'] = _('Form is invalid')
         return render(request, 'create_posts_from_file.html', context)
+
+
+def posts_import_job_status_view(request, pk):
+    """Вью состояния задачи создания постов из файла. Возвращает JSON с прогрессом задачи"""
+    if not request.user.is_authenticated:
+        raise PermissionDenied()
+    import_job = get_object_or_404(PostsImportJob, pk=pk, user=request.user)
+    return JsonResponse(get_posts_import_job_progress(import_job))
+
+
+POST_FEEDS = {'rss': LatestPostsFeed(),
+              'atom': LatestPostsAtomFeed(),
+              'author_rss': AuthorPostsFeed(),
+              'author_atom': AuthorPostsAtomFeed()}
+
+
+@condition(etag_func=get_post_feed_etag)
+def post_feed_view(request, feed_name: str, author_id: int = None):
+    """Вью RSS/Atom лент последних постов. Лента кэшируется до изменения постов,
+     если посты не изменились с прошлого запроса клиента, возвращается ответ 304.
+     Лента проверяется только по ETag, поэтому Last-Modified, который добавляет генератор ленты, не отдаётся"""
+    cache_key = get_post_feed_cache_key(feed_name, get_language(), request.scheme, request.get_host(),
+                                        author_id=author_id)
+    cached_feed = get_cached_post_feed(cache_key)
+    if cached_feed is not None:
+        content, content_type = cached_feed
+        return HttpResponse(content, content_type=content_type)
+    feed_kwargs = {'author_id': author_id} if author_id is not None else {}
+    response = POST_FEEDS[feed_name](request, **feed_kwargs)
+    del response['Last-Modified']
+    set_cached_post_feed(cache_key, response.content, response['Content-Type'])
+    return response
+
+
+def _get_api_fields(request, default_fields: tuple) -> list:
+    """Метод возвращает список полей поста из параметра fields запроса (через запятую) или поля по умолчанию"""
+    fields = request.GET.get('fields')
+    if fields is None:
+        return list(default_fields)
+    return [field.strip() for field in fields.split(',') if field.strip()]
+
+
+def api_post_list_view(request):
+    """Вью API списка постов. Возвращает JSON со страницей постов и курсорами соседних страниц.
+     Набор полей постов задаётся параметром fields"""
+    try:
+        post_page = get_post_values_list(_get_api_fields(request, POST_LIST_VALUES_DEFAULT_FIELDS),
+                                         after=request.GET.get('after'), before=request.GET.get('before'))
+    except InvalidPostFieldsException as exception:
+        return JsonResponse({'error': str(exception)}, status=400)
+    except InvalidCursorException:
+        return JsonResponse({'error': _('Incorrect cursor')}, status=400)
+    return JsonResponse({'results': post_page.items,
+                         'next_cursor': post_page.next_cursor,
+                         'previous_cursor': post_page.previous_cursor})
+
+
+def api_post_detail_view(request, pk):
+    """Вью API детальной информации о посте. Набор полей поста задаётся параметром fields"""
+    try:
+        post_values = get_post_values(pk, _get_api_fields(request, POST_DETAIL_VALUES_DEFAULT_FIELDS))
+    except InvalidPostFieldsException as exception:
+        return JsonResponse({'error': str(exception)}, status=400)
+    if post_values is None:
+        return JsonResponse({'error': _('Post not found')}, status=404)
+    return JsonResponse(post_values)
@@ -5,3 +5,6 @@ from django.utils.translation import gettext_lazy as _
 class AppMediaConfig(AppConfig):
     name = 'app_media'
     verbose_name = _('media')
+
+    def ready(self):
+        from . import signals  # noqa: F401
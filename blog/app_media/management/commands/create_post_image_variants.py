@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from app_media.models import PostImage
+
+
+class Command(BaseCommand):
+    """Команда создания уменьшенных копий для картинок постов, загруженных до появления уменьшенных копий"""
+    help = 'Создаёт уменьшенные копии картинок постов, у которых их нет'
+
+    def handle(self, *args, **options):
+        post_images = PostImage.objects.filter(post_image_file_small='')
+        processed_images_count = 0
+        for post_image in post_images.iterator():
+            post_image.save()
+            processed_images_count += 1
+        self.stdout.write(f'Processed post images: {processed_images_count}')
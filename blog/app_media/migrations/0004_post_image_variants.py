@@ -0,0 +1,23 @@
+# Generated by Django 3.1.14 on 2026-10-18 15:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_media', '0003_auto_20210311_1940'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='postimage',
+            name='post_image_file_medium',
+            field=models.ImageField(blank=True, upload_to='post_images/', verbose_name='Medium image for post'),
+        ),
+        migrations.AddField(
+            model_name='postimage',
+            name='post_image_file_small',
+            field=models.ImageField(blank=True, upload_to='post_images/', verbose_name='Small image for post'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 3.1.14 on 2026-10-18 15:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_media', '0004_post_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profileavatarimage',
+            name='avatar_image_file_small',
+            field=models.ImageField(blank=True, upload_to='avatar_images/', verbose_name='small picture, user profile avatar'),
+        ),
+        migrations.AddField(
+            model_name='profileavatarimage',
+            name='content_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True, unique=True, verbose_name='avatar file content hash'),
+        ),
+    ]
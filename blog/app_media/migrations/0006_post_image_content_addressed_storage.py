@@ -0,0 +1,29 @@
+# Generated by Django 3.1.14 on 2026-10-18 15:42
+
+import app_media.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_media', '0005_avatar_variants_and_content_hash'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='postimage',
+            name='post_image_file',
+            field=models.ImageField(db_index=True, storage=app_media.storage.ContentAddressedStorage(), upload_to='post_images/', verbose_name='Image for post'),
+        ),
+        migrations.AlterField(
+            model_name='postimage',
+            name='post_image_file_medium',
+            field=models.ImageField(blank=True, db_index=True, storage=app_media.storage.ContentAddressedStorage(), upload_to='post_images/', verbose_name='Medium image for post'),
+        ),
+        migrations.AlterField(
+            model_name='postimage',
+            name='post_image_file_small',
+            field=models.ImageField(blank=True, db_index=True, storage=app_media.storage.ContentAddressedStorage(), upload_to='post_images/', verbose_name='Small image for post'),
+        ),
+    ]
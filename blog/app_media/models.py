@@ -3,10 +3,22 @@ from django.db import models
 from app_blog.models import Post
 from django.utils.translation import gettext_lazy as _
 
+from blog.settings import POST_IMAGE_VARIANT_SIZES
+from .services.image_services import create_image_variants
+from .storage import ContentAddressedStorage
+
+# Хранилище картинок постов. Одинаковые картинки хранятся одним файлом, который удаляется,
+# когда на него не остаётся ссылок (см. signals.py)
+post_image_storage = ContentAddressedStorage()
+
 
 class ProfileAvatarImage(models.Model):
     """Модель для хранения аватаров профиля пользователя"""
     avatar_image_file = models.ImageField(upload_to='avatar_images/', verbose_name=_('picture, user profile avatar'))
+    avatar_image_file_small = models.ImageField(upload_to='avatar_images/', blank=True,
+                                                verbose_name=_('small picture, user profile avatar'))
+    content_hash = models.CharField(max_length=64, unique=True, null=True, blank=True, editable=False,
+                                    verbose_name=_('avatar file content hash'))
 
     def __str__(self):
         return str(self.avatar_image_file)
@@ -18,9 +30,20 @@ class ProfileAvatarImage(models.Model):
 
 class PostImage(models.Model):
     """Модель для хранения картинок постов"""
-    post_image_file = models.ImageField(upload_to='post_images/', verbose_name=_('Image for post'))
+    post_image_file = models.ImageField(upload_to='post_images/', storage=post_image_storage, db_index=True,
+                                        verbose_name=_('Image for post'))
+    post_image_file_small = models.ImageField(upload_to='post_images/', storage=post_image_storage, blank=True,
+                                              db_index=True, verbose_name=_('Small image for post'))
+    post_image_file_medium = models.ImageField(upload_to='post_images/', storage=post_image_storage, blank=True,
+                                               db_index=True, verbose_name=_('Medium image for post'))
     post = models.ForeignKey(Post, verbose_name=_('Post'), on_delete=models.CASCADE)
 
+    def save(self, *args, **kwargs):
+        # Уменьшенные копии создаются один раз, при первом сохранении картинки
+        if self.post_image_file and not self.post_image_file_small:
+            create_image_variants(self, 'post_image_file', POST_IMAGE_VARIANT_SIZES)
+        super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = _('post image')
         verbose_name_plural = _('post images')
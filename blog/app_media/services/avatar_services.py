@@ -0,0 +1,37 @@
+from django.db import transaction, IntegrityError
+from PIL import Image
+
+from app_media.models import ProfileAvatarImage
+from blog.settings import AVATAR_IMAGE_SIZE, AVATAR_IMAGE_VARIANT_SIZES
+from .image_services import get_file_content_hash, make_image_thumbnail, create_image_variants
+
+
+def save_avatar_image(avatar_file) -> ProfileAvatarImage:
+    """Метод сохранения загруженной аватарки.
+     Аватарка обрезается до размера AVATAR_IMAGE_SIZE, рядом сохраняются копии размеров AVATAR_IMAGE_VARIANT_SIZES.
+     Если такой же файл уже загружался, возвращается уже сохранённая аватарка, новые файлы не создаются
+
+    :param avatar_file: Загруженный файл картинки
+    :return: Аватарка ProfileAvatarImage
+    """
+    content_hash = get_file_content_hash(avatar_file)
+    avatar_image = ProfileAvatarImage.objects.filter(content_hash=content_hash).first()
+    if avatar_image:
+        return avatar_image
+
+    avatar_image = ProfileAvatarImage(content_hash=content_hash)
+    with Image.open(avatar_file) as image:
+        extension = f'.{(image.format or "JPEG").lower()}'
+    avatar_image.avatar_image_file.save(f'{content_hash}{extension}',
+                                        make_image_thumbnail(avatar_file, AVATAR_IMAGE_SIZE, crop=True), save=False)
+    create_image_variants(avatar_image, 'avatar_image_file', AVATAR_IMAGE_VARIANT_SIZES, crop=True)
+    try:
+        with transaction.atomic():
+            avatar_image.save()
+    except IntegrityError:
+        # Такой же файл параллельно загрузил другой пользователь, используем его аватарку
+        avatar_image.avatar_image_file.delete(save=False)
+        for variant_name in AVATAR_IMAGE_VARIANT_SIZES:
+            getattr(avatar_image, f'avatar_image_file_{variant_name}').delete(save=False)
+        avatar_image = ProfileAvatarImage.objects.get(content_hash=content_hash)
+    return avatar_image
@@ -0,0 +1,60 @@
+import hashlib
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+THUMBNAIL_JPEG_QUALITY = 85  # качество сжатия уменьшенных копий картинок в формате JPEG
+
+
+def get_file_content_hash(file) -> str:
+    """Метод возвращает SHA-256 хэш содержимого файла в виде hex строки. Файл читается кусками"""
+    content_hash = hashlib.sha256()
+    file.seek(0)
+    for chunk in file.chunks():
+        content_hash.update(chunk)
+    file.seek(0)
+    return content_hash.hexdigest()
+
+
+def make_image_thumbnail(image_file, max_size: tuple, crop: bool = False) -> ContentFile:
+    """Метод возвращает копию картинки image_file, уменьшенную с сохранением пропорций до размеров max_size.
+     Если crop=True, картинка обрезается по центру до точного размера max_size.
+     Картинка поворачивается согласно EXIF ориентации, формат картинки сохраняется"""
+    image_file.seek(0)
+    with Image.open(image_file) as image:
+        image_format = image.format or 'JPEG'
+        thumbnail = ImageOps.exif_transpose(image)
+        if crop:
+            thumbnail = ImageOps.fit(thumbnail, max_size)
+        else:
+            thumbnail.thumbnail(max_size)
+        if image_format == 'JPEG' and thumbnail.mode not in ('RGB', 'L'):
+            thumbnail = thumbnail.convert('RGB')
+        thumbnail_buffer = BytesIO()
+        thumbnail.save(thumbnail_buffer, format=image_format, quality=THUMBNAIL_JPEG_QUALITY)
+    image_file.seek(0)
+    return ContentFile(thumbnail_buffer.getvalue())
+
+
+def get_variant_file_name(file_name: str, variant_name: str) -> str:
+    """Метод возвращает имя файла уменьшенной копии картинки: <имя картинки>_<variant_name>.<расширение>"""
+    root, extension = os.path.splitext(os.path.basename(file_name))
+    return f'{root}_{variant_name}{extension}'
+
+
+def create_image_variants(instance, source_field_name: str, variant_sizes: dict, crop: bool = False) -> None:
+    """Метод создаёт уменьшенные копии картинки из поля source_field_name модели instance.
+     Копии сохраняются в хранилище рядом с оригиналом в поля <source_field_name>_<имя копии>
+
+    :param instance: Экземпляр модели с картинкой
+    :param source_field_name: Имя поля с оригиналом картинки
+    :param variant_sizes: Словарь {имя копии: (максимальная ширина, максимальная высота)}
+    :param crop: Обрезать ли копии по центру до точного размера
+    """
+    source_file = getattr(instance, source_field_name)
+    for variant_name, max_size in variant_sizes.items():
+        variant_file = getattr(instance, f'{source_field_name}_{variant_name}')
+        variant_file.save(get_variant_file_name(source_file.name, variant_name),
+                          make_image_thumbnail(source_file, max_size, crop=crop), save=False)
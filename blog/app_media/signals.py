@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import PostImage
+
+POST_IMAGE_FILE_FIELDS = ['post_image_file', 'post_image_file_small', 'post_image_file_medium']
+
+
+def _delete_post_image_file_if_unused(storage, file_name: str) -> None:
+    """Метод удаляет файл картинки из хранилища, если на него больше не ссылается ни одна картинка поста.
+     Имя файла - хэш содержимого, поэтому на один файл могут ссылаться разные поля разных картинок.
+     Файл, записанный или повторно использованный хранилищем меньше POST_IMAGE_FILE_DELETE_GRACE_SECONDS назад,
+     не удаляется: ссылающаяся на него картинка может быть ещё не зафиксирована в базе"""
+    references = Q()
+    for field_name in POST_IMAGE_FILE_FIELDS:
+        references |= Q(**{field_name: file_name})
+    if PostImage.objects.filter(references).exists():
+        return
+    if storage.is_recently_saved(file_name, settings.POST_IMAGE_FILE_DELETE_GRACE_SECONDS):
+        return
+    storage.delete(file_name)
+
+
+@receiver(post_delete, sender=PostImage)
+def delete_unused_post_image_files(instance, **kwargs):
+    """Удаление файлов картинки поста, на которые не осталось ссылок.
+     Файл может быть общим для нескольких картинок, поэтому количество ссылок на него проверяется
+     после фиксации транзакции удаления"""
+    file_names = {getattr(instance, field_name).name for field_name in POST_IMAGE_FILE_FIELDS
+                  if getattr(instance, field_name)}
+    storage = instance.post_image_file.storage
+    for file_name in file_names:
+        transaction.on_commit(lambda file_name=file_name: _delete_post_image_file_if_unused(storage, file_name))
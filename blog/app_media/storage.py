@@ -0,0 +1,41 @@
+import os
+import time
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+from .services.image_services import get_file_content_hash
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """Файловое хранилище, в котором имя файла - SHA-256 хэш его содержимого.
+     Файлы раскладываются по подкаталогам из первых символов хэша: <upload_to>/ab/cd/abcd...<расширение>,
+     поэтому ни один каталог не разрастается. Файл с уже сохранённым содержимым повторно не записывается,
+     а несколько записей в базе ссылаются на один файл. При повторном использовании у файла обновляется время
+     изменения, чтобы его не удалило параллельное удаление последней ссылки на него (см. is_recently_saved)"""
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        content_hash = get_file_content_hash(content)
+        extension = os.path.splitext(name)[1].lower()
+        name = os.path.join(os.path.dirname(name), content_hash[:2], content_hash[2:4], f'{content_hash}{extension}')
+        if self.exists(name):
+            try:
+                os.utime(self.path(name))
+                return name
+            except FileNotFoundError:
+                # Файл удалён после проверки, записывается заново
+                pass
+        return super().save(name, content, max_length=max_length)
+
+    def is_recently_saved(self, name: str, seconds: float) -> bool:
+        """Метод возвращает, был ли файл записан или повторно использован меньше seconds секунд назад"""
+        try:
+            return time.time() - os.path.getmtime(self.path(name)) < seconds
+        except FileNotFoundError:
+            return False
@@ -1,7 +1,15 @@
 from django.apps import AppConfig
+from django.core.checks import register
 from django.utils.translation import gettext_lazy as _
 
+from core.checks import check_shared_cache
+
 
 class AppUsersConfig(AppConfig):
     name = 'app_users'
     verbose_name = _('users')
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        # Пользователь сессии и сессии cached_db хранятся в общем кэше
+        register(check_shared_cache)
@@ -0,0 +1,11 @@
+from django.contrib.auth.backends import ModelBackend
+
+from .services.user_cache_services import get_cached_user
+
+
+class CachedModelBackend(ModelBackend):
+    """Бэкенд авторизации, загружающий пользователя сессии из кэша (см. services/user_cache_services.py)"""
+
+    def get_user(self, user_id):
+        user = get_cached_user(user_id)
+        return user if user is not None and self.user_can_authenticate(user) else None
@@ -0,0 +1,18 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from core.profiling import get_profiling_token
+
+
+class Command(BaseCommand):
+    """Команда создания токена профилирования запросов для сотрудника"""
+    help = 'Создаёт подписанный токен профилирования запросов для сотрудника (заголовок X-Profile или параметр _profile)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('username', help='Имя пользователя сотрудника')
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(username=options['username'], is_staff=True).first()
+        if user is None:
+            raise CommandError(f'Staff user {options["username"]} does not exist')
+        self.stdout.write(get_profiling_token(user))
@@ -0,0 +1,59 @@
+"""Модуль сводки профиля пользователя для страниц с информацией об авторе.
+
+Сводка (имя пользователя, отображаемое имя и путь до аватарки) кэшируется по id пользователя,
+поэтому страницы не обходят связи пользователь - профиль - аватарка отдельными запросами.
+Сводка сбрасывается при изменении пользователя, в том числе на странице редактирования данных,
+и при изменении профиля, в том числе при загрузке аватарки (см. signals.py).
+Сводка хранится в кэше SHARED_CACHE_ALIAS, общем для всех процессов сервера, чтобы после загрузки аватарки
+или изменения имени все процессы показывали новые данные.
+Если пользователь уже загружен вместе с профилем и аватаркой (например, автор поста на детальной странице),
+сводка строится из него методом get_user_profile_summary без обращения к кэшу и базе.
+"""
+from django.contrib.auth.models import User
+from django.core.cache import caches
+
+from blog.settings import PROFILE_SUMMARY_CACHE_TIMEOUT, SHARED_CACHE_ALIAS
+from core.handlers import get_correct_file_path_to_img_tag
+
+PROFILE_SUMMARY_CACHE_KEY = 'profile_summary:{user_id}'
+
+
+def get_profile_summary(user_id: int) -> dict:
+    """Метод возвращает сводку профиля пользователя: id, имя пользователя username, отображаемое имя
+     display_name (полное имя или имя пользователя, если полное не указано) и путь до аватарки
+     avatar_path (None, если аватарки нет). Если пользователя нет, возвращается None"""
+    cache = caches[SHARED_CACHE_ALIAS]
+    cache_key = PROFILE_SUMMARY_CACHE_KEY.format(user_id=user_id)
+    profile_summary = cache.get(cache_key)
+    if profile_summary is None:
+        user = User.objects.select_related('profile__avatar_image_file').filter(id=user_id).first()
+        if user is None:
+            return None
+        profile_summary = get_user_profile_summary(user)
+        cache.set(cache_key, profile_summary, timeout=PROFILE_SUMMARY_CACHE_TIMEOUT)
+    return profile_summary
+
+
+def get_user_profile_summary(user: User) -> dict:
+    """Метод возвращает сводку профиля загруженного пользователя user в том же виде, что и get_profile_summary.
+     Профиль и аватарка должны быть загружены вместе с пользователем (select_related), иначе они получаются
+     отдельными запросами"""
+    return {'id': user.id,
+            'username': user.username,
+            'display_name': user.get_full_name() or user.username,
+            'avatar_path': _get_avatar_path(user)}
+
+
+def _get_avatar_path(user: User) -> str:
+    """Метод возвращает путь до уменьшенной копии аватарки пользователя, до оригинала, если копии нет,
+     или None, если у пользователя нет аватарки"""
+    profile = getattr(user, 'profile', None)
+    avatar_image = profile.avatar_image_file if profile else None
+    if not avatar_image:
+        return None
+    return get_correct_file_path_to_img_tag(avatar_image.avatar_image_file_small or avatar_image.avatar_image_file)
+
+
+def invalidate_profile_summary(user_id: int) -> None:
+    """Метод инвалидации закэшированной сводки профиля пользователя"""
+    caches[SHARED_CACHE_ALIAS].delete(PROFILE_SUMMARY_CACHE_KEY.format(user_id=user_id))
@@ -0,0 +1,36 @@
+"""Модуль кэширования пользователя сессии.
+
+Пользователь загружается из кэша по id, поэтому при сессиях в кэше (cached_db) или в подписанных cookie
+(signed_cookies) авторизованный запрос не выполняет запросов к базе ни для сессии, ни для пользователя.
+Закэшированный пользователь сбрасывается при любом сохранении или удалении пользователя, в том числе
+при редактировании данных на странице редактирования и при обновлении даты последнего входа, и при выходе
+пользователя (см. signals.py).
+Пользователь хранится в кэше SHARED_CACHE_ALIAS, общем для всех процессов сервера: иначе после смены пароля
+или выхода другие процессы продолжали бы авторизовывать запросы по устаревшему пользователю из своей памяти.
+Время жизни AUTH_USER_CACHE_TIMEOUT небольшое, оно ограничивает устаревание, если инвалидация не дошла до кэша
+(например, при изменении пользователя через QuerySet.update без сигналов).
+"""
+from django.contrib.auth.models import User
+from django.core.cache import caches
+
+from blog.settings import AUTH_USER_CACHE_TIMEOUT, SHARED_CACHE_ALIAS
+
+AUTH_USER_CACHE_KEY = 'auth_user:{user_id}'
+
+
+def get_cached_user(user_id) -> User:
+    """Метод возвращает пользователя по id из кэша или из базы, если его нет в кэше.
+     Если пользователя нет, возвращается None"""
+    cache = caches[SHARED_CACHE_ALIAS]
+    cache_key = AUTH_USER_CACHE_KEY.format(user_id=user_id)
+    user = cache.get(cache_key)
+    if user is None:
+        user = User.objects.filter(pk=user_id).first()
+        if user is not None:
+            cache.set(cache_key, user, timeout=AUTH_USER_CACHE_TIMEOUT)
+    return user
+
+
+def invalidate_cached_user(user_id) -> None:
+    """Метод инвалидации закэшированного пользователя"""
+    caches[SHARED_CACHE_ALIAS].delete(AUTH_USER_CACHE_KEY.format(user_id=user_id))
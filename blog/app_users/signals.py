@@ -0,0 +1,37 @@
+from django.contrib.auth.models import User
+from django.contrib.auth.signals import user_logged_out
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from core.handlers import call_now_and_on_commit
+from .models import Profile
+from .services.profile_services import invalidate_profile_summary
+from .services.user_cache_services import invalidate_cached_user
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_cached_user_on_user_change(instance, **kwargs):
+    """Инвалидация закэшированного пользователя при изменении, в том числе на странице редактирования
+     данных пользователя и через админку, и при удалении пользователя"""
+    call_now_and_on_commit(invalidate_cached_user, instance.id)
+
+
+@receiver(user_logged_out)
+def invalidate_cached_user_on_logout(user, **kwargs):
+    """Инвалидация закэшированного пользователя при выходе"""
+    if user is not None:
+        invalidate_cached_user(user.id)
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_profile_summary_on_user_change(instance, update_fields=None, **kwargs):
+    """Инвалидация сводки профиля при изменении имени пользователя, в том числе на странице редактирования
+     данных пользователя. Обновление даты последнего входа при авторизации сводку не меняет"""
+    if update_fields is None or {'username', 'first_name', 'last_name'} & set(update_fields):
+        call_now_and_on_commit(invalidate_profile_summary, instance.id)
+
+
+@receiver(post_save, sender=Profile)
+def invalidate_profile_summary_on_profile_change(instance, **kwargs):
+    """Инвалидация сводки профиля при изменении профиля, в том числе при загрузке аватарки"""
+    call_now_and_on_commit(invalidate_profile_summary, instance.user_id)
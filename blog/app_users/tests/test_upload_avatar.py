@@ -1,11 +1,14 @@
 import os
 import tempfile
 
+from django.contrib.auth.models import User
 from django.test import TestCase, override_settings
 from django.urls import reverse
 from django.utils.translation import gettext as _
 
+from app_media.models import ProfileAvatarImage
 from app_users.models import Profile
+from blog.settings import AVATAR_IMAGE_SIZE, AVATAR_IMAGE_VARIANT_SIZES
 from core.test_handlers import create_test_user, TEST_USERNAME, TEST_USER_PASSWORD
 
 
@@ -76,3 +79,33 @@ class UploadAvatarTest(TestCase):
         updated_user_profile = Profile.objects.filter(user__username=TEST_USERNAME).first()
         # Проверка, что у пользователя не появилось аватарки
         self.assertIsNone(updated_user_profile.avatar_image_file)
+
+    def _upload_test_avatar(self, username: str) -> Profile:
+        """Метод загружает тестовую аватарку под пользователем username и возвращает его профиль"""
+        img_path = os.path.normpath(os.path.join(os.getcwd(), 'app_users/tests/test_files/test_image_1.jpg'))
+        self.client.login(username=username, password=TEST_USER_PASSWORD)
+        with open(img_path, 'rb') as img_1:
+            self.client.post(reverse(self.url_name), {'avatar_image_file': img_1})
+        return Profile.objects.get(user__username=username)
+
+    def test_upload_avatar_normalized_sizes(self):
+        """Тест проверяющий, что загруженная аватарка и её уменьшенные копии обрезаются до фиксированных размеров"""
+        avatar_image = self._upload_test_avatar(TEST_USERNAME).avatar_image_file
+        self.assertEqual((avatar_image.avatar_image_file.width, avatar_image.avatar_image_file.height),
+                         AVATAR_IMAGE_SIZE)
+        for variant_name, size in AVATAR_IMAGE_VARIANT_SIZES.items():
+            variant_file = getattr(avatar_image, f'avatar_image_file_{variant_name}')
+            self.assertEqual((variant_file.width, variant_file.height), size)
+
+    def test_upload_same_avatar_deduplicated(self):
+        """Тест проверяющий, что одинаковые загруженные аватарки хранятся одним файлом и одной записью"""
+        second_user = User.objects.create_user(username='second_user', password=TEST_USER_PASSWORD)
+        Profile.objects.create(user=second_user)
+
+        first_profile = self._upload_test_avatar(TEST_USERNAME)
+        second_profile = self._upload_test_avatar(second_user.username)
+        repeated_upload_profile = self._upload_test_avatar(TEST_USERNAME)
+
+        self.assertEqual(ProfileAvatarImage.objects.count(), 1)
+        self.assertEqual(first_profile.avatar_image_file, second_profile.avatar_image_file)
+        self.assertEqual(first_profile.avatar_image_file, repeated_upload_profile.avatar_image_file)
@@ -0,0 +1,106 @@
+import os
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.cache.backends.filebased import FileBasedCache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from app_media.models import ProfileAvatarImage
+from app_users.models import Profile
+from app_users.services.profile_services import get_profile_summary, get_user_profile_summary, \
+    PROFILE_SUMMARY_CACHE_KEY
+from core.test_handlers import create_test_user, create_many_test_posts, TEST_USERNAME, TEST_USER_PASSWORD, \
+    TEST_USER_FIRST_NAME, TEST_USER_LAST_NAME, clear_caches
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class ProfileSummaryTest(TestCase):
+
+    def setUp(self):
+        """Метод предварительных действий. Перед каждым тестом очищаем кэш и создаём пользователя с постом"""
+        clear_caches()
+        self.user = create_test_user()
+        create_many_test_posts(self.user, 1)
+        self.post = self.user.post_set.first()
+        self.cache_key = PROFILE_SUMMARY_CACHE_KEY.format(user_id=self.user.id)
+
+    def test_profile_summary(self):
+        """Тест проверяющий содержимое сводки профиля, то, что повторно она берётся из кэша без запросов к базе,
+         и что сводка загруженного пользователя строится без запросов"""
+        profile = self.user.profile
+        profile.avatar_image_file = ProfileAvatarImage.objects.create(
+            avatar_image_file='avatar_images/avatar.jpg', avatar_image_file_small='avatar_images/avatar_small.jpg')
+        profile.save()
+
+        with self.assertNumQueries(1):
+            profile_summary = get_profile_summary(self.user.id)
+        self.assertEqual(profile_summary, {'id': self.user.id,
+                                           'username': TEST_USERNAME,
+                                           'display_name': f'{TEST_USER_FIRST_NAME} {TEST_USER_LAST_NAME}',
+                                           'avatar_path': '/media/avatar_images/avatar_small.jpg'})
+        with self.assertNumQueries(0):
+            self.assertEqual(get_profile_summary(self.user.id), profile_summary)
+        self.assertIsNone(get_profile_summary(1000))
+        user = User.objects.select_related('profile__avatar_image_file').get(id=self.user.id)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_user_profile_summary(user), profile_summary)
+
+    def test_display_name_without_full_name(self):
+        """Тест проверяющий, что отображаемое имя пользователя без полного имени - имя пользователя"""
+        self.user.first_name = self.user.last_name = ''
+        self.user.save()
+        profile_summary = get_profile_summary(self.user.id)
+        self.assertEqual(profile_summary['display_name'], TEST_USERNAME)
+        self.assertIsNone(profile_summary['avatar_path'])
+
+    def test_profile_summary_invalidated_on_avatar_upload(self):
+        """Тест проверяющий, что после загрузки аватарки страницы показывают новую аватарку"""
+        self.client.login(username=TEST_USERNAME, password=TEST_USER_PASSWORD)
+        self.client.get(reverse('account'))
+        self.assertIsNone(caches[settings.SHARED_CACHE_ALIAS].get(self.cache_key)['avatar_path'])
+
+        img_path = os.path.normpath(os.path.join(os.getcwd(), 'app_users/tests/test_files/test_image_1.jpg'))
+        with open(img_path, 'rb') as img_1:
+            self.client.post(reverse('upload_avatar'), {'avatar_image_file': img_1})
+        avatar_path = get_profile_summary(self.user.id)['avatar_path']
+        self.assertIsNotNone(avatar_path)
+        self.assertContains(self.client.get(reverse('account')), avatar_path)
+        self.assertContains(self.client.get(reverse('post_detail', kwargs={'pk': self.post.id})), avatar_path)
+
+    def test_profile_summary_invalidated_on_account_edit(self):
+        """Тест проверяющий, что после изменения имени на странице редактирования данных пользователя
+         страницы с информацией об авторе показывают новое имя"""
+        self.client.login(username=TEST_USERNAME, password=TEST_USER_PASSWORD)
+        self.client.get(reverse('post_detail', kwargs={'pk': self.post.id}))
+        self.client.get(reverse('author_post_list', kwargs={'author_id': self.user.id}))
+
+        self.client.post(reverse('edit_account'), {'email': 'new_email@test.com', 'first_name': 'New',
+                                                   'last_name': 'Name'})
+        self.assertContains(self.client.get(reverse('post_detail', kwargs={'pk': self.post.id})), 'New Name')
+        self.assertContains(self.client.get(reverse('author_post_list', kwargs={'author_id': self.user.id})),
+                            'New Name')
+
+    def test_profile_summary_not_invalidated_on_login(self):
+        """Тест проверяющий, что обновление даты последнего входа при авторизации не сбрасывает сводку профиля"""
+        get_profile_summary(self.user.id)
+        self.client.login(username=TEST_USERNAME, password=TEST_USER_PASSWORD)
+        self.assertIsNotNone(caches[settings.SHARED_CACHE_ALIAS].get(self.cache_key))
+
+    def test_profile_summary_invalidated_from_other_process(self):
+        """Тест проверяющий, что сводка профиля, сброшенная другим процессом сервера после загрузки аватарки,
+         не показывается этим процессом"""
+        self.client.login(username=TEST_USERNAME, password=TEST_USER_PASSWORD)
+        self.client.get(reverse('account'))
+
+        # Аватарка загружена в другом процессе, который сбрасывает сводку через свой экземпляр кэша
+        profile = self.user.profile
+        profile.avatar_image_file = ProfileAvatarImage.objects.create(
+            avatar_image_file='avatar_images/avatar.jpg', avatar_image_file_small='avatar_images/avatar_small.jpg')
+        Profile.objects.filter(id=profile.id).update(avatar_image_file=profile.avatar_image_file)
+        other_process_cache = FileBasedCache(settings.CACHES[settings.SHARED_CACHE_ALIAS]['LOCATION'], {})
+        other_process_cache.delete(self.cache_key)
+
+        self.assertContains(self.client.get(reverse('account')), 'avatar_images/avatar_small.jpg')
@@ -0,0 +1,91 @@
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.cache.backends.filebased import FileBasedCache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from app_users.services.user_cache_services import AUTH_USER_CACHE_KEY
+from core.test_handlers import create_many_test_posts, create_test_user, TEST_USERNAME, TEST_USER_PASSWORD
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class SessionCacheTest(TestCase):
+
+    def setUp(self):
+        """Метод предварительных действий. Перед каждым тестом очищаем кэши"""
+        caches['default'].clear()
+        caches[settings.SHARED_CACHE_ALIAS].clear()
+        self.user = create_test_user()
+        self.user_cache_key = AUTH_USER_CACHE_KEY.format(user_id=self.user.id)
+
+    def _assert_post_list_without_queries(self):
+        create_many_test_posts(self.user, 3)
+        self.client.login(username=TEST_USERNAME, password=TEST_USER_PASSWORD)
+        self.client.get(reverse('post_list'))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('post_list'))
+        self.assertEqual(response.context['user'].id, self.user.id)
+
+    def test_authenticated_post_list_without_queries(self):
+        """Тест проверяющий, что при сессиях в кэше повторный запрос списка постов авторизованным пользователем
+         не выполняет запросов к базе ни для сессии, ни для пользователя"""
+        self._assert_post_list_without_queries()
+
+    @override_settings(SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies')
+    def test_authenticated_post_list_without_queries_with_signed_cookies(self):
+        """Тест проверяющий, что при сессиях в подписанных cookie повторный запрос списка постов авторизованным
+         пользователем не выполняет запросов к базе"""
+        self._assert_post_list_without_queries()
+
+    def test_cached_user_invalidated_on_account_edit(self):
+        """Тест проверяющий, что после изменения данных на странице редактирования данных пользователя
+         страницы показывают новые данные, а не закэшированного пользователя"""
+        self.client.login(username=TEST_USERNAME, password=TEST_USER_PASSWORD)
+        self.client.get(reverse('account'))
+        self.assertIsNotNone(caches[settings.SHARED_CACHE_ALIAS].get(self.user_cache_key))
+
+        self.client.post(reverse('edit_account'), {'email': 'new_email@test.com', 'first_name': 'New first name',
+                                                   'last_name': 'New last name'})
+        response = self.client.get(reverse('account'))
+        self.assertContains(response, 'New first name')
+        self.assertEqual(caches[settings.SHARED_CACHE_ALIAS].get(self.user_cache_key).first_name, 'New first name')
+
+    def test_cached_user_invalidated_on_logout(self):
+        """Тест проверяющий, что при выходе закэшированный пользователь удаляется из кэша"""
+        self.client.login(username=TEST_USERNAME, password=TEST_USER_PASSWORD)
+        self.client.get(reverse('account'))
+        self.assertIsNotNone(caches[settings.SHARED_CACHE_ALIAS].get(self.user_cache_key))
+
+        self.client.get(reverse('logout'))
+        self.assertIsNone(caches[settings.SHARED_CACHE_ALIAS].get(self.user_cache_key))
+        response = self.client.get(reverse('account'))
+        self.assertEqual(response.status_code, 403)
+
+    def test_password_change_logs_out_other_sessions(self):
+        """Тест проверяющий, что после смены пароля сессия с закэшированным пользователем становится недействительной"""
+        self.client.login(username=TEST_USERNAME, password=TEST_USER_PASSWORD)
+        self.client.get(reverse('account'))
+
+        self.user.set_password('new p@ssw0rd')
+        self.user.save()
+        response = self.client.get(reverse('account'))
+        self.assertEqual(response.status_code, 403)
+
+    def test_cached_user_invalidated_from_other_process(self):
+        """Тест проверяющий, что пользователь, сброшенный из кэша другим процессом сервера,
+         не используется для авторизации в этом процессе"""
+        self.client.login(username=TEST_USERNAME, password=TEST_USER_PASSWORD)
+        self.client.get(reverse('account'))
+        self.assertIsNotNone(caches[settings.SHARED_CACHE_ALIAS].get(self.user_cache_key))
+
+        # Пароль изменён в другом процессе, который сбрасывает пользователя через свой экземпляр кэша
+        User.objects.filter(id=self.user.id).update(password=make_password('new p@ssw0rd'))
+        other_process_cache = FileBasedCache(settings.CACHES[settings.SHARED_CACHE_ALIAS]['LOCATION'], {})
+        other_process_cache.delete(self.user_cache_key)
+
+        response = self.client.get(reverse('account'))
+        self.assertEqual(response.status_code, 403)
@@ -5,9 +5,10 @@ from django.contrib.auth.views import LoginView, LogoutView
 from django.views import generic
 from django.utils.translation import gettext as _
 
-from core.handlers import get_correct_file_path_to_img_tag
+from app_media.services.avatar_services import save_avatar_image
 from .forms import RegisterForm, UserAccountEditForm, UploadProfileAvatarImageForm
 from .models import Profile
+from .services.profile_services import get_profile_summary
 
 
 class LoginView(LoginView):
@@ -41,11 +42,7 @@ def user_account_view(request):
     """Вью для страницы информации о пользователе"""
     if not request.user.is_authenticated:
         raise PermissionDenied()
-    context = {}
-    if request.user.profile.avatar_image_file:
-        avatar_path = get_correct_file_path_to_img_tag(request.user.profile.avatar_image_file)
-        context['avatar_path'] = avatar_path
-
+    context = {'profile': get_profile_summary(request.user.id)}
     return render(request, 'account.html', context)
 
 
@@ -85,9 +82,8 @@ def upload_avatar_image_view(request):
     if request.method == 'POST':
         avatar_upload_form = UploadProfileAvatarImageForm(request.POST, request.FILES)
         if avatar_upload_form.is_valid():
-            avatar_upload_form.save()
             profile = request.user.profile
-            profile.avatar_image_file = avatar_upload_form.instance
+            profile.avatar_image_file = save_avatar_image(avatar_upload_form.cleaned_data['avatar_image_file'])
             profile.save()
             return redirect('account')
         else:
@@ -0,0 +1 @@
+"""Бенчмарки блога. Запускаются из каталога проекта: python -m benchmarks.<имя модуля>"""
@@ -0,0 +1,114 @@
+"""Бенчмарк индексов списка постов.
+
+Заполняет отдельную базу постами и для запросов страницы списка постов и страницы постов автора выводит
+план запроса и время выполнения без индексов Post.Meta.indexes и с ними.
+Без индекса SQLite сортирует всю таблицу (USE TEMP B-TREE FOR ORDER BY), с индексом читает только
+page_size строк индекса начиная с нужной позиции (SCAN/SEARCH ... USING INDEX), поэтому время не зависит
+ни от количества постов, ни от номера страницы.
+
+Запуск из каталога проекта:
+    python -m benchmarks.bench_post_list_index --posts 1000000
+"""
+import argparse
+import datetime
+import random
+import statistics
+import time
+
+from benchmarks.utils import setup_django, benchmark_database
+
+RUNS_COUNT = 5
+
+
+def create_posts(posts_count: int, authors_count: int) -> list:
+    """Метод создаёт authors_count пользователей и posts_count постов со случайными датами публикации.
+     Возвращает список созданных пользователей"""
+    from django.contrib.auth.models import User
+    from django.db import transaction
+
+    from app_blog.models import Post
+
+    User.objects.bulk_create([User(username=f'author_{number}') for number in range(authors_count)])
+    authors = list(User.objects.order_by('id'))
+    start_date = datetime.datetime(2010, 1, 1, tzinfo=datetime.timezone.utc)
+    batch_size = 10000
+    with transaction.atomic():
+        for batch_start in range(0, posts_count, batch_size):
+            Post.objects.bulk_create([
+                Post(post_author=random.choice(authors),
+                     post_title=f'Пост {number}',
+                     post_content=f'Содержание поста {number}',
+                     publication_date=start_date + datetime.timedelta(seconds=random.randrange(10 ** 9)))
+                for number in range(batch_start, min(batch_start + batch_size, posts_count))
+            ])
+    return authors
+
+
+def get_benchmark_querysets(author) -> dict:
+    """Метод возвращает проверяемые запросы: первая страница списка постов, страница из середины списка
+     по курсору и первая страница постов автора"""
+    from app_blog.models import Post
+    from app_blog.services.cursor_pagination import get_cursor_filter
+    from blog.settings import POST_LIST_PAGE_SIZE
+
+    page_size = POST_LIST_PAGE_SIZE + 1
+    middle_post = Post.objects.order_by('-publication_date', '-id')[Post.objects.count() // 2]
+    cursor_filter = get_cursor_filter(middle_post.publication_date, middle_post.id, 'lt')
+    return {
+        'post_list_first_page': Post.objects.order_by('-publication_date', '-id')[:page_size],
+        'post_list_middle_page': Post.objects.filter(cursor_filter).order_by('-publication_date', '-id')[:page_size],
+        'author_first_page': Post.objects.filter(post_author=author).order_by('-publication_date')[:page_size],
+    }
+
+
+def measure_querysets(querysets: dict) -> dict:
+    """Метод возвращает план и медиану времени выполнения в миллисекундах для каждого запроса"""
+    results = {}
+    for name, queryset in querysets.items():
+        durations = []
+        for _ in range(RUNS_COUNT):
+            start = time.perf_counter()
+            list(queryset.all())
+            durations.append((time.perf_counter() - start) * 1000)
+        results[name] = {'plan': queryset.explain(), 'median_ms': round(statistics.median(durations), 3)}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Бенчмарк индексов списка постов')
+    parser.add_argument('--posts', type=int, default=1000000, help='Количество постов')
+    parser.add_argument('--authors', type=int, default=1000, help='Количество авторов')
+    arguments = parser.parse_args()
+
+    setup_django()
+    from django.db import connection
+
+    from app_blog.models import Post
+
+    with benchmark_database():
+        print(f'Creating {arguments.posts} posts by {arguments.authors} authors...')
+        authors = create_posts(arguments.posts, arguments.authors)
+        querysets = get_benchmark_querysets(authors[0])
+
+        with connection.schema_editor() as schema_editor:
+            for index in Post._meta.indexes:
+                schema_editor.remove_index(Post, index)
+        connection.cursor().execute('ANALYZE')
+        without_indexes = measure_querysets(querysets)
+
+        with connection.schema_editor() as schema_editor:
+            for index in Post._meta.indexes:
+                schema_editor.add_index(Post, index)
+        connection.cursor().execute('ANALYZE')
+        with_indexes = measure_querysets(querysets)
+
+    for name in querysets:
+        print(f'\n{name}')
+        print(f'  without indexes: {without_indexes[name]["median_ms"]} ms')
+        print(f'    {without_indexes[name]["plan"]}'.replace('\n', '\n    '))
+        print(f'  with indexes: {with_indexes[name]["median_ms"]} ms')
+        print(f'    {with_indexes[name]["plan"]}'.replace('\n', '\n    '))
+
+
+if __name__ == '__main__':
+    main()
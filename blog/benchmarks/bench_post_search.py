@@ -0,0 +1,107 @@
+"""Бенчмарк полнотекстового поиска постов.
+
+Заполняет отдельную базу постами из случайных слов и сравнивает время поиска по индексу FTS5
+(app_blog.services.post_search_services.search_posts) с поиском через icontains, который просматривает
+всю таблицу постов. Поиск выполняется по редкому и по частому слову, для частого слова также
+измеряется переход на следующую страницу результатов по курсору.
+Время поиска по индексу растёт с количеством найденных постов, а не с размером таблицы: для упорядочивания
+по релевантности bm25 вычисляется для каждого найденного поста. Поиск через icontains по частому слову
+быстрый только потому, что первые 20 совпадений находятся в начале таблицы, по редкому слову он
+просматривает всю таблицу.
+
+Запуск из каталога проекта:
+    python -m benchmarks.bench_post_search --posts 1000000
+"""
+import argparse
+import datetime
+import itertools
+import random
+import statistics
+import time
+
+from benchmarks.utils import setup_django, benchmark_database, timer
+
+RUNS_COUNT = 5
+VOCABULARY_SIZE = 20000
+WORDS_IN_POST = 30
+
+
+def get_vocabulary() -> list:
+    """Метод возвращает словарь из VOCABULARY_SIZE случайных слов"""
+    letters = 'абвгдежзиклмнопрстуфхцчшэюя'
+    return [''.join(random.choices(letters, k=random.randint(4, 10))) for _ in range(VOCABULARY_SIZE)]
+
+
+def create_posts(posts_count: int, vocabulary: list) -> None:
+    """Метод создаёт posts_count постов из случайных слов словаря. Частота слов убывает по закону Ципфа,
+     поэтому первые слова словаря встречаются почти в каждом посте, а последние - в единицах постов"""
+    from django.contrib.auth.models import User
+    from django.db import transaction
+
+    from app_blog.models import Post
+
+    author = User.objects.create(username='author')
+    cum_weights = list(itertools.accumulate(1 / rank for rank in range(1, len(vocabulary) + 1)))
+    start_date = datetime.datetime(2010, 1, 1, tzinfo=datetime.timezone.utc)
+    batch_size = 10000
+    with transaction.atomic():
+        for batch_start in range(0, posts_count, batch_size):
+            Post.objects.bulk_create([
+                Post(post_author=author,
+                     post_title=' '.join(random.choices(vocabulary, cum_weights=cum_weights, k=5)),
+                     post_content=' '.join(random.choices(vocabulary, cum_weights=cum_weights, k=WORDS_IN_POST)),
+                     publication_date=start_date + datetime.timedelta(seconds=random.randrange(10 ** 9)))
+                for _ in range(batch_start, min(batch_start + batch_size, posts_count))
+            ])
+
+
+def measure(function) -> float:
+    """Метод возвращает медиану времени выполнения function в миллисекундах"""
+    durations = []
+    for _ in range(RUNS_COUNT):
+        start = time.perf_counter()
+        function()
+        durations.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(durations), 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Бенчмарк полнотекстового поиска постов')
+    parser.add_argument('--posts', type=int, default=1000000, help='Количество постов')
+    arguments = parser.parse_args()
+
+    setup_django()
+    from django.db.models import Q
+
+    from app_blog.models import Post
+    from app_blog.services.post_search_services import search_posts
+    from app_blog.services.post_services import get_post_list_queryset
+
+    vocabulary = get_vocabulary()
+    results = {}
+    with benchmark_database():
+        print(f'Creating {arguments.posts} posts...')
+        with timer(results, 'create_posts_seconds'):
+            create_posts(arguments.posts, vocabulary)
+
+        for word_name, word in (('rare_word', vocabulary[-1]), ('common_word', vocabulary[10])):
+            matches_count = len(search_posts(word, page_size=arguments.posts))
+            print(f'\n{word_name} "{word}": {matches_count} posts')
+            first_page = search_posts(word)
+            results[f'{word_name}_fts_first_page_ms'] = measure(lambda: search_posts(word))
+            if first_page.next_cursor:
+                results[f'{word_name}_fts_next_page_ms'] = measure(
+                    lambda: search_posts(word, after=first_page.next_cursor))
+            icontains_queryset = get_post_list_queryset()\
+                .filter(Q(post_title__icontains=word) | Q(post_content__icontains=word))\
+                .order_by('-publication_date', '-id')[:20]
+            results[f'{word_name}_icontains_first_page_ms'] = measure(lambda: list(icontains_queryset.all()))
+            for name, value in results.items():
+                if name.startswith(word_name):
+                    print(f'  {name}: {value}')
+
+    print(f'\ncreate_posts_seconds: {round(results["create_posts_seconds"], 1)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+"""Бенчмарк чтения во время создания постов из файла для разных настроек соединений SQLite.
+
+Для каждого профиля настроек создаётся отдельная база в файле (режим WAL недоступен базе в памяти),
+после чего потоки-читатели непрерывно запрашивают страницы списка постов, пока в другом потоке
+create_posts_from_file создаёт --file-posts постов в одной транзакции. Выводятся перцентили задержки чтения
+до начала импорта и во время него, количество ошибок "database is locked" и время импорта.
+
+Профили:
+    default - настройки SQLite по умолчанию: журнал отката (DELETE), synchronous=FULL, транзакции DEFERRED.
+     Когда изменения импорта перестают помещаться в кэш страниц, писатель берёт эксклюзивную блокировку
+     файла, и читатели ждут фиксации транзакции или получают ошибку по истечении таймаута
+    tuned - SQLITE_PRAGMAS и SQLITE_TRANSACTION_MODE из настроек проекта (см. core/db_backends/sqlite3/base.py).
+     В режиме WAL читатели видят последнее зафиксированное состояние базы и не ждут писателя
+
+Запуск из каталога проекта:
+    python -m benchmarks.bench_sqlite_concurrency --posts 100000 --file-posts 200000 --readers 4
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+
+from benchmarks.bench_suite import PERCENTILES, get_create_posts_from_file_scenario, get_percentile
+from benchmarks.fixtures import create_fixtures
+from benchmarks.utils import setup_django, benchmark_database
+
+IDLE_READS_COUNT = 200
+
+
+def get_profiles() -> dict:
+    """Метод возвращает настройки соединений SQLite для каждого профиля"""
+    from django.conf import settings
+
+    return {
+        'default': {'SQLITE_PRAGMAS': {'journal_mode': 'DELETE', 'synchronous': 'FULL'},
+                    'SQLITE_TRANSACTION_MODE': 'DEFERRED'},
+        'tuned': {'SQLITE_PRAGMAS': settings.SQLITE_PRAGMAS,
+                  'SQLITE_TRANSACTION_MODE': settings.SQLITE_TRANSACTION_MODE},
+    }
+
+
+def read_post_list_page(cursors: list) -> None:
+    """Метод читает первую страницу списка постов или страницу по случайному курсору из cursors"""
+    from app_blog.services.post_services import get_post_list
+
+    list(get_post_list(after=random.choice(cursors + [None])))
+
+
+def run_reader(cursors: list, stop_event: threading.Event, durations: list, errors: list) -> None:
+    """Метод потока-читателя: читает страницы списка постов, пока не установлен stop_event, и записывает
+     время каждого чтения в миллисекундах в durations, а ошибки базы - в errors"""
+    from django.db import OperationalError, connections
+
+    try:
+        while not stop_event.is_set():
+            start = time.perf_counter()
+            try:
+                read_post_list_page(cursors)
+            except OperationalError as exception:
+                errors.append(str(exception))
+                continue
+            durations.append((time.perf_counter() - start) * 1000)
+    finally:
+        connections.close_all()
+
+
+def run_writer(create_posts, results: dict) -> None:
+    """Метод потока-писателя: создаёт посты из файла и записывает время импорта в секундах в results"""
+    from django.db import connections
+
+    start = time.perf_counter()
+    try:
+        create_posts()
+    finally:
+        results['import_seconds'] = round(time.perf_counter() - start, 2)
+        connections.close_all()
+
+
+def get_latency_stats(durations: list) -> dict:
+    """Метод возвращает количество чтений, перцентили и максимальное время чтения в миллисекундах"""
+    durations = sorted(durations)
+    if not durations:
+        return {'reads': 0}
+    result = {'reads': len(durations)}
+    result.update({f'p{percentile}_ms': round(get_percentile(durations, percentile), 3)
+                   for percentile in PERCENTILES})
+    result['max_ms'] = round(durations[-1], 3)
+    return result
+
+
+def run_profile(arguments) -> dict:
+    """Метод создаёт базу в файле, заполняет её и измеряет задержку чтения без записи и во время импорта"""
+    from django.db import connections
+
+    from app_blog.services.cursor_pagination import encode_cursor
+    from app_blog.models import Post
+
+    database_name = os.path.join(tempfile.mkdtemp(), 'bench_concurrency.sqlite3')
+    with benchmark_database(database_name):
+        create_fixtures(arguments.users, arguments.posts, 0, seed=arguments.seed)
+        cursors = [encode_cursor(publication_date, post_id) for publication_date, post_id in
+                   Post.objects.order_by('?').values_list('publication_date', 'id')[:1000]]
+        create_posts = get_create_posts_from_file_scenario(arguments.file_posts)
+        # Соединение основного потока открыто до импорта и не должно держать блокировок
+        connections.close_all()
+
+        idle_durations = []
+        for _ in range(IDLE_READS_COUNT):
+            start = time.perf_counter()
+            read_post_list_page(cursors)
+            idle_durations.append((time.perf_counter() - start) * 1000)
+
+        stop_event = threading.Event()
+        durations, errors, writer_results = [], [], {}
+        readers = [threading.Thread(target=run_reader, args=(cursors, stop_event, durations, errors))
+                   for _ in range(arguments.readers)]
+        writer = threading.Thread(target=run_writer, args=(create_posts, writer_results))
+        for reader in readers:
+            reader.start()
+        writer.start()
+        writer.join()
+        stop_event.set()
+        for reader in readers:
+            reader.join()
+        connections.close_all()
+
+    return {'idle': get_latency_stats(idle_durations),
+            'during_import': get_latency_stats(durations),
+            'errors': len(errors),
+            'import_seconds': writer_results.get('import_seconds')}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Бенчмарк чтения во время создания постов из файла')
+    parser.add_argument('--users', type=int, default=1000, help='Количество пользователей')
+    parser.add_argument('--posts', type=int, default=100000, help='Количество постов до импорта')
+    parser.add_argument('--file-posts', type=int, default=200000, help='Количество строк в файле с постами')
+    parser.add_argument('--readers', type=int, default=4, help='Количество потоков-читателей')
+    parser.add_argument('--seed', type=int, default=0, help='Начальное значение генератора случайных чисел')
+    arguments = parser.parse_args()
+
+    setup_django()
+    from django.test.utils import override_settings
+
+    for name, profile_settings in get_profiles().items():
+        print(f'Running profile {name}: {profile_settings}')
+        with override_settings(MEDIA_ROOT=tempfile.mkdtemp(), **profile_settings):
+            results = run_profile(arguments)
+        print(f'  import of {arguments.file_posts} posts: {results["import_seconds"]} s, '
+              f'"database is locked" errors: {results["errors"]}')
+        for stage in ('idle', 'during_import'):
+            stats = results[stage]
+            percentiles = ', '.join(f'p{percentile} {stats.get(f"p{percentile}_ms")} ms' for percentile in PERCENTILES)
+            print(f'  {stage}: {stats["reads"]} reads, {percentiles}, max {stats.get("max_ms")} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,204 @@
+"""Набор бенчмарков основных страниц и операций блога на большом наборе данных.
+
+Создаёт в отдельной базе набор данных генератором benchmarks.fixtures и для каждого сценария
+записывает в JSON файл перцентили времени выполнения, количество запросов к базе и пиковое потребление
+памяти. Файлы результатов разных коммитов можно сравнивать между собой.
+Время и память измеряются в разных прогонах, так как tracemalloc замедляет выполнение.
+
+Сценарии:
+    post_list_cold - первая страница списка постов без кэша страницы
+    post_list_warm - первая страница списка постов из кэша
+    post_list_cursor - страница из середины списка постов по курсору, без кэша страницы
+    post_detail - детальная страница случайного поста
+    admin_post_changelist - список постов в админке
+    create_posts_from_file - создание постов из файла (--file-posts строк)
+
+Запуск из каталога проекта:
+    python -m benchmarks.bench_suite --size 100k --output bench_results.json
+    python -m benchmarks.bench_suite --users 10 --posts 500 --images 100 --runs 5
+"""
+import argparse
+import datetime
+import json
+import platform
+import random
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.fixtures import FIXTURE_SIZES, create_fixtures
+from benchmarks.utils import setup_django, benchmark_database, timer
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def get_percentile(values: list, percentile: int) -> float:
+    """Метод возвращает перцентиль percentile отсортированного списка values (ближайший ранг)"""
+    index = max(0, -(-len(values) * percentile // 100) - 1)
+    return values[index]
+
+
+def run_scenario(scenario, runs: int, prepare=None) -> dict:
+    """Метод выполняет сценарий runs раз и возвращает перцентили времени в миллисекундах, среднее и
+     максимальное количество запросов к базе и пиковое потребление памяти в килобайтах.
+     Функция prepare вызывается перед каждым выполнением сценария и в измерения не входит"""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    durations, query_counts = [], []
+    for _ in range(runs):
+        if prepare:
+            prepare()
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            scenario()
+            durations.append((time.perf_counter() - start) * 1000)
+        query_counts.append(len(queries))
+
+    if prepare:
+        prepare()
+    tracemalloc.start()
+    scenario()
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    durations.sort()
+    result = {f'p{percentile}_ms': round(get_percentile(durations, percentile), 3) for percentile in PERCENTILES}
+    result.update({'mean_ms': round(statistics.mean(durations), 3),
+                   'max_ms': round(durations[-1], 3),
+                   'runs': runs,
+                   'queries_mean': round(statistics.mean(query_counts), 2),
+                   'queries_max': max(query_counts),
+                   'peak_memory_kb': round(peak_memory / 1024, 1)})
+    return result
+
+
+def check_response(response) -> None:
+    """Метод проверяет, что сценарий получил успешный ответ, иначе измерения не имеют смысла"""
+    if response.status_code != 200:
+        raise RuntimeError(f'Unexpected response status {response.status_code}')
+
+
+def get_read_scenarios(client, admin_client) -> dict:
+    """Метод возвращает сценарии чтения: {имя: (функция сценария, функция подготовки или None)}"""
+    from django.core.cache import cache
+    from django.urls import reverse
+
+    from app_blog.models import Post
+    from app_blog.services.cursor_pagination import encode_cursor
+    from app_blog.services.post_cache_services import invalidate_post_list_cache
+
+    posts_count = Post.objects.count()
+    middle_post = Post.objects.order_by('-publication_date', '-id')[posts_count // 2]
+    middle_cursor = encode_cursor(middle_post.publication_date, middle_post.id)
+    max_post_id = Post.objects.order_by('-id').values_list('id', flat=True).first()
+
+    def get_random_post_detail():
+        post_id = Post.objects.filter(id__gte=random.randint(1, max_post_id)).values_list('id', flat=True).first()
+        return reverse('post_detail', kwargs={'pk': post_id})
+
+    post_detail_urls = [get_random_post_detail() for _ in range(100)]
+
+    return {
+        'post_list_cold': (lambda: check_response(client.get(reverse('post_list'))),
+                           invalidate_post_list_cache),
+        'post_list_warm': (lambda: check_response(client.get(reverse('post_list'))), None),
+        'post_list_cursor': (lambda: check_response(client.get(reverse('post_list'), {'after': middle_cursor})),
+                             invalidate_post_list_cache),
+        'post_detail': (lambda: check_response(client.get(random.choice(post_detail_urls))), cache.clear),
+        'admin_post_changelist': (lambda: check_response(admin_client.get(reverse('admin:app_blog_post_changelist'))),
+                                  None),
+    }
+
+
+def get_create_posts_from_file_scenario(file_posts: int):
+    """Метод возвращает сценарий создания file_posts постов из файла"""
+    from django.contrib.auth.models import User
+    from django.core.files.base import ContentFile
+
+    from app_blog.services.post_services import DATETIME_FORMAT_FOR_DATETIME, create_posts_from_file
+    from blog.settings import POSTS_FILE_DELIMITER
+
+    user = User.objects.order_by('id').first()
+    publication_date = datetime.datetime(2020, 1, 1).strftime(DATETIME_FORMAT_FOR_DATETIME)
+    file_content = '\n'.join(POSTS_FILE_DELIMITER.join([f'Пост из файла {number}', f'Содержание {number}',
+                                                        publication_date])
+                             for number in range(file_posts)).encode('utf-8')
+
+    def create_posts():
+        is_correct, message = create_posts_from_file(user, ContentFile(file_content, name='posts.txt'))
+        if not is_correct:
+            raise RuntimeError(message)
+
+    return create_posts
+
+
+def get_git_commit() -> str:
+    """Метод возвращает хэш текущего коммита или None, если он недоступен"""
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Набор бенчмарков блога')
+    parser.add_argument('--size', choices=FIXTURE_SIZES, default='1k', help='Размер набора данных')
+    parser.add_argument('--users', type=int, help='Количество пользователей, по умолчанию из --size')
+    parser.add_argument('--posts', type=int, help='Количество постов, по умолчанию из --size')
+    parser.add_argument('--images', type=int, help='Количество картинок постов, по умолчанию из --size')
+    parser.add_argument('--runs', type=int, default=50, help='Количество выполнений сценариев чтения')
+    parser.add_argument('--file-posts', type=int, default=10000, help='Количество строк в файле с постами')
+    parser.add_argument('--file-runs', type=int, default=3, help='Количество выполнений создания постов из файла')
+    parser.add_argument('--seed', type=int, default=0, help='Начальное значение генератора случайных чисел')
+    parser.add_argument('--output', default='bench_results.json', help='Файл для записи результатов')
+    arguments = parser.parse_args()
+    sizes = {name: getattr(arguments, name) or count for name, count in FIXTURE_SIZES[arguments.size].items()}
+
+    setup_django()
+    import django
+    from django.conf import settings
+    from django.contrib.auth.models import User
+    from django.test import Client
+    from django.test.utils import setup_test_environment, override_settings
+
+    setup_test_environment()
+    results = {'commit': get_git_commit(),
+               'created_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+               'python': platform.python_version(),
+               'django': django.get_version(),
+               'dataset': sizes,
+               'scenarios': {}}
+    # Файлы и общий кэш (сессии, пользователи, прогресс импорта) пишутся во временные каталоги, а не в каталоги сайта
+    shared_cache = {**settings.CACHES[settings.SHARED_CACHE_ALIAS], 'LOCATION': tempfile.mkdtemp()}
+    with override_settings(MEDIA_ROOT=tempfile.mkdtemp(),
+                           CACHES={**settings.CACHES, settings.SHARED_CACHE_ALIAS: shared_cache}), \
+            benchmark_database():
+        print(f'Creating {sizes["users"]} users, {sizes["posts"]} posts, {sizes["images"]} images...')
+        with timer(results, 'fixtures_seconds'):
+            create_fixtures(sizes['users'], sizes['posts'], sizes['images'], seed=arguments.seed)
+        results['fixtures_seconds'] = round(results['fixtures_seconds'], 1)
+
+        admin_client = Client()
+        admin_client.force_login(User.objects.create_superuser('bench_admin', password='p@ssw0rd'))
+        for name, (scenario, prepare) in get_read_scenarios(Client(), admin_client).items():
+            print(f'Running {name}...')
+            results['scenarios'][name] = run_scenario(scenario, arguments.runs, prepare=prepare)
+
+        print('Running create_posts_from_file...')
+        results['scenarios']['create_posts_from_file'] = run_scenario(
+            get_create_posts_from_file_scenario(arguments.file_posts), arguments.file_runs)
+        results['scenarios']['create_posts_from_file']['file_posts'] = arguments.file_posts
+
+    with open(arguments.output, 'w', encoding='utf-8') as output_file:
+        json.dump(results, output_file, indent=2)
+    for name, scenario_results in results['scenarios'].items():
+        print(f'{name}: p50 {scenario_results["p50_ms"]} ms, p99 {scenario_results["p99_ms"]} ms, '
+              f'queries {scenario_results["queries_max"]}, peak memory {scenario_results["peak_memory_kb"]} KB')
+    print(f'Results saved to {arguments.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""Генератор больших наборов данных для бенчмарков.
+
+Создаёт пользователей с профилями, посты со случайными датами публикации и картинки постов.
+Все записи вставляются через bulk_create пачками. Все картинки ссылаются на один небольшой файл:
+хранилище картинок постов адресует файлы по содержимому, поэтому одинаковые картинки и так хранятся
+одним файлом, а генерация не зависит от скорости диска.
+"""
+import datetime
+import io
+import random
+
+FIXTURE_BATCH_SIZE = 10000
+FIXTURE_USER_PASSWORD = 'p@ssw0rd'
+FIXTURE_SIZES = {'1k': {'users': 100, 'posts': 1000, 'images': 500},
+                 '100k': {'users': 1000, 'posts': 100000, 'images': 50000},
+                 '1m': {'users': 10000, 'posts': 1000000, 'images': 500000}}
+
+
+def create_users(users_count: int) -> list:
+    """Метод создаёт users_count пользователей с профилями и возвращает список их id.
+     У всех пользователей один хэш пароля FIXTURE_USER_PASSWORD, чтобы не вычислять его для каждого"""
+    from django.contrib.auth.hashers import make_password
+    from django.contrib.auth.models import User
+
+    from app_users.models import Profile
+
+    password = make_password(FIXTURE_USER_PASSWORD)
+    for batch_start in range(0, users_count, FIXTURE_BATCH_SIZE):
+        User.objects.bulk_create([User(username=f'user_{number}', password=password)
+                                  for number in range(batch_start, min(batch_start + FIXTURE_BATCH_SIZE, users_count))])
+    user_ids = list(User.objects.filter(username__startswith='user_').values_list('id', flat=True))
+    Profile.objects.bulk_create([Profile(user_id=user_id) for user_id in user_ids], batch_size=FIXTURE_BATCH_SIZE)
+    return user_ids
+
+
+def create_posts(posts_count: int, user_ids: list) -> None:
+    """Метод создаёт posts_count постов случайных авторов со случайными датами публикации"""
+    from app_blog.models import Post
+
+    start_date = datetime.datetime(2010, 1, 1, tzinfo=datetime.timezone.utc)
+    for batch_start in range(0, posts_count, FIXTURE_BATCH_SIZE):
+        Post.objects.bulk_create([
+            Post(post_author_id=random.choice(user_ids),
+                 post_title=f'Пост {number}',
+                 post_content=f'Содержание поста {number}. ' * random.randint(1, 20),
+                 publication_date=start_date + datetime.timedelta(seconds=random.randrange(10 ** 9)))
+            for number in range(batch_start, min(batch_start + FIXTURE_BATCH_SIZE, posts_count))
+        ])
+
+
+def _create_image_file_names() -> dict:
+    """Метод сохраняет в хранилище картинок постов одну небольшую картинку с уменьшенными копиями и
+     возвращает имена файлов для полей PostImage"""
+    from django.core.files.base import ContentFile
+    from PIL import Image
+
+    from app_media.models import PostImage
+    from app_media.services.image_services import create_image_variants
+    from blog.settings import POST_IMAGE_VARIANT_SIZES
+
+    image_buffer = io.BytesIO()
+    Image.new('RGB', (1600, 1200), color=(165, 42, 42)).save(image_buffer, format='JPEG')
+    post_image = PostImage(post_id=None)
+    post_image.post_image_file.save('fixture.jpg', ContentFile(image_buffer.getvalue()), save=False)
+    create_image_variants(post_image, 'post_image_file', POST_IMAGE_VARIANT_SIZES)
+    return {'post_image_file': post_image.post_image_file.name,
+            'post_image_file_small': post_image.post_image_file_small.name,
+            'post_image_file_medium': post_image.post_image_file_medium.name}
+
+
+def create_post_images(images_count: int) -> None:
+    """Метод создаёт images_count картинок случайных постов"""
+    from app_blog.models import Post
+    from app_media.models import PostImage
+
+    image_file_names = _create_image_file_names()
+    post_ids = list(Post.objects.values_list('id', flat=True))
+    for batch_start in range(0, images_count, FIXTURE_BATCH_SIZE):
+        PostImage.objects.bulk_create([PostImage(post_id=random.choice(post_ids), **image_file_names)
+                                       for _ in range(min(FIXTURE_BATCH_SIZE, images_count - batch_start))])
+
+
+def create_fixtures(users_count: int, posts_count: int, images_count: int, seed: int = 0) -> None:
+    """Метод создаёт набор данных из users_count пользователей, posts_count постов и images_count картинок.
+     При одинаковом seed создаётся одинаковый набор данных"""
+    from django.db import transaction
+
+    from app_blog.services.post_cache_services import invalidate_post_list_cache
+
+    random.seed(seed)
+    with transaction.atomic():
+        user_ids = create_users(users_count)
+        create_posts(posts_count, user_ids)
+        create_post_images(images_count)
+    # bulk_create не отправляет сигналы сохранения постов
+    invalidate_post_list_cache()
@@ -0,0 +1,36 @@
+"""Общие функции бенчмарков"""
+import os
+import time
+from contextlib import contextmanager
+
+import django
+
+
+def setup_django() -> None:
+    """Метод инициализации django с настройками проекта"""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blog.settings')
+    django.setup()
+
+
+@contextmanager
+def benchmark_database(database_name: str = None):
+    """Контекстный менеджер, создающий на время бенчмарка отдельную тестовую базу с применёнными миграциями.
+     По умолчанию база создаётся в памяти, database_name задаёт путь к файлу базы"""
+    from django.db import connection
+
+    old_database_name = connection.settings_dict['NAME']
+    if database_name:
+        connection.settings_dict['TEST']['NAME'] = database_name
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_database_name, verbosity=0)
+
+
+@contextmanager
+def timer(results: dict, name: str):
+    """Контекстный менеджер, записывающий время выполнения блока в секундах в results[name]"""
+    start = time.perf_counter()
+    yield
+    results[name] = time.perf_counter() - start
@@ -17,6 +17,9 @@ DEBUG = True
 
 ALLOWED_HOSTS = []
 
+# Тесты запускаются с настройками тестового окружения из core/test_runner.py
+TEST_RUNNER = 'core.test_runner.BlogTestRunner'
+
 
 # Application definition
 
@@ -34,6 +37,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.RequestMetricsMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',
@@ -42,13 +47,14 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.RequestProfilingMiddleware',
 ]
 
 ROOT_URLCONF = 'blog.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'core.template_backends.TimedDjangoTemplates',
         'DIRS': [],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -70,11 +76,86 @@ WSGI_APPLICATION = 'blog.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'core.db_backends.sqlite3',
         'NAME': f'{BASE_DIR}/db.sqlite3',
     }
 }
 
+# Реплика базы только для чтения (см. core/db_routers.py). Реплицируется вне приложения, для локальной проверки
+# достаточно копии файла основной базы: BLOG_REPLICA_DATABASE=db_replica.sqlite3 python manage.py runserver
+# Реплика объявлена всегда, но чтение идёт в неё, только если она указана в DATABASE_REPLICAS.
+# В тестах включается через override_settings(DATABASE_REPLICAS=['replica'])
+REPLICA_DATABASE_NAME = os.environ.get('BLOG_REPLICA_DATABASE')
+DATABASES['replica'] = {
+    'ENGINE': 'core.db_backends.sqlite3',
+    'NAME': f'{BASE_DIR}/{REPLICA_DATABASE_NAME or "db_replica.sqlite3"}',
+}
+DATABASE_REPLICAS = ['replica'] if REPLICA_DATABASE_NAME else []
+DATABASE_ROUTERS = ['core.db_routers.PrimaryReplicaRouter']
+DATABASE_PRIMARY_STICKY_SECONDS = 10  # время после записи пользователя, в течение которого он читает из основной базы
+# PRAGMA, выполняемые при открытии каждого соединения с базой (см. core/db_backends/sqlite3/base.py)
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'busy_timeout': 5000,  # миллисекунды
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,  # байты
+    'cache_size': -64 * 1024,  # отрицательное значение - размер в килобайтах, а не в страницах
+}
+SQLITE_TRANSACTION_MODE = 'DEFERRED'  # режим BEGIN транзакций: DEFERRED, IMMEDIATE или EXCLUSIVE
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.1/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'blog-default',
+    },
+    # Кэш, общий для всех процессов сайта, для данных, которые записывает один процесс, а читают другие.
+    # Файловый кэш общий для процессов одного сервера, при нескольких серверах нужен memcached или redis.
+    # Кэш в памяти процесса для него не подходит, это проверяется при запуске (см. core/checks.py)
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(BASE_DIR, 'cache/'),
+    },
+}
+SHARED_CACHE_ALIAS = 'shared'
+
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'blog.request_metrics': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
+# Sessions and authentication
+# https://docs.djangoproject.com/en/3.1/topics/http/sessions/#configuring-the-session-engine
+
+# Хранилище сессий: db - в базе, cached_db - в кэше с записью в базу, signed_cookies - в подписанных cookie
+# без хранения на сервере. Задаётся переменной окружения: BLOG_SESSION_MODE=signed_cookies python manage.py runserver
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+SESSION_ENGINE = SESSION_ENGINES[os.environ.get('BLOG_SESSION_MODE', 'cached_db')]
+# Сессии cached_db хранятся в общем кэше, чтобы выход из аккаунта был виден всем процессам сервера
+SESSION_CACHE_ALIAS = SHARED_CACHE_ALIAS
+# Пользователь сессии загружается из общего кэша (см. app_users/services/user_cache_services.py)
+AUTHENTICATION_BACKENDS = ['app_users.backends.CachedModelBackend']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.1/ref/settings/#auth-password-validators
@@ -128,3 +209,36 @@ MEDIA_URL = '/media/'
 
 POST_MAX_LENGTH = 1000  # максимальная длина поста
 POSTS_FILE_DELIMITER = ';'  # разделитель колонок в файле с постами
+POST_LIST_PAGE_SIZE = 20  # количество постов на одной странице списка постов
+POSTS_IMPORT_BATCH_SIZE = 500  # количество постов, вставляемых в базу одним запросом при создании постов из файла
+POSTS_IMPORT_WORKERS = 2  # количество потоков, в которых выполняются задачи создания постов из файла
+POST_LIST_CACHE_TIMEOUT = 60 * 5  # время жизни закэшированной страницы списка постов в секундах
+POST_CARD_CACHE_TIMEOUT = 60 * 60 * 24  # время жизни закэшированной карточки поста в секундах
+POST_IMAGE_VARIANT_SIZES = {'small': (320, 320), 'medium': (1024, 1024)}  # размеры уменьшенных копий картинок постов
+# Время после записи файла картинки поста, в течение которого он не удаляется, даже если на него нет ссылок
+POST_IMAGE_FILE_DELETE_GRACE_SECONDS = 60
+AVATAR_IMAGE_SIZE = (240, 240)  # размер, до которого обрезаются загружаемые аватарки
+AVATAR_IMAGE_VARIANT_SIZES = {'small': (120, 120)}  # размеры уменьшенных копий аватарок
+POST_SEARCH_RANK_WEIGHTS = (10.0, 1.0)  # веса заголовка и содержания поста при ранжировании результатов поиска bm25
+AUTH_USER_CACHE_TIMEOUT = 60  # время жизни закэшированного пользователя сессии в секундах
+PROFILE_SUMMARY_CACHE_TIMEOUT = 60 * 60  # время жизни закэшированной сводки профиля пользователя в секундах
+AUTHOR_HEADER_CACHE_TIMEOUT = 60 * 60  # время жизни закэшированной шапки страницы постов автора в секундах
+POST_FEED_SIZE = 20  # количество последних постов в RSS/Atom лентах
+POST_FEED_CACHE_TIMEOUT = 60 * 60  # время жизни закэшированной RSS/Atom ленты в секундах
+# Максимальное количество запросов к базе для вью по имени url (с учётом запросов сессии и пользователя)
+VIEW_QUERY_BUDGETS = {
+    'post_list': 4,
+    'author_post_list': 5,
+    'post_search': 4,
+    'post_detail': 5,
+    'posts_import_job_status': 3,
+    'post_rss_feed': 2,
+    'post_atom_feed': 2,
+    'author_rss_feed': 4,
+    'author_atom_feed': 4,
+    'api_post_list': 4,
+    'api_post_detail': 4,
+}
+VIEW_QUERY_BUDGET_RAISE = False  # вызывать исключение при превышении бюджета запросов вместо предупреждения в лог
+PROFILING_DIR = os.path.join(BASE_DIR, 'profiles/')  # каталог профилей запросов (см. core/profiling.py)
+PROFILING_TOKEN_MAX_AGE = 60 * 60  # время действия токена профилирования запросов в секундах
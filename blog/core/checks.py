@@ -0,0 +1,20 @@
+"""Модуль проверок настроек проекта, выполняемых при запуске (manage.py check, runserver, test)"""
+from django.conf import settings
+from django.core.checks import Error
+
+PROCESS_LOCAL_CACHE_BACKENDS = ('django.core.cache.backends.locmem.LocMemCache',
+                                'django.core.cache.backends.dummy.DummyCache')
+
+
+def check_shared_cache(app_configs, **kwargs) -> list:
+    """Проверка, что кэш SHARED_CACHE_ALIAS объявлен и общий для всех процессов.
+     Данные в кэше в памяти процесса не видны другим процессам, а в фиктивном кэше не сохраняются"""
+    cache_settings = settings.CACHES.get(settings.SHARED_CACHE_ALIAS)
+    if cache_settings is None:
+        return [Error(f'Cache "{settings.SHARED_CACHE_ALIAS}" is not configured in CACHES',
+                      hint='Configure a cache shared by all server processes', id='core.E001')]
+    if cache_settings['BACKEND'] in PROCESS_LOCAL_CACHE_BACKENDS:
+        return [Error(f'Cache "{settings.SHARED_CACHE_ALIAS}" must be shared by all server processes, '
+                      f'{cache_settings["BACKEND"]} is not',
+                      hint='Use a file based cache, memcached or redis', id='core.E002')]
+    return []
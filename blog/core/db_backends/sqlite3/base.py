@@ -0,0 +1,28 @@
+"""Бэкенд SQLite, настраивающий каждое новое соединение для работы под нагрузкой.
+
+Сразу после открытия соединения выполняются PRAGMA из SQLITE_PRAGMAS: журнал WAL позволяет читать базу
+во время записи (читатели не ждут фиксации транзакции импорта постов), busy_timeout задаёт время ожидания
+блокировки вместо немедленной ошибки "database is locked", synchronous=NORMAL в режиме WAL синхронизирует
+файл только при checkpoint, mmap_size и cache_size уменьшают количество чтений с диска.
+Транзакции начинаются командой BEGIN с режимом SQLITE_TRANSACTION_MODE (по умолчанию DEFERRED, блокировка
+берётся при первом обращении к базе). Транзакции, которые сначала читают, а потом пишут (импорт постов, захват
+задачи импорта), открываются через core.handlers.immediate_atomic в режиме IMMEDIATE: блокировка записи
+берётся сразу, и две такие транзакции ждут друг друга по busy_timeout, а не падают при попытке повысить
+блокировку чтения до блокировки записи.
+"""
+from django.conf import settings
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    # Режим BEGIN следующей транзакции соединения, заменяющий SQLITE_TRANSACTION_MODE
+    transaction_mode = None
+
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            connection.execute(f'PRAGMA {name} = {value}')
+        return connection
+
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute(f'BEGIN {self.transaction_mode or settings.SQLITE_TRANSACTION_MODE}')
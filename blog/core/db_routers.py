@@ -0,0 +1,62 @@
+"""Модуль маршрутизации запросов к базе между основной базой и репликами только для чтения.
+
+Запись всегда идёт в основную базу (PRIMARY_DATABASE), чтение - в случайную реплику из DATABASE_REPLICAS.
+Чтение идёт в основную базу, если реплик нет, если открыта транзакция основной базы, а также если
+основная база закреплена за текущим запросом: после записи в этом запросе или в течение
+DATABASE_PRIMARY_STICKY_SECONDS после записи пользователя в предыдущих запросах (см. ReplicaRoutingMiddleware),
+чтобы пользователь сразу видел свои изменения, даже если реплика ещё не успела их получить.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+PRIMARY_DATABASE = 'default'
+
+_primary_database_pinned = ContextVar('primary_database_pinned', default=False)
+_primary_database_written = ContextVar('primary_database_written', default=False)
+
+
+def is_primary_database_written() -> bool:
+    """Метод возвращает, была ли запись в основную базу в текущем запросе"""
+    return _primary_database_written.get()
+
+
+@contextmanager
+def database_routing(pinned: bool):
+    """Контекстный менеджер маршрутизации запросов к базе одного http запроса или фоновой задачи.
+     Если pinned, чтение идёт из основной базы. Признак записи в основную базу относится только к этому блоку"""
+    pinned_token = _primary_database_pinned.set(pinned)
+    written_token = _primary_database_written.set(False)
+    try:
+        yield
+    finally:
+        _primary_database_pinned.reset(pinned_token)
+        _primary_database_written.reset(written_token)
+
+
+def use_primary_database():
+    """Контекстный менеджер, внутри которого чтение идёт из основной базы.
+     Используется фоновыми задачами, которые читают только что записанные данные"""
+    return database_routing(pinned=True)
+
+
+class PrimaryReplicaRouter:
+    """Роутер базы данных: запись в основную базу, чтение из реплик"""
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if not replicas or _primary_database_pinned.get() or connections[PRIMARY_DATABASE].in_atomic_block:
+            return PRIMARY_DATABASE
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        _primary_database_written.set(True)
+        _primary_database_pinned.set(True)
+        return PRIMARY_DATABASE
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплики содержат копию основной базы, поэтому связи между объектами из разных баз допустимы
+        return True
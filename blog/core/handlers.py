@@ -1,5 +1,9 @@
 """Модуль с общими функциями"""
 import os
+from contextlib import contextmanager
+from functools import partial
+
+from django.db import transaction
 
 from blog.settings import MEDIA_URL
 
@@ -7,3 +11,27 @@ from blog.settings import MEDIA_URL
 def get_correct_file_path_to_img_tag(file_field) -> str:
     """Метод возращает корректный путь до файла для src тега <img>"""
     return os.path.join(MEDIA_URL, str(file_field))
+
+
+def call_now_and_on_commit(func, *args) -> None:
+    """Метод вызывает функцию инвалидации кэша сразу и ещё раз после фиксации текущей транзакции.
+     Первый вызов нужен, чтобы изменения были видны в той же транзакции, второй - чтобы сбросить данные,
+     закэшированные параллельными запросами, которые прочитали базу до фиксации транзакции.
+     Вне транзакции функция вызывается дважды подряд"""
+    func(*args)
+    transaction.on_commit(partial(func, *args))
+
+
+@contextmanager
+def immediate_atomic(using: str = None):
+    """Контекстный менеджер транзакции, которая берёт блокировку записи SQLite сразу при начале (BEGIN IMMEDIATE).
+     Нужен транзакциям, которые сначала читают, а потом пишут. Внутри уже открытой транзакции
+     работает как transaction.atomic"""
+    connection = transaction.get_connection(using)
+    connection.transaction_mode = 'IMMEDIATE'
+    try:
+        with transaction.atomic(using=using):
+            connection.transaction_mode = None
+            yield
+    finally:
+        connection.transaction_mode = None
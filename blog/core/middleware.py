@@ -0,0 +1,152 @@
+import cProfile
+import json
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from .db_routers import database_routing, is_primary_database_written
+from .profiling import check_profiling_token, save_profile
+from .request_metrics import start_request_metrics, finish_request_metrics
+
+logger = logging.getLogger('blog.request_metrics')
+
+
+class QueryBudgetExceededException(Exception):
+    pass
+
+
+class RequestMetricsMiddleware:
+    """Middleware, собирающее метрики запроса: количество запросов к базе, время работы с базой,
+     время выполнения вью (включая рендеринг шаблонов) и время рендеринга шаблонов.
+     Метрики добавляются в заголовок ответа Server-Timing и пишутся в лог строкой JSON.
+     Если количество запросов к базе превышает бюджет вью из VIEW_QUERY_BUDGETS, пишется предупреждение,
+     а при VIEW_QUERY_BUDGET_RAISE (включено в тестах, см. core/test_runner.py) вызывается QueryBudgetExceededException.
+     Для учёта всех запросов к базе должно стоять первым в MIDDLEWARE"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = start_request_metrics()
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics.record_query))
+                request.view_start_time = None
+                response = self.get_response(request)
+        finally:
+            finish_request_metrics()
+        end = time.perf_counter()
+        if request.view_start_time is not None:
+            metrics.view_time = end - request.view_start_time
+
+        view_name = request.resolver_match.view_name if request.resolver_match else None
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={metrics.db_time * 1000:.3f};desc="{metrics.query_count} queries"',
+            f'view;dur={metrics.view_time * 1000:.3f}',
+            f'template;dur={metrics.template_time * 1000:.3f}',
+            f'total;dur={(end - start) * 1000:.3f}',
+        ])
+        logger.info(json.dumps({'method': request.method,
+                                'path': request.path,
+                                'view': view_name,
+                                'status': response.status_code,
+                                'query_count': metrics.query_count,
+                                'db_ms': round(metrics.db_time * 1000, 3),
+                                'view_ms': round(metrics.view_time * 1000, 3),
+                                'template_ms': round(metrics.template_time * 1000, 3),
+                                'total_ms': round((end - start) * 1000, 3)}))
+        self._check_query_budget(view_name, metrics.query_count)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.view_start_time = time.perf_counter()
+
+    @staticmethod
+    def _check_query_budget(view_name: str, query_count: int) -> None:
+        """Метод проверки количества запросов к базе вью view_name по бюджету из VIEW_QUERY_BUDGETS"""
+        query_budget = settings.VIEW_QUERY_BUDGETS.get(view_name)
+        if query_budget is None or query_count <= query_budget:
+            return
+        message = f'View {view_name} made {query_count} queries, query budget is {query_budget}'
+        if settings.VIEW_QUERY_BUDGET_RAISE:
+            raise QueryBudgetExceededException(message)
+        logger.warning(message)
+
+
+class ReplicaRoutingMiddleware:
+    """Middleware закрепления основной базы за пользователем после записи (см. core/db_routers.py).
+     После запроса с записью в основную базу в cookie сохраняется время, до которого чтение этого пользователя
+     идёт из основной базы. Должно стоять перед SessionMiddleware, чтобы учитывать сохранение сессии"""
+    cookie_name = 'db_primary_until'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with database_routing(pinned=self._is_pinned_by_cookie(request)):
+            response = self.get_response(request)
+            written = is_primary_database_written()
+        if written:
+            sticky_seconds = settings.DATABASE_PRIMARY_STICKY_SECONDS
+            response.set_cookie(self.cookie_name, str(time.time() + sticky_seconds),
+                                max_age=sticky_seconds, httponly=True, samesite='Lax')
+        return response
+
+    def _is_pinned_by_cookie(self, request) -> bool:
+        """Метод проверяет, не истекло ли время закрепления основной базы из cookie"""
+        try:
+            return float(request.COOKIES.get(self.cookie_name, 0)) > time.time()
+        except ValueError:
+            return False
+
+
+class RequestProfilingMiddleware:
+    """Middleware профилирования отдельных запросов сотрудников по подписанному токену из заголовка X-Profile
+     или параметра запроса _profile (см. core/profiling.py). В ответ на профилированный запрос добавляется
+     заголовок X-Profile-Id с id сохранённого профиля. Для запросов без токена выполняется только проверка
+     наличия заголовка и параметра. Должно стоять после AuthenticationMiddleware"""
+    header_name = 'HTTP_X_PROFILE'
+    query_parameter = '_profile'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if self.header_name not in request.META and f'{self.query_parameter}=' not in request.META.get(
+                'QUERY_STRING', ''):
+            return self.get_response(request)
+        token = request.META.get(self.header_name) or request.GET.get(self.query_parameter, '')
+        if not check_profiling_token(token, request.user):
+            return self.get_response(request)
+        return self._get_profiled_response(request)
+
+    def _get_profiled_response(self, request):
+        """Метод выполняет запрос под cProfile, записывая выполненные запросы к базе, и сохраняет профиль"""
+        queries = []
+
+        def record_query(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                queries.append({'sql': sql, 'params': repr(params), 'many': many,
+                                'duration_ms': round((time.perf_counter() - start) * 1000, 3)})
+
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(record_query))
+            profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.disable()
+        profile_id = save_profile(profiler, request, response, time.perf_counter() - start, queries)
+        response['X-Profile-Id'] = profile_id
+        return response
@@ -0,0 +1,54 @@
+"""Модуль профилирования отдельных запросов.
+
+Сотрудник (is_staff) получает подписанный токен командой manage.py create_profiling_token и передаёт его
+в заголовке X-Profile или в параметре запроса _profile. Такой запрос выполняется под cProfile, а профиль
+и выполненные запросы к базе сохраняются в каталог PROFILING_DIR:
+    <id профиля>.prof - профиль, открывается через pstats или snakeviz
+    <id профиля>.json - метод, путь, пользователь, статус ответа, время и запросы к базе с их временем
+"""
+import datetime
+import json
+import os
+import re
+import uuid
+
+from django.conf import settings
+from django.core import signing
+
+PROFILING_TOKEN_SALT = 'core.profiling'
+
+
+def get_profiling_token(user) -> str:
+    """Метод возвращает подписанный токен профилирования запросов для пользователя user"""
+    return signing.TimestampSigner(salt=PROFILING_TOKEN_SALT).sign(str(user.pk))
+
+
+def check_profiling_token(token: str, user) -> bool:
+    """Метод проверяет, что токен подписан, не истёк, выдан пользователю user и пользователь - сотрудник"""
+    if not user.is_authenticated or not user.is_staff:
+        return False
+    try:
+        user_id = signing.TimestampSigner(salt=PROFILING_TOKEN_SALT).unsign(
+            token, max_age=settings.PROFILING_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return False
+    return user_id == str(user.pk)
+
+
+def save_profile(profiler, request, response, total_time: float, queries: list) -> str:
+    """Метод сохраняет профиль запроса и выполненные запросы к базе в каталог PROFILING_DIR.
+     Возвращает id профиля - имя файлов без расширения"""
+    os.makedirs(settings.PROFILING_DIR, exist_ok=True)
+    path_slug = re.sub(r'[^\w-]+', '_', request.path).strip('_')[:50] or 'root'
+    profile_id = f'{datetime.datetime.now():%Y%m%d_%H%M%S}_{path_slug}_{uuid.uuid4().hex[:8]}'
+    profile_path = os.path.join(settings.PROFILING_DIR, profile_id)
+    profiler.dump_stats(f'{profile_path}.prof')
+    with open(f'{profile_path}.json', 'w', encoding='utf-8') as report_file:
+        json.dump({'method': request.method,
+                   'path': request.get_full_path(),
+                   'user': request.user.username,
+                   'status': response.status_code,
+                   'total_ms': round(total_time * 1000, 3),
+                   'query_count': len(queries),
+                   'queries': queries}, report_file, ensure_ascii=False, indent=2)
+    return profile_id
@@ -0,0 +1,49 @@
+"""Модуль сбора метрик запроса: количество запросов к базе, время работы с базой, время выполнения вью
+и время рендеринга шаблонов.
+
+Метрики текущего запроса хранятся в ContextVar, поэтому запросы, выполняемые в разных потоках, не смешиваются.
+Их заполняют RequestMetricsMiddleware (запросы к базе и время вью) и бэкенд шаблонов TimedDjangoTemplates
+(время рендеринга шаблонов).
+"""
+import time
+from contextvars import ContextVar
+
+
+class RequestMetrics:
+    """Метрики одного запроса. Время хранится в секундах"""
+
+    def __init__(self):
+        self.query_count = 0
+        self.db_time = 0.0
+        self.view_time = 0.0
+        self.template_time = 0.0
+        self.template_depth = 0
+
+    def record_query(self, execute, sql, params, many, context):
+        """Обёртка выполнения запроса к базе для connection.execute_wrapper"""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.query_count += 1
+
+
+_request_metrics = ContextVar('request_metrics', default=None)
+
+
+def start_request_metrics() -> RequestMetrics:
+    """Метод начинает сбор метрик текущего запроса"""
+    metrics = RequestMetrics()
+    _request_metrics.set(metrics)
+    return metrics
+
+
+def finish_request_metrics() -> None:
+    """Метод завершает сбор метрик текущего запроса"""
+    _request_metrics.set(None)
+
+
+def get_request_metrics() -> RequestMetrics:
+    """Метод возвращает метрики текущего запроса или None, если они не собираются"""
+    return _request_metrics.get()
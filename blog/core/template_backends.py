@@ -0,0 +1,38 @@
+import time
+
+from django.template import TemplateDoesNotExist
+from django.template.backends.django import DjangoTemplates, Template, reraise
+
+from .request_metrics import get_request_metrics
+
+
+class TimedTemplate(Template):
+    """Шаблон, время рендеринга которого учитывается в метриках текущего запроса.
+     Вложенные рендеринги (например render_to_string из тега шаблона) не учитываются повторно"""
+
+    def render(self, context=None, request=None):
+        metrics = get_request_metrics()
+        if metrics is None:
+            return super().render(context, request)
+        metrics.template_depth += 1
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            metrics.template_depth -= 1
+            if metrics.template_depth == 0:
+                metrics.template_time += time.perf_counter() - start
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """Бэкенд шаблонов Django, учитывающий время рендеринга шаблонов в метриках запроса.
+     Шаблоны, подключаемые через {% include %} и {% extends %}, рендерятся внутри основного шаблона"""
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return TimedTemplate(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
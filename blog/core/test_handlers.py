@@ -1,8 +1,10 @@
 import datetime
 
 from django.contrib.auth.models import User
+from django.core.cache import caches
 
 from app_blog.models import Post
+from app_blog.services.post_cache_services import invalidate_post_list_cache
 from app_blog.services.post_services import DATETIME_FORMAT_FOR_DATETIME
 from app_users.models import Profile
 from blog.settings import POSTS_FILE_DELIMITER
@@ -47,6 +49,12 @@ def get_list_lines_from_file(file: str) -> list:
     return [line.split('\n')[0] for line in open(file, 'r', encoding='utf-8')]
 
 
+def clear_caches() -> None:
+    """Метод очищает все кэши: кэш процесса и общий кэш SHARED_CACHE_ALIAS"""
+    for cache in caches.all():
+        cache.clear()
+
+
 def create_test_user() -> User:
     """Метод создающий и возращающий тестового пользователя. Возвращает объект User"""
     user = User.objects.create_user(username=TEST_USERNAME,
@@ -68,3 +76,15 @@ def create_test_posts():
             post_content=post_info['post_content'],
             publication_date=datetime.datetime.strptime(post_info['publication_date'], PUBLICATION_DATETIME_FORMAT)
         )
+
+
+def create_many_test_posts(user: User, count: int) -> None:
+    """Метод создающий count тестовых постов пользователя user с разными датами публикации"""
+    start_date = datetime.datetime(2021, 1, 1, tzinfo=datetime.timezone.utc)
+    Post.objects.bulk_create([Post(post_author=user,
+                                   post_title=f'Пост номер {number}',
+                                   post_content=f'Содержание поста номер {number}',
+                                   publication_date=start_date + datetime.timedelta(minutes=number))
+                              for number in range(count)])
+    # bulk_create не отправляет сигналы сохранения постов
+    invalidate_post_list_cache()
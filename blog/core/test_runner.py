@@ -0,0 +1,39 @@
+"""Модуль запуска тестов с настройками тестового окружения.
+
+Настройки тестов задаются в TEST_SETTINGS и включаются на время всего запуска тестов любой командой,
+использующей TEST_RUNNER (manage.py test, python -m django test), а не по аргументам командной строки.
+"""
+import logging
+import tempfile
+
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+TEST_SETTINGS = {
+    # Превышение бюджета запросов вью в тестах вызывает исключение вместо предупреждения в лог
+    'VIEW_QUERY_BUDGET_RAISE': True,
+}
+QUIET_LOGGERS = ['blog.request_metrics']
+
+
+class BlogTestRunner(DiscoverRunner):
+    """Запуск тестов с настройками TEST_SETTINGS. Общий кэш хранится во временном каталоге, чтобы тесты
+     не видели данных предыдущих запусков и запущенного сайта. Логгеры QUIET_LOGGERS пишут в тестах только
+     предупреждения"""
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        shared_cache = {**settings.CACHES[settings.SHARED_CACHE_ALIAS], 'LOCATION': tempfile.mkdtemp()}
+        self._test_settings = override_settings(**TEST_SETTINGS,
+                                                CACHES={**settings.CACHES, settings.SHARED_CACHE_ALIAS: shared_cache})
+        self._test_settings.enable()
+        self._logger_levels = {name: logging.getLogger(name).level for name in QUIET_LOGGERS}
+        for name in QUIET_LOGGERS:
+            logging.getLogger(name).setLevel(logging.WARNING)
+
+    def teardown_test_environment(self, **kwargs):
+        for name, level in self._logger_levels.items():
+            logging.getLogger(name).setLevel(level)
+        self._test_settings.disable()
+        super().teardown_test_environment(**kwargs)
@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+
+from core.checks import check_shared_cache
+
+
+class SharedCacheCheckTest(SimpleTestCase):
+
+    def test_shared_cache_configured(self):
+        """Тест проверяющий, что общий кэш проекта проходит проверку"""
+        self.assertEqual(check_shared_cache(None), [])
+
+    def test_process_local_shared_cache(self):
+        """Тест проверяющий, что кэш в памяти процесса не может быть общим кэшем"""
+        caches = {**settings.CACHES,
+                  settings.SHARED_CACHE_ALIAS: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        with override_settings(CACHES=caches):
+            self.assertEqual([error.id for error in check_shared_cache(None)], ['core.E002'])
+
+    def test_missing_shared_cache(self):
+        """Тест проверяющий, что общий кэш должен быть объявлен"""
+        with override_settings(CACHES={'default': settings.CACHES['default']}):
+            self.assertEqual([error.id for error in check_shared_cache(None)], ['core.E001'])
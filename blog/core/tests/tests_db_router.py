@@ -0,0 +1,57 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from app_blog.models import Post
+from app_users.models import Profile
+from core.db_routers import database_routing, use_primary_database
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class PrimaryReplicaRouterTest(TransactionTestCase):
+    """Тесты маршрутизации на двух базах SQLite. Реплика в тестах не получает изменений основной базы,
+     поэтому по результату чтения видно, из какой базы оно выполнено"""
+    databases = {'default', 'replica'}
+
+    def _create_post_in_primary(self) -> Post:
+        with database_routing(pinned=False):
+            author = User.objects.create_user(username='author', password='p@ssw0rd')
+            Profile.objects.create(user=author)
+            return Post.objects.create(post_author=author, post_title='Пост', post_content='Содержание',
+                                       publication_date=timezone.now())
+
+    def test_writes_go_to_primary_and_reads_to_replica(self):
+        """Тест проверяющий, что запись идёт в основную базу, а чтение - в реплику"""
+        self._create_post_in_primary()
+        self.assertEqual(Post.objects.using('default').count(), 1)
+        with database_routing(pinned=False):
+            self.assertEqual(Post.objects.count(), 0)
+
+    def test_reads_after_write_go_to_primary(self):
+        """Тест проверяющий, что после записи, в транзакции и в фоновых задачах чтение идёт из основной базы"""
+        self._create_post_in_primary()
+        with database_routing(pinned=False):
+            User.objects.create_user(username='writer', password='p@ssw0rd')
+            self.assertEqual(Post.objects.count(), 1)
+        with database_routing(pinned=False), transaction.atomic():
+            self.assertEqual(Post.objects.count(), 1)
+        with use_primary_database():
+            self.assertEqual(Post.objects.count(), 1)
+
+    def test_user_reads_stick_to_primary_after_write(self):
+        """Тест проверяющий, что после запроса с записью следующие запросы пользователя читают из основной базы,
+         пока не истечёт время закрепления"""
+        post = self._create_post_in_primary()
+        post_url = reverse('post_detail', kwargs={'pk': post.id})
+        self.assertEqual(self.client.get(post_url).status_code, 404)
+
+        response = self.client.post(reverse('register'), {'username': 'new_user', 'password1': 'c0olP@sw',
+                                                          'password2': 'c0olP@sw'})
+        self.assertEqual(response.status_code, 302)
+        self.assertIn('db_primary_until', response.cookies)
+        self.assertEqual(self.client.get(post_url).status_code, 200)
+
+        self.client.cookies['db_primary_until'] = '0'
+        self.assertEqual(self.client.get(post_url).status_code, 404)
@@ -0,0 +1,53 @@
+import json
+import re
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.middleware import QueryBudgetExceededException
+from core.test_handlers import clear_caches, create_test_posts
+
+
+class RequestMetricsMiddlewareTest(TestCase):
+
+    def setUp(self):
+        """Метод предварительных действий. Перед каждым тестом очищаем кэш и создаём тестовые посты"""
+        clear_caches()
+        create_test_posts()
+
+    def test_server_timing_header(self):
+        """Тест проверяющий, что в заголовке Server-Timing есть время работы с базой с количеством запросов,
+         время вью, время рендеринга шаблонов и общее время"""
+        response = self.client.get(reverse('post_detail', kwargs={'pk': 1}))
+        server_timing = response['Server-Timing']
+        self.assertRegex(server_timing, r'db;dur=[\d.]+;desc="2 queries"')
+        for metric in ('view', 'template', 'total'):
+            self.assertRegex(server_timing, rf'\b{metric};dur=[\d.]+')
+        template_time = float(re.search(r'template;dur=([\d.]+)', server_timing).group(1))
+        self.assertGreater(template_time, 0)
+
+    def test_structured_log(self):
+        """Тест проверяющий, что метрики запроса пишутся в лог строкой JSON"""
+        with self.assertLogs('blog.request_metrics', level='INFO') as logs:
+            self.client.get(reverse('post_list'))
+        metrics = json.loads(logs.records[0].getMessage())
+        self.assertEqual(metrics['view'], 'post_list')
+        self.assertEqual(metrics['status'], 200)
+        self.assertEqual(metrics['query_count'], 1)
+        self.assertGreater(metrics['template_ms'], 0)
+        self.assertGreaterEqual(metrics['view_ms'], metrics['template_ms'])
+        self.assertGreaterEqual(metrics['total_ms'], metrics['view_ms'])
+
+    @override_settings(VIEW_QUERY_BUDGETS={'post_list': 0}, VIEW_QUERY_BUDGET_RAISE=True)
+    def test_query_budget_exceeded_raises(self):
+        """Тест проверяющий, что при превышении бюджета запросов вью в тестах вызывается исключение"""
+        with self.assertRaises(QueryBudgetExceededException):
+            self.client.get(reverse('post_list'))
+
+    @override_settings(VIEW_QUERY_BUDGETS={'post_list': 0}, VIEW_QUERY_BUDGET_RAISE=False)
+    def test_query_budget_exceeded_warning(self):
+        """Тест проверяющий, что при превышении бюджета запросов вью вне тестов пишется предупреждение"""
+        with self.assertLogs('blog.request_metrics', level='WARNING') as logs:
+            response = self.client.get(reverse('post_list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('View post_list made 1 queries, query budget is 0', logs.output[0])
@@ -0,0 +1,76 @@
+import json
+import os
+import pstats
+import tempfile
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command, CommandError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.profiling import get_profiling_token
+from core.test_handlers import create_test_posts, TEST_USERNAME, TEST_USER_PASSWORD
+
+
+@override_settings(PROFILING_DIR=tempfile.mkdtemp())
+class RequestProfilingMiddlewareTest(TestCase):
+
+    def setUp(self):
+        """Метод предварительных действий. Создаём тестовые посты и логинимся под сотрудником"""
+        create_test_posts()
+        self.user = User.objects.get(username=TEST_USERNAME)
+        self.user.is_staff = True
+        self.user.save()
+        self.client.login(username=TEST_USERNAME, password=TEST_USER_PASSWORD)
+
+    def _get_profile_files(self, profile_id: str):
+        from django.conf import settings
+        return os.path.join(settings.PROFILING_DIR, f'{profile_id}.prof'), \
+            os.path.join(settings.PROFILING_DIR, f'{profile_id}.json')
+
+    def test_profile_by_header(self):
+        """Тест проверяющий, что запрос с токеном в заголовке профилируется, а профиль и запросы к базе сохраняются"""
+        response = self.client.get(reverse('post_detail', kwargs={'pk': 1}),
+                                   HTTP_X_PROFILE=get_profiling_token(self.user))
+        self.assertEqual(response.status_code, 200)
+        profile_path, report_path = self._get_profile_files(response['X-Profile-Id'])
+        stats = pstats.Stats(profile_path, stream=StringIO())
+        self.assertTrue(any(function_name == 'get_context_data' for _, _, function_name in stats.stats))
+        with open(report_path, encoding='utf-8') as report_file:
+            report = json.load(report_file)
+        self.assertEqual(report['user'], TEST_USERNAME)
+        self.assertEqual(report['status'], 200)
+        self.assertEqual(report['query_count'], len(report['queries']))
+        self.assertTrue(any('app_blog_post' in query['sql'] for query in report['queries']))
+
+    def test_profile_by_query_parameter(self):
+        """Тест проверяющий профилирование запроса с токеном в параметре запроса"""
+        response = self.client.get(reverse('post_list'), {'_profile': get_profiling_token(self.user)})
+        self.assertTrue(response.has_header('X-Profile-Id'))
+
+    def test_request_without_valid_token_not_profiled(self):
+        """Тест проверяющий, что запросы без токена, с поддельным токеном, токеном другого пользователя
+         и от пользователя не сотрудника не профилируются"""
+        url = reverse('post_list')
+        self.assertFalse(self.client.get(url).has_header('X-Profile-Id'))
+        self.assertFalse(self.client.get(url, HTTP_X_PROFILE='1:forged:token').has_header('X-Profile-Id'))
+        other_staff_user = User.objects.create_user(username='other', password='p@ssw0rd', is_staff=True)
+        self.assertFalse(self.client.get(url, HTTP_X_PROFILE=get_profiling_token(other_staff_user))
+                         .has_header('X-Profile-Id'))
+
+        self.user.is_staff = False
+        self.user.save()
+        self.assertFalse(self.client.get(url, HTTP_X_PROFILE=get_profiling_token(self.user))
+                         .has_header('X-Profile-Id'))
+
+    def test_create_profiling_token_command(self):
+        """Тест команды создания токена профилирования: токен выдаётся только сотруднику"""
+        output = StringIO()
+        call_command('create_profiling_token', TEST_USERNAME, stdout=output)
+        response = self.client.get(reverse('post_list'), HTTP_X_PROFILE=output.getvalue().strip())
+        self.assertTrue(response.has_header('X-Profile-Id'))
+
+        User.objects.create_user(username='not_staff', password='p@ssw0rd')
+        with self.assertRaises(CommandError):
+            call_command('create_profiling_token', 'not_staff', stdout=StringIO())
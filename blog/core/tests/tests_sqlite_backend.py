@@ -0,0 +1,89 @@
+import os
+import sqlite3
+import tempfile
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from core.db_backends.sqlite3.base import DatabaseWrapper
+from core.handlers import immediate_atomic
+
+
+class SQLiteBackendTest(SimpleTestCase):
+    """Тесты настройки соединений бэкендом SQLite. Тестовая база находится в памяти, а режим WAL
+     доступен только для файла, поэтому проверки выполняются на отдельной базе во временном каталоге"""
+
+    def setUp(self):
+        self.database_path = os.path.join(tempfile.mkdtemp(), 'db.sqlite3')
+        self.wrapper = DatabaseWrapper({**connection.settings_dict, 'NAME': self.database_path}, alias='sqlite_file')
+
+    def tearDown(self):
+        self.wrapper.close()
+
+    def _get_pragma(self, name: str):
+        with self.wrapper.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_pragmas_applied_to_new_connection(self):
+        """Тест проверяющий, что при открытии соединения применяются PRAGMA из настроек"""
+        self.assertEqual(self._get_pragma('journal_mode'), 'wal')
+        self.assertEqual(self._get_pragma('busy_timeout'), settings.SQLITE_PRAGMAS['busy_timeout'])
+        self.assertEqual(self._get_pragma('synchronous'), 1)  # NORMAL
+        self.assertEqual(self._get_pragma('mmap_size'), settings.SQLITE_PRAGMAS['mmap_size'])
+        self.assertEqual(self._get_pragma('cache_size'), settings.SQLITE_PRAGMAS['cache_size'])
+
+    @override_settings(SQLITE_PRAGMAS={'synchronous': 'FULL'})
+    def test_pragmas_read_from_settings(self):
+        """Тест проверяющий, что значения PRAGMA берутся из настроек при открытии соединения"""
+        self.assertEqual(self._get_pragma('synchronous'), 2)  # FULL
+        self.assertEqual(self._get_pragma('journal_mode'), 'delete')
+
+    def _is_write_locked_after_begin(self) -> bool:
+        """Метод начинает транзакцию, выполняет в ней чтение и проверяет, может ли другое соединение
+         начать пишущую транзакцию"""
+        self.wrapper.set_autocommit(False, force_begin_transaction_with_broken_autocommit=True)
+        try:
+            with self.wrapper.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            other_connection = sqlite3.connect(self.database_path, timeout=0)
+            try:
+                other_connection.execute('BEGIN IMMEDIATE')
+            except sqlite3.OperationalError as exception:
+                self.assertEqual(str(exception), 'database is locked')
+                return True
+            finally:
+                other_connection.close()
+            return False
+        finally:
+            self.wrapper.rollback()
+            self.wrapper.set_autocommit(True)
+
+    def test_transaction_is_deferred_by_default(self):
+        """Тест проверяющий, что по умолчанию транзакция не берёт блокировку записи при начале"""
+        self.assertFalse(self._is_write_locked_after_begin())
+
+    def test_transaction_takes_write_lock_on_begin(self):
+        """Тест проверяющий, что транзакция в режиме IMMEDIATE берёт блокировку записи сразу при начале,
+         до первой записи, и другое соединение не может начать пишущую транзакцию"""
+        self.wrapper.transaction_mode = 'IMMEDIATE'
+        self.assertTrue(self._is_write_locked_after_begin())
+        self.wrapper.transaction_mode = None
+        with override_settings(SQLITE_TRANSACTION_MODE='IMMEDIATE'):
+            self.assertTrue(self._is_write_locked_after_begin())
+
+
+class ImmediateAtomicTest(TransactionTestCase):
+
+    def test_immediate_atomic_begins_immediate_transaction(self):
+        """Тест проверяющий, что immediate_atomic начинает транзакцию командой BEGIN IMMEDIATE,
+         а следующие транзакции соединения начинаются в режиме из настроек"""
+        with CaptureQueriesContext(connection) as queries:
+            with immediate_atomic():
+                pass
+            with transaction.atomic():
+                pass
+        begin_queries = [query['sql'] for query in queries.captured_queries if query['sql'].startswith('BEGIN')]
+        self.assertEqual(begin_queries, ['BEGIN IMMEDIATE', f'BEGIN {settings.SQLITE_TRANSACTION_MODE}'])